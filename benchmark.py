@@ -0,0 +1,256 @@
+"""Headless Micro-Benchmarks für Welt-Generierung und BlockRegistry
+
+Läuft ohne Fenster (Ursina window_type='none') und schreibt die Ergebnisse
+als JSON, damit Läufe vor/nach Engine-Änderungen verglichen werden können:
+
+    python benchmark.py --output bench.json
+    python benchmark.py --output bench_new.json --compare bench.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+
+DEFAULT_SEEDS = (1, 42, 1337)
+DEFAULT_CHUNK_SIZES = (8, 16)
+
+
+def _measure(func, iterations, batch=1, warmup=2):
+    """Ruft func iterations mal auf und gibt die Latenzen pro Aufruf in Sekunden zurück
+
+    Sehr schnelle Funktionen werden in Batches von batch Aufrufen gemessen,
+    damit der Timer-Overhead nicht dominiert (Latenz = Batch-Zeit / batch).
+    func bekommt den laufenden Index, damit jeder Aufruf andere Eingaben nutzen kann.
+    """
+    for i in range(warmup):
+        func(-1 - i)
+
+    samples = []
+    index = 0
+    for _ in range(max(1, iterations // batch)):
+        start = time.perf_counter()
+        for _ in range(batch):
+            func(index)
+            index += 1
+        samples.append((time.perf_counter() - start) / batch)
+    return samples
+
+
+def _summarize(name, params, samples, batch=1):
+    latencies = np.array(samples, dtype=np.float64) * 1e6
+    ops = len(samples) * batch
+    total = float(latencies.sum()) * batch / 1e6
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        'name': name,
+        'params': params,
+        'ops': ops,
+        'total_s': total,
+        'ops_per_s': ops / total if total else 0.0,
+        'mean_us': float(latencies.mean()),
+        'p50_us': float(p50),
+        'p95_us': float(p95),
+        'p99_us': float(p99)
+    }
+
+
+def _column(index, size):
+    """Verteilt Aufrufe über ein size x size Raster von Welt-Positionen"""
+    return (index % size) * 7 - 300, (index // size % size) * 13 - 300
+
+
+def bench_noise(world_gen, seed, iterations):
+    noise = world_gen.noise
+    samples = _measure(lambda i: noise.noise2d(*_column(i, 97), 0.02), iterations, batch=100)
+    return _summarize('noise2d', {'seed': seed}, samples, batch=100)
+
+
+def bench_height_biome(world_gen, seed, iterations):
+    results = []
+    samples = _measure(lambda i: world_gen.get_height(*_column(i, 97)), iterations, batch=50)
+    results.append(_summarize('get_height', {'seed': seed}, samples, batch=50))
+    samples = _measure(lambda i: world_gen.get_biome(*_column(i, 97)), iterations, batch=50)
+    results.append(_summarize('get_biome', {'seed': seed}, samples, batch=50))
+    return results
+
+
+def bench_cave_volume(world_gen, seed, iterations, depth=64):
+    """3D Höhlen-Dichtefeld für ein chunk_size x depth x chunk_size Volumen"""
+    size = world_gen.chunk_size
+    offsets = np.arange(size)
+    ys = np.arange(-depth, 0)
+
+    def carve(i):
+        x0, z0 = _column(i, 97)
+        world_gen.get_density_cave_grid(offsets + x0, ys, offsets + z0)
+
+    samples = _measure(carve, iterations)
+    return _summarize('get_density_cave_grid', {'seed': seed, 'chunk_size': size, 'depth': depth}, samples)
+
+
+def bench_generate_column(world_gen, seed, iterations):
+    from chunk_data import ChunkData
+
+    size = world_gen.chunk_size
+    chunk = ChunkData(0, 0, size, world_gen.WORLD_MIN_Y, 64)
+
+    def generate(i):
+        local = abs(i) % (size * size)
+        world_gen._generate_column(chunk, local // size, local % size)
+
+    samples = _measure(generate, iterations, batch=10)
+    return _summarize('_generate_column', {'seed': seed, 'chunk_size': size}, samples, batch=10)
+
+
+def bench_generate_chunk(world_gen, seed, iterations):
+    """Komplette Chunks - jeder Aufruf nimmt einen neuen Chunk, der Cache greift also nie"""
+    def generate(i):
+        world_gen.generate_chunk(i % 64 - 32, i // 64 + 1000)
+
+    samples = _measure(generate, iterations)
+    return _summarize('generate_chunk', {'seed': seed, 'chunk_size': world_gen.chunk_size}, samples)
+
+
+def bench_lod_tile(world_gen, seed, iterations, step, tile_chunks=4):
+    """Heightmap-Kachel für das Fern-Terrain: Abtasten plus Mesh (ohne Entity)"""
+    from far_terrain import sample_lod_tile, build_lod_mesh
+
+    size = world_gen.chunk_size * tile_chunks
+
+    def build(i):
+        x0, z0 = _column(i, 97)
+        build_lod_mesh(*sample_lod_tile(world_gen, x0 * 4, z0 * 4, size, step), step)
+
+    samples = _measure(build, iterations)
+    return _summarize('build_lod_tile', {'seed': seed, 'tile_size': size, 'step': step}, samples)
+
+
+def bench_block_create(iterations, block_name='grass'):
+    """Neue Entities mit leerem Pool, danach dieselbe Anzahl aus dem Pool"""
+    from ursina import destroy
+    from block import BlockRegistry
+
+    pool = BlockRegistry.pool
+    if pool is not None:
+        pool.clear()
+        max_per_type, pool.max_per_type = pool.max_per_type, iterations + 2
+
+    results = []
+    created = []
+    samples = _measure(lambda i: created.append(BlockRegistry.create(block_name, (i, 0, 0))), iterations)
+    results.append(_summarize('BlockRegistry.create', {'block': block_name, 'pooled': False}, samples))
+
+    if pool is not None:
+        for block in created:
+            BlockRegistry.recycle(block)
+        created = []
+        samples = _measure(lambda i: created.append(BlockRegistry.create(block_name, (i, 0, 0))), iterations)
+        results.append(_summarize('BlockRegistry.create', {'block': block_name, 'pooled': True}, samples))
+        pool.clear()
+        pool.max_per_type = max_per_type
+
+    for block in created:
+        destroy(block)
+    return results
+
+
+def run_benchmarks(seeds=DEFAULT_SEEDS, chunk_sizes=DEFAULT_CHUNK_SIZES, iterations=2000, chunk_iterations=30):
+    """Führt alle Benchmarks aus und gibt eine Liste von Ergebnis-Dicts zurück"""
+    from terrain_generator import FastWorldGenerator
+
+    results = []
+    for seed in seeds:
+        with contextlib.redirect_stdout(io.StringIO()):
+            world_gen = FastWorldGenerator(seed, chunk_sizes[0])
+        results.append(bench_noise(world_gen, seed, iterations))
+        results.extend(bench_height_biome(world_gen, seed, iterations))
+
+        for chunk_size in chunk_sizes:
+            with contextlib.redirect_stdout(io.StringIO()):
+                world_gen = FastWorldGenerator(seed, chunk_size)
+            results.append(bench_generate_column(world_gen, seed, iterations // 10))
+            results.append(bench_cave_volume(world_gen, seed, chunk_iterations))
+            results.append(bench_generate_chunk(world_gen, seed, chunk_iterations))
+            for step in (2, 8):
+                results.append(bench_lod_tile(world_gen, seed, chunk_iterations, step))
+
+    results.extend(bench_block_create(iterations // 10))
+    return results
+
+
+def _environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': commit or None,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def _result_key(result):
+    return result['name'], json.dumps(result['params'], sort_keys=True)
+
+
+def print_results(results, baseline=None):
+    """Tabelle auf stdout, mit baseline zusätzlich die Änderung des Durchsatzes"""
+    previous = {_result_key(result): result for result in (baseline or [])}
+
+    print(f"{'benchmark':<24}{'params':<32}{'ops/s':>12}{'p50 us':>10}{'p95 us':>10}{'p99 us':>10}"
+          + (f"{'change':>10}" if baseline else ''))
+    for result in results:
+        params = ', '.join(f"{key}={value}" for key, value in result['params'].items())
+        line = (f"{result['name']:<24}{params:<32}{result['ops_per_s']:>12.0f}"
+                f"{result['p50_us']:>10.1f}{result['p95_us']:>10.1f}{result['p99_us']:>10.1f}")
+        old = previous.get(_result_key(result))
+        if old and old['ops_per_s']:
+            line += f"{(result['ops_per_s'] / old['ops_per_s'] - 1) * 100:>+9.1f}%"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seeds', type=int, nargs='+', default=list(DEFAULT_SEEDS))
+    parser.add_argument('--chunk-sizes', type=int, nargs='+', default=list(DEFAULT_CHUNK_SIZES))
+    parser.add_argument('--iterations', type=int, default=2000, help='Aufrufe pro Mikro-Benchmark')
+    parser.add_argument('--chunk-iterations', type=int, default=30, help='Chunks pro generate_chunk Benchmark')
+    parser.add_argument('--output', help='JSON-Datei für die Ergebnisse')
+    parser.add_argument('--compare', help='Früheres JSON-Ergebnis zum Vergleich')
+    args = parser.parse_args(argv)
+
+    # Ohne Fenster - Entities (BlockRegistry.create) brauchen trotzdem eine App
+    from ursina import Ursina
+    with contextlib.redirect_stdout(io.StringIO()):
+        Ursina(window_type='none')
+
+    results = run_benchmarks(args.seeds, args.chunk_sizes, args.iterations, args.chunk_iterations)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'environment': _environment(), 'results': results}, f, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,15 +1,23 @@
 from ursina import *
 from ursina import color as ursina_color
+import math
 import os
-from collections import defaultdict
+from collections import Counter, defaultdict, deque
+
+from chunk_data import AIR, SECTION_HEIGHT, section_index
+from metrics import metrics
+from texture_atlas import TextureAtlas
 
 class BlockRegistry:
     registry = {}
     _texture_cache = {}
     _model_cache = {}
+    atlas = None  # TextureAtlas aller Block-Texturen (siehe build_atlas)
+    _atlas_cache_dir = None
+    pool = None  # BlockPool - deaktivierte Blöcke zur Wiederverwendung (siehe recycle)
 
     @classmethod
-    def register(cls, name, texture, model='cube', scale=1, color=None, walkthrough=False, model_url=None):
+    def register(cls, name, texture, model='cube', scale=1, color=None, walkthrough=False, model_url=None, light=0):
         """
         Registriert einen Block-Typ mit optionalem Custom Model
         
@@ -21,6 +29,7 @@ class BlockRegistry:
             color: Farbe des Blocks (Standard: None für zufällige Farbe)
             walkthrough: Ob man durch den Block laufen kann (Standard: False)
             model_url: URL zu einem 3D-Model zum Download
+            light: Leuchtkraft 0..15 für das gebackene Block-Licht (Standard: 0)
         """
         cls.registry[name] = {
             'texture': texture,
@@ -28,10 +37,16 @@ class BlockRegistry:
             'scale': scale,
             'color': color,
             'walkthrough': walkthrough,
-            'model_url': model_url
+            'model_url': model_url,
+            'light': light
         }
         
         cls._preload_texture(texture)
+        
+        # Zur Laufzeit registrierte Blöcke landen inkrementell im Atlas
+        if cls.atlas is not None and cls.atlas.add(texture, cls._atlas_source(texture)):
+            if cls._atlas_cache_dir:
+                cls.atlas.save(cls._atlas_cache_dir)
 
     @classmethod
     def _preload_texture(cls, texture_path):
@@ -51,6 +66,52 @@ class BlockRegistry:
         """Gibt gecachte Textur zurück"""
         return cls._texture_cache.get(texture_path, 'white_cube')
 
+    @classmethod
+    def _atlas_source(cls, texture_path):
+        """Quelle einer Block-Textur für den Atlas (Fallback-Namen werden geladen)"""
+        texture = cls.get_cached_texture(texture_path)
+        if isinstance(texture, str):
+            texture = load_texture(texture)
+        return texture
+
+    @classmethod
+    def build_atlas(cls, cache_dir=None, tile_size=32):
+        """Packt alle registrierten Texturen in einen Atlas
+        
+        Mit cache_dir wird das Layout auf der Platte gespeichert und beim
+        nächsten Start ohne Neu-Packen geladen, solange sich die Quell-Texturen
+        nicht geändert haben.
+        """
+        textures = {block_data['texture'] for block_data in cls.registry.values()}
+        sources = {texture: cls._atlas_source(texture) for texture in textures}
+        cls.atlas = TextureAtlas.build(sources, cache_dir, tile_size)
+        cls._atlas_cache_dir = cache_dir
+        return cls.atlas
+
+    @classmethod
+    def get_atlas_slot(cls, name):
+        """Atlas-Slot der Textur eines Blocks (None ohne Atlas)"""
+        block_data = cls.registry.get(name)
+        if cls.atlas is None or block_data is None:
+            return None
+        return cls.atlas.slot(block_data['texture'])
+
+    @classmethod
+    def get_uv_rect(cls, name):
+        """UV-Rechteck (u0, v0, u1, v1) eines Blocks im Atlas (None ohne Atlas)"""
+        block_data = cls.registry.get(name)
+        if cls.atlas is None or block_data is None or block_data['texture'] not in cls.atlas:
+            return None
+        return cls.atlas.uv_rect(block_data['texture'])
+
+    @classmethod
+    def get_average_color(cls, name):
+        """Mittlere Texturfarbe eines Blocks aus dem Atlas (None ohne Atlas)"""
+        block_data = cls.registry.get(name)
+        if cls.atlas is None or block_data is None:
+            return None
+        return cls.atlas.average_color(block_data['texture'])
+
     @classmethod
     def create(cls, name, position=(0, 0, 0)):
         if name not in cls.registry:
@@ -59,11 +120,16 @@ class BlockRegistry:
         
         block_data = cls.registry[name]
         
+        if cls.pool is not None:
+            block = cls.pool.acquire(name, position, block_data)
+            if block is not None:
+                return block
+        
         model_to_use = block_data['model']
         if block_data['model_url']:
             model_to_use = cls._load_model_from_url(name, block_data['model_url'], block_data['model'])
         
-        return Block(
+        block = Block(
             position=position,
             texture=block_data['texture'],
             model=model_to_use,
@@ -71,6 +137,16 @@ class BlockRegistry:
             color=block_data['color'],
             walkthrough=block_data['walkthrough']
         )
+        block.block_type = name
+        return block
+
+    @classmethod
+    def recycle(cls, block):
+        """Gibt einen Block zurück - landet deaktiviert im Pool oder wird zerstört"""
+        if block is None:
+            return
+        if cls.pool is None or not cls.pool.release(block):
+            destroy(block)
 
     @classmethod
     def _load_model_from_url(cls, block_name, url, fallback_model):
@@ -143,6 +219,14 @@ class BlockRegistry:
             return block_data['walkthrough']
         return False
 
+    @classmethod
+    def get_light(cls, name):
+        """Leuchtkraft eines Blocks (0 wenn er nicht leuchtet)"""
+        block_data = cls.registry.get(name)
+        if block_data:
+            return block_data.get('light', 0)
+        return 0
+
     @classmethod
     def register_from_file(cls, name, texture, model_path, scale=1, color=None, walkthrough=False):
         """
@@ -158,6 +242,10 @@ class BlockRegistry:
 class Block(Entity):  # Geändert von Button zu Entity für bessere Performance
     _default_color = None
     
+    # Collider braucht nur der FirstPersonController - mit Voxel-Physik
+    # (player_physics) werden Blöcke und Terrain ohne Collider erstellt
+    colliders_enabled = True
+    
     def __init__(self, position=(0, 0, 0), texture='white_cube', model='cube', scale=1, color=None, walkthrough=False):
         if color is None:
             if Block._default_color is None:
@@ -180,180 +268,327 @@ class Block(Entity):  # Geändert von Button zu Entity für bessere Performance
         
         self.walkthrough = walkthrough
         
-        # Optimierte Kollision - nur bei Bedarf
-        if not walkthrough:
+        # Collider nur noch für die Spieler-Kollision - Abbauen/Platzieren
+        # läuft zentral über interaction.BlockInteraction (Voxel-Raycast)
+        if not walkthrough and Block.colliders_enabled:
             self.collider = 'box'
-        
-        # Mouse picking für Interaktion (effizienter als Button)
-        self.mouse_filter = True
-
-    def input(self, key):
-        """Vereinfachte Input-Behandlung"""
-        if not mouse.hovered_entity == self:
-            return
-            
-        if key == 'right mouse down':
-            self._handle_place_block()
-        elif key == 'left mouse down':
-            self._handle_break_block()
-
-    def _handle_place_block(self):
-        """Optimierte Block-Platzierung"""
-        try:
-            from inventory import get_current_block
-            current_block = get_current_block()
-            if current_block:
-                new_position = self.position + mouse.normal
-                new_block = BlockRegistry.create(current_block, position=new_position)
-                if new_block:
-                    # Füge Block zum Chunk hinzu für bessere Verwaltung
-                    chunk_manager.add_block_to_chunk(new_block, new_position)
-            else:
-                print("Kein Block im Inventar ausgewählt!")
-        except ImportError:
-            # Fallback ohne Inventarsystem
-            current_block = 'grass'
-            new_block = BlockRegistry.create(current_block, position=self.position + mouse.normal)
-            if new_block:
-                chunk_manager.add_block_to_chunk(new_block, self.position + mouse.normal)
-
-    def _handle_break_block(self):
-        """Optimierte Block-Zerstörung"""
-        # Entferne Block aus Chunk-Management
-        chunk_manager.remove_block_from_chunk(self)
-        destroy(self)
 
     def set_walkthrough(self, walkthrough):
         """Ändert die Walkthrough-Eigenschaft zur Laufzeit"""
         self.walkthrough = walkthrough
-        if walkthrough:
+        if walkthrough or not Block.colliders_enabled:
             self.collider = None
         else:
             self.collider = 'box'
 
 
-class OptimizedChunkManager:
-    """Hochoptimierter Chunk-Manager für bessere Performance"""
-    def __init__(self, chunk_size=16, max_loaded_chunks=25):
+class BlockPool:
+    """Pool deaktivierter Block-Entities pro Block-Typ
+    
+    Statt Block(...) beim Laden und destroy() beim Entladen werden Blöcke
+    deaktiviert zurückgelegt und mit neuer Position wiederverwendet. Das spart
+    das Anlegen und Abbauen der Scene-Graph Nodes (und GC-Last). Pro Typ
+    werden höchstens max_per_type Blöcke behalten, der Rest wird zerstört.
+    """
+    
+    def __init__(self, max_per_type=256):
+        self.max_per_type = max_per_type
+        self._free = defaultdict(deque)
+        
+        self.hits = 0
+        self.misses = 0
+        self.released = 0
+        self.discarded = 0
+    
+    def acquire(self, name, position, block_data):
+        """Aktiviert einen freien Block des Typs an position (None wenn leer)"""
+        free = self._free.get(name)
+        while free:
+            block = free.pop()
+            if not hasattr(block, 'enabled'):
+                continue  # Inzwischen von außen zerstört
+            block.position = position
+            block.rotation = (0, 0, 0)
+            block.scale = block_data['scale']
+            block.color = block_data['color'] if block_data['color'] is not None else Block._default_color
+            block.set_walkthrough(block_data['walkthrough'])
+            block.enabled = True
+            self.hits += 1
+            return block
+        self.misses += 1
+        return None
+    
+    def release(self, block):
+        """Legt einen Block deaktiviert zurück - False wenn der Pool voll ist"""
+        name = getattr(block, 'block_type', None)
+        if name is None or not hasattr(block, 'enabled'):
+            return False
+        free = self._free[name]
+        if len(free) >= self.max_per_type:
+            self.discarded += 1
+            return False
+        block.enabled = False
+        free.append(block)
+        self.released += 1
+        return True
+    
+    @property
+    def size(self):
+        return sum(len(free) for free in self._free.values())
+    
+    def clear(self):
+        """Zerstört alle gepoolten Blöcke (z.B. beim Generieren einer neuen Welt)"""
+        for free in self._free.values():
+            for block in free:
+                if hasattr(block, 'enabled'):
+                    destroy(block)
+        self._free.clear()
+    
+    def get_stats(self):
+        requests = self.hits + self.misses
+        return {
+            'size': self.size,
+            'max_per_type': self.max_per_type,
+            'per_type': {name: len(free) for name, free in self._free.items() if free},
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / requests if requests else 0.0,
+            'released': self.released,
+            'discarded': self.discarded
+        }
+
+
+def world_cell(position):
+    """Welt-Zelle (x, y, z) einer Position - Blöcke stehen auf ganzzahligen Koordinaten
+    
+    floor(v + 0.5) statt round(): round() rundet .5 zur geraden Zahl und
+    würde benachbarte Positionen uneinheitlich zuordnen.
+    """
+    return (math.floor(position[0] + 0.5), math.floor(position[1] + 0.5), math.floor(position[2] + 0.5))
+
+
+class WorldBlockStore:
+    """Eine Quelle der Wahrheit für alle Blöcke der Welt
+    
+    Terrain liegt als Voxel-Daten im Chunk-Manager der Welt (terrain),
+    platzierte Blöcke als Entities in einem Hash-Index (x, y, z) -> Block.
+    get/add/remove sind O(1), die Chunk-Zugehörigkeit wird für beide mit
+    derselben Chunk-Größe berechnet (chunk_key). Platzierte Blöcke in
+    entladenen Terrain-Chunks bleiben erhalten und werden nur deaktiviert.
+    """
+    
+    def __init__(self, chunk_size=8):
         self.chunk_size = chunk_size
-        self.max_loaded_chunks = max_loaded_chunks  # Limitiere geladene Chunks
-        self.chunks = {}
-        self.loaded_chunks = set()
-        self.chunk_blocks = defaultdict(list)  # Optimierte Block-Verwaltung
-        self.last_cleanup = 0
-        self.cleanup_interval = 5.0  # Cleanup alle 5 Sekunden
-    
-    def get_chunk_coords(self, world_pos):
-        """Berechnet Chunk-Koordinaten aus Welt-Position"""
-        if isinstance(world_pos, (tuple, list)) and len(world_pos) >= 3:
-            return (
-                int(world_pos[0] // self.chunk_size),
-                int(world_pos[2] // self.chunk_size)
-            )
+        self.terrain = None
+        self.blocks = {}
+        self.chunk_cells = defaultdict(set)  # chunk_key -> Zellen platzierter Blöcke
+        self.section_counts = Counter()  # (chunk_key, section) -> Anzahl platzierter Blöcke
+        self._transparent_ids = frozenset()
+    
+    def attach_terrain(self, terrain):
+        """Verbindet den Store mit dem Chunk-Manager einer Welt
+        
+        Beim Wechsel auf eine neue Welt werden die platzierten Blöcke der
+        alten entfernt.
+        """
+        if terrain is self.terrain:
+            return
+        if self.terrain is not None:
+            self.clear()
+        self.terrain = terrain
+        if terrain is not None:
+            self.chunk_size = terrain.world_gen.chunk_size
+            self._transparent_ids = frozenset(terrain.renderer.transparent_ids)
         else:
-            # Fallback für einzelne Koordinaten
-            return (
-                int(world_pos // self.chunk_size) if isinstance(world_pos, (int, float)) else 0,
-                0
-            )
-    
-    def load_chunk(self, chunk_x, chunk_z):
-        """Lädt einen Chunk mit Performance-Optimierung"""
-        chunk_key = (chunk_x, chunk_z)
-        if chunk_key not in self.loaded_chunks:
-            # Prüfe Chunk-Limit
-            if len(self.loaded_chunks) >= self.max_loaded_chunks:
-                self._cleanup_distant_chunks(chunk_x, chunk_z)
-            
-            self.chunks[chunk_key] = []
-            self.loaded_chunks.add(chunk_key)
-            return True
-        return False
+            self._transparent_ids = frozenset()
+        
+        # Bereits platzierte Blöcke auf die (neue) Chunk-Größe verteilen
+        self.chunk_cells = defaultdict(set)
+        self.section_counts = Counter()
+        for cell in self.blocks:
+            chunk_key = self.chunk_key(cell[0], cell[2])
+            self.chunk_cells[chunk_key].add(cell)
+            self.section_counts[(chunk_key, section_index(cell[1]))] += 1
+    
+    def chunk_key(self, x, z):
+        """Chunk einer Welt-Position - gleiche Rechnung wie SimpleChunkManager"""
+        return (math.floor(x + 0.5) // self.chunk_size, math.floor(z + 0.5) // self.chunk_size)
+    
+    def get(self, x, y, z):
+        """Platzierter Block an einer Zelle (oder None)"""
+        return self.blocks.get((x, y, z))
+    
+    def get_block_name(self, x, y, z):
+        """Name des Blocks an einer Zelle - platziert oder Terrain (None für Luft)"""
+        block = self.blocks.get((x, y, z))
+        if block is not None:
+            return getattr(block, 'block_type', None)
+        if self.terrain is None:
+            return None
+        block_id = self.terrain.get_block(x, y, z)
+        if block_id == AIR:
+            return None
+        return self.terrain.renderer.block_names.get(block_id)
     
-    def _cleanup_distant_chunks(self, center_x, center_z):
-        """Entlädt weit entfernte Chunks"""
-        chunks_to_unload = []
-        for chunk_x, chunk_z in self.loaded_chunks:
-            distance = abs(chunk_x - center_x) + abs(chunk_z - center_z)
-            if distance > 3:  # Entlade Chunks die weiter als 3 Chunks entfernt sind
-                chunks_to_unload.append((chunk_x, chunk_z))
+    def is_solid(self, x, y, z):
+        """Ob eine Zelle den Spieler/Raycast blockiert (nicht walkthrough bzw. transparent)"""
+        block = self.blocks.get((x, y, z))
+        if block is not None:
+            return not block.walkthrough
+        if self.terrain is None:
+            return False
+        block_id = self.terrain.get_block(x, y, z)
+        return block_id != AIR and block_id not in self._transparent_ids
+    
+    def light_properties(self, x, y, z):
+        """(durchsichtig, Leuchtkraft) des platzierten Blocks einer Zelle für die LightEngine
         
-        # Entlade die Hälfte der entfernten Chunks
-        for chunk_key in chunks_to_unload[:len(chunks_to_unload)//2]:
-            self.unload_chunk(chunk_key[0], chunk_key[1])
-    
-    def unload_chunk(self, chunk_x, chunk_z):
-        """Entlädt einen Chunk mit Batch-Destruction"""
-        chunk_key = (chunk_x, chunk_z)
-        if chunk_key in self.loaded_chunks:
-            if chunk_key in self.chunk_blocks:
-                # Batch-Destruction für bessere Performance
-                blocks_to_destroy = self.chunk_blocks[chunk_key]
-                for block in blocks_to_destroy:
-                    if block and hasattr(block, 'enabled'):
-                        destroy(block)
-                del self.chunk_blocks[chunk_key]
-            
-            if chunk_key in self.chunks:
-                del self.chunks[chunk_key]
-            self.loaded_chunks.remove(chunk_key)
-    
-    def add_block_to_chunk(self, block, world_pos):
-        """Fügt Block zum entsprechenden Chunk hinzu - Optimiert"""
-        chunk_coords = self.get_chunk_coords(world_pos)
-        if chunk_coords not in self.loaded_chunks:
-            self.load_chunk(*chunk_coords)
+        None ohne platzierten Block - dann zählt das Terrain.
+        """
+        block = self.blocks.get((x, y, z))
+        if block is None:
+            return None
+        return bool(block.walkthrough), BlockRegistry.get_light(getattr(block, 'block_type', None))
+    
+    def _relight(self, cell):
+        """Platzierte Blöcke werfen Schatten bzw. leuchten - Terrain-Licht neu berechnen"""
+        if self.terrain is not None:
+            self.terrain.relight(*cell)
+    
+    def section_box(self, x, y, z):
+        """Section um eine Zelle als ((x0, y0, z0), (x1, y1, z1), leer) - None ohne Terrain
         
-        self.chunk_blocks[chunk_coords].append(block)
-        if chunk_coords in self.chunks:
-            self.chunks[chunk_coords].append(block)
-    
-    def remove_block_from_chunk(self, block):
-        """Entfernt Block aus Chunk-Management"""
-        # Finde den Chunk des Blocks
-        block_pos = (block.x, block.y, block.z)
-        chunk_coords = self.get_chunk_coords(block_pos)
+        leer heißt: im Terrain nur Luft (oder nicht geladen) und kein Block
+        darin platziert. Raycasts überspringen solche Sections, ohne einzelne
+        Zellen nachzuschlagen.
+        """
+        if self.terrain is None:
+            return None
+        chunk_key = self.chunk_key(x, z)
+        index = section_index(y)
+        empty = not self.section_counts.get((chunk_key, index))
+        chunk = self.terrain.loaded_chunks.get(chunk_key)
+        if chunk is not None and empty:
+            empty = chunk.is_uniform(index) and chunk.get_section(index) == AIR
+        x0 = chunk_key[0] * self.chunk_size
+        z0 = chunk_key[1] * self.chunk_size
+        y0 = index * SECTION_HEIGHT
+        return ((x0, y0, z0), (x0 + self.chunk_size - 1, y0 + SECTION_HEIGHT - 1, z0 + self.chunk_size - 1), empty)
+    
+    def add(self, block, position=None):
+        """Registriert einen Block an position (Standard: seine Position)
         
-        if chunk_coords in self.chunk_blocks:
-            try:
-                self.chunk_blocks[chunk_coords].remove(block)
-            except ValueError:
-                pass  # Block nicht in Liste
+        Ein anderer Block an derselben Zelle wird ersetzt und recycelt.
+        """
+        cell = world_cell(position if position is not None else block.position)
+        previous = self.blocks.get(cell)
+        if previous is block:
+            return cell
+        if previous is not None:
+            BlockRegistry.recycle(self.remove(*cell))
         
-        if chunk_coords in self.chunks:
-            try:
-                self.chunks[chunk_coords].remove(block)
-            except ValueError:
-                pass  # Block nicht in Liste
-    
-    def get_nearby_chunks(self, center_x, center_z, radius=2):
-        """Gibt nahegelegene Chunks zurück"""
-        nearby_chunks = []
-        for x in range(center_x - radius, center_x + radius + 1):
-            for z in range(center_z - radius, center_z + radius + 1):
-                if (x, z) in self.loaded_chunks:
-                    nearby_chunks.append((x, z))
-        return nearby_chunks
-    
-    def periodic_cleanup(self):
-        """Periodische Bereinigung für Performance"""
-        import time
-        current_time = time.time()
-        if current_time - self.last_cleanup > self.cleanup_interval:
-            # Entferne None-Referenzen aus Chunk-Listen
-            for chunk_key in list(self.chunk_blocks.keys()):
-                self.chunk_blocks[chunk_key] = [
-                    block for block in self.chunk_blocks[chunk_key] 
-                    if block and hasattr(block, 'enabled')
-                ]
-                if not self.chunk_blocks[chunk_key]:
-                    del self.chunk_blocks[chunk_key]
-            
-            self.last_cleanup = current_time
+        self.blocks[cell] = block
+        chunk_key = self.chunk_key(cell[0], cell[2])
+        self.chunk_cells[chunk_key].add(cell)
+        self.section_counts[(chunk_key, section_index(cell[1]))] += 1
+        if self.terrain is not None and chunk_key not in self.terrain.loaded_chunks:
+            block.enabled = False  # Wird mit dem Terrain-Chunk aktiviert
+        self._relight(cell)
+        return cell
+    
+    def remove(self, x, y, z):
+        """Entfernt den platzierten Block einer Zelle und gibt ihn zurück (oder None)"""
+        cell = (x, y, z)
+        block = self.blocks.pop(cell, None)
+        if block is None:
+            return None
+        chunk_key = self.chunk_key(x, z)
+        cells = self.chunk_cells.get(chunk_key)
+        if cells is not None:
+            cells.discard(cell)
+            if not cells:
+                del self.chunk_cells[chunk_key]
+        section_key = (chunk_key, section_index(y))
+        self.section_counts[section_key] -= 1
+        if self.section_counts[section_key] <= 0:
+            del self.section_counts[section_key]
+        self._relight(cell)
+        return block
+    
+    def remove_block(self, block):
+        """Entfernt block aus dem Index, falls er dort registriert ist"""
+        cell = world_cell(block.position)
+        if self.blocks.get(cell) is block:
+            return self.remove(*cell)
+        return None
+    
+    def place(self, name, x, y, z):
+        """Erstellt einen Block über die BlockRegistry und registriert ihn"""
+        block = BlockRegistry.create(name, position=(x, y, z))
+        if block is not None:
+            self.add(block, (x, y, z))
+            metrics.counter('world.block_edits').inc()
+        return block
+    
+    def break_block(self, x, y, z):
+        """Entfernt einen platzierten Block oder setzt Terrain auf Luft"""
+        block = self.remove(x, y, z)
+        if block is not None:
+            BlockRegistry.recycle(block)
+            metrics.counter('world.block_edits').inc()
+            return True
+        return bool(self.terrain is not None and self.terrain.set_block(x, y, z, AIR))
+    
+    def blocks_in_chunk(self, chunk_key):
+        return [self.blocks[cell] for cell in self.chunk_cells.get(chunk_key, ())]
+    
+    def set_chunk_enabled(self, chunk_key, enabled):
+        """Aktiviert/deaktiviert die platzierten Blöcke eines Chunks (Laden/Entladen)"""
+        for block in self.blocks_in_chunk(chunk_key):
+            block.enabled = enabled
+    
+    def clear(self):
+        """Entfernt alle platzierten Blöcke"""
+        for block in self.blocks.values():
+            BlockRegistry.recycle(block)
+        self.blocks = {}
+        self.chunk_cells = defaultdict(set)
+        self.section_counts = Counter()
+    
+    def __len__(self):
+        return len(self.blocks)
+    
+    def get_stats(self):
+        return {
+            'placed_blocks': len(self.blocks),
+            'chunks_with_blocks': len(self.chunk_cells),
+            'chunk_size': self.chunk_size,
+            'terrain_attached': self.terrain is not None
+        }
+
 
+# Globaler Block-Store der Welt (Terrain wird von create_world_generator angehängt)
+world_store = WorldBlockStore(chunk_size=8)
 
-# Globaler optimierter Chunk-Manager
-chunk_manager = OptimizedChunkManager(chunk_size=16, max_loaded_chunks=20)
+# Globaler Block-Pool hinter BlockRegistry.create / recycle
+BlockRegistry.pool = BlockPool(max_per_type=256)
+metrics.gauge('pool.blocks.size', func=lambda: BlockRegistry.pool.size)
+metrics.gauge('pool.blocks.hit_rate', func=lambda: BlockRegistry.pool.get_stats()['hit_rate'])
+
+def place_current_block(position):
+    """Platziert den im Inventar gewählten Block an position"""
+    try:
+        from inventory import get_current_block
+        current_block = get_current_block()
+        if current_block:
+            return world_store.place(current_block, *world_cell(position))
+        else:
+            print("Kein Block im Inventar ausgewählt!")
+    except ImportError:
+        # Fallback ohne Inventarsystem
+        current_block = 'grass'
+        return world_store.place(current_block, *world_cell(position))
+    return None
 
 def register_default_blocks():
     """Registriert Standard-Blöcke - Reduziert für bessere Performance"""
@@ -395,7 +630,7 @@ def create_optimized_world(width, height, depth, ground_level=-10, block_type='g
         for x, y, z in batch:
             block = BlockRegistry.create(block_type, position=(x, y, z))
             if block:
-                chunk_manager.add_block_to_chunk(block, (x, y, z))
+                world_store.add(block, (x, y, z))
                 blocks_created += 1
         
         # Progress-Update
@@ -426,7 +661,7 @@ def create_performance_optimized_area(start_pos, end_pos, block_type='grass'):
             block = BlockRegistry.create(block_type, position=pos)
             if block:
                 blocks.append(block)
-                chunk_manager.add_block_to_chunk(block, pos)
+                world_store.add(block, pos)
     
     return blocks
 
@@ -450,15 +685,9 @@ def get_registered_blocks():
 def get_performance_stats():
     """Gibt erweiterte Performance-Statistiken zurück"""
     return {
-        'loaded_chunks': len(chunk_manager.loaded_chunks),
         'cached_textures': len(BlockRegistry._texture_cache),
         'cached_models': len(BlockRegistry._model_cache),
         'registered_blocks': len(BlockRegistry.registry),
-        'total_blocks_in_chunks': sum(len(blocks) for blocks in chunk_manager.chunk_blocks.values()),
-        'max_loaded_chunks': chunk_manager.max_loaded_chunks
+        'world_store': world_store.get_stats(),
+        'block_pool': BlockRegistry.pool.get_stats() if BlockRegistry.pool else None
     }
-
-# Periodische Cleanup-Funktion
-def update_performance():
-    """Sollte regelmäßig aufgerufen werden für optimale Performance"""
-    chunk_manager.periodic_cleanup()
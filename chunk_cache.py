@@ -0,0 +1,132 @@
+import threading
+from collections import OrderedDict
+
+
+class LRUByteCache:
+    """Thread-sicherer LRU Cache mit Budget in Bytes statt Anzahl Einträge
+
+    get() markiert einen Eintrag als zuletzt benutzt, put() verdrängt die am
+    längsten unbenutzten Einträge bis das Budget wieder passt. on_evict wird
+    mit (key, value) für jeden verdrängten Eintrag aufgerufen.
+    """
+
+    def __init__(self, max_bytes, size_of=None, on_evict=None, name='cache'):
+        self.max_bytes = max_bytes
+        self.size_of = size_of or (lambda value: getattr(value, 'nbytes', 0))
+        self.on_evict = on_evict
+        self.name = name
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self.current_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def peek(self, key, default=None):
+        """Wie get(), aber ohne LRU-Update und ohne Statistik"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return default if entry is None else entry[0]
+
+    def put(self, key, value, nbytes=None):
+        if nbytes is None:
+            nbytes = self.size_of(value)
+        evicted = []
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            self._entries[key] = (value, nbytes)
+            self.current_bytes += nbytes
+
+            # Älteste Einträge verdrängen (den neuen Eintrag nie)
+            while self.current_bytes > self.max_bytes and len(self._entries) > 1:
+                old_key, (old_value, old_bytes) = self._entries.popitem(last=False)
+                self.current_bytes -= old_bytes
+                self.evictions += 1
+                evicted.append((old_key, old_value))
+
+        self._notify_evicted(evicted)
+
+    def pop(self, key, default=None):
+        """Entfernt einen Eintrag ohne on_evict aufzurufen"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return default
+            self.current_bytes -= entry[1]
+            return entry[0]
+
+    def evict(self, key):
+        """Verdrängt einen Eintrag gezielt (mit on_evict)"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return False
+            self.current_bytes -= entry[1]
+            self.evictions += 1
+        self._notify_evicted([(key, entry[0])])
+        return True
+
+    def _notify_evicted(self, evicted):
+        if self.on_evict:
+            for key, value in evicted:
+                self.on_evict(key, value)
+
+    def keys(self):
+        with self._lock:
+            return list(self._entries.keys())
+
+    def clear(self):
+        with self._lock:
+            evicted = [(key, value) for key, (value, _) in self._entries.items()]
+            self._entries.clear()
+            self.current_bytes = 0
+        self._notify_evicted(evicted)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get_stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+class ChunkRenderCache(LRUByteCache):
+    """Zweite Cache-Stufe: deaktivierte Render-Objekte entladener Chunks
+
+    Teuer im Speicher, daher kleines Budget und nur in der Nähe des Spielers
+    (trim_to_radius). Verdrängte Einträge werden über on_evict zerstört.
+    """
+
+    def trim_to_radius(self, center_chunk, radius):
+        """Verdrängt alle Einträge außerhalb von radius Chunks um center_chunk"""
+        center_x, center_z = center_chunk
+        for chunk_key in self.keys():
+            if max(abs(chunk_key[0] - center_x), abs(chunk_key[1] - center_z)) > radius:
+                self.evict(chunk_key)
@@ -0,0 +1,328 @@
+import json
+import struct
+
+import numpy as np
+
+# Block-ID für leere Zellen (die IDs 0..n kommen aus FastWorldGenerator.BLOCKS)
+AIR = 255
+
+# Höhe einer vertikalen Section - Sections liegen auf einem Welt-Raster (y // SECTION_HEIGHT)
+SECTION_HEIGHT = 16
+
+# Binärformat für to_bytes/from_bytes (Version bei Formatänderungen erhöhen)
+# Version 2: Heightmap und Biom-Karte nach den Overflow-Blöcken
+# Version 3: Blöcke als Sections, einheitliche Sections als ein Byte
+FORMAT_VERSION = 3
+_HEADER = struct.Struct('<HiiHhhI')
+_OVERFLOW_ENTRY = struct.Struct('<iiiB')
+_MAPS_FLAG = struct.Struct('<?')
+_SECTION_UNIFORM = struct.Struct('<?B')
+
+
+def section_index(y):
+    """Index der Section, in der die Welt-Höhe y liegt"""
+    return y // SECTION_HEIGHT
+
+
+class ChunkData:
+    """Kompakte Voxel-Daten eines Chunks - ein Byte pro Zelle, ohne Entities
+
+    Der Chunk ist vertikal in Sections von SECTION_HEIGHT Zellen geteilt.
+    Eine Section ist entweder einheitlich (nur Luft oder nur ein Block) und
+    dann als einzelne Block-ID gespeichert, oder ein uint8 Array der Form
+    (size, SECTION_HEIGHT, size) mit Index [x, y - base_y, z]. min_y und
+    max_y werden auf Section-Grenzen erweitert. Speicher und Mesh-Arbeit
+    hängen so von der Oberfläche ab, nicht vom Volumen.
+
+    Blöcke außerhalb der Chunk-Grenzen (z.B. Baumkronen am Rand) landen in
+    overflow und werden trotzdem mit dem Chunk gerendert.
+
+    heightmap (int16) und biome_map (uint8, Index in BIOME_NAMES) halten pro
+    Säule [x, z] die generierte Terrain-Höhe und das Biom - None falls unbekannt.
+    """
+
+    def __init__(self, chunk_x, chunk_z, size, min_y, max_y, metadata=None):
+        self.chunk_x = chunk_x
+        self.chunk_z = chunk_z
+        self.size = size
+        self.min_y = section_index(min_y) * SECTION_HEIGHT
+        self.max_y = -section_index(-max_y) * SECTION_HEIGHT
+        # Pro Section eine Block-ID (einheitlich) oder ein uint8 Array
+        self.sections = [AIR] * ((self.max_y - self.min_y) // SECTION_HEIGHT)
+        self.overflow = []
+        self.heightmap = None
+        self.biome_map = None
+        self.metadata = metadata if metadata is not None else {}
+
+    @property
+    def key(self):
+        return (self.chunk_x, self.chunk_z)
+
+    @property
+    def world_x_start(self):
+        return self.chunk_x * self.size
+
+    @property
+    def world_z_start(self):
+        return self.chunk_z * self.size
+
+    @property
+    def height(self):
+        return self.max_y - self.min_y
+
+    @property
+    def first_section(self):
+        """Welt-Index der untersten Section"""
+        return section_index(self.min_y)
+
+    def section_indices(self):
+        """Welt-Indizes aller Sections von unten nach oben"""
+        return range(self.first_section, self.first_section + len(self.sections))
+
+    def get_section(self, index):
+        """Block-ID (einheitliche Section) oder Array einer Section - AIR außerhalb"""
+        local = index - self.first_section
+        if not 0 <= local < len(self.sections):
+            return AIR
+        return self.sections[local]
+
+    def is_uniform(self, index):
+        return not isinstance(self.get_section(index), np.ndarray)
+
+    def section_array(self, index):
+        """Section als Array (einheitliche Sections werden dafür aufgefüllt)"""
+        section = self.get_section(index)
+        if isinstance(section, np.ndarray):
+            return section
+        return np.full((self.size, SECTION_HEIGHT, self.size), section, dtype=np.uint8)
+
+    def contains(self, x, y, z):
+        """Prüft ob eine Welt-Position innerhalb dieses Chunks liegt"""
+        local_x = x - self.world_x_start
+        local_z = z - self.world_z_start
+        return (0 <= local_x < self.size and 0 <= local_z < self.size
+                and self.min_y <= y < self.max_y)
+
+    def get_block(self, x, y, z):
+        """Gibt die Block-ID an einer Welt-Position zurück (AIR außerhalb)"""
+        if not self.contains(x, y, z):
+            return AIR
+        section = self.sections[(y - self.min_y) // SECTION_HEIGHT]
+        if not isinstance(section, np.ndarray):
+            return section
+        return int(section[x - self.world_x_start, (y - self.min_y) % SECTION_HEIGHT, z - self.world_z_start])
+
+    def set_block(self, x, y, z, block_id):
+        """Setzt einen Block an einer Welt-Position"""
+        if not self.contains(x, y, z):
+            self.overflow.append((x, y, z, block_id))
+            return
+
+        local = (y - self.min_y) // SECTION_HEIGHT
+        section = self.sections[local]
+        if not isinstance(section, np.ndarray):
+            if section == block_id:
+                return
+            section = np.full((self.size, SECTION_HEIGHT, self.size), section, dtype=np.uint8)
+            self.sections[local] = section
+        section[x - self.world_x_start, (y - self.min_y) % SECTION_HEIGHT, z - self.world_z_start] = block_id
+
+    def set_column(self, x, z, low, high, block_id):
+        """Setzt die Zellen [low, high) einer Säule im Chunk auf block_id
+
+        Schneller als set_block pro Zelle (ein Slice pro Section). Höhen
+        außerhalb von [min_y, max_y) werden ignoriert, nicht in overflow gelegt.
+        """
+        local_x = x - self.world_x_start
+        local_z = z - self.world_z_start
+        y = max(low, self.min_y)
+        high = min(high, self.max_y)
+        while y < high:
+            local = (y - self.min_y) // SECTION_HEIGHT
+            base = self.min_y + local * SECTION_HEIGHT
+            end = min(high, base + SECTION_HEIGHT)
+            section = self.sections[local]
+            if not isinstance(section, np.ndarray):
+                if section == block_id:
+                    y = end
+                    continue
+                section = np.full((self.size, SECTION_HEIGHT, self.size), section, dtype=np.uint8)
+                self.sections[local] = section
+            section[local_x, y - base:end - base, local_z] = block_id
+            y = end
+
+    def fill_where(self, low, high, mask, block_id):
+        """Setzt alle Zellen der Höhen [low, high) mit mask[x, y - low, z] auf block_id
+
+        mask hat die Form (size, high - low, size). Vektorisiert pro Section.
+        """
+        low_clipped = max(low, self.min_y)
+        high_clipped = min(high, self.max_y)
+        y = low_clipped
+        while y < high_clipped:
+            local = (y - self.min_y) // SECTION_HEIGHT
+            base = self.min_y + local * SECTION_HEIGHT
+            end = min(high_clipped, base + SECTION_HEIGHT)
+            part = mask[:, y - low:end - low, :]
+            if part.any():
+                section = self.sections[local]
+                if not isinstance(section, np.ndarray):
+                    section = np.full((self.size, SECTION_HEIGHT, self.size), section, dtype=np.uint8)
+                    self.sections[local] = section
+                section[:, y - base:end - base, :][part] = block_id
+            y = end
+
+    def compact(self):
+        """Speichert einheitlich gewordene Sections wieder als einzelne Block-ID"""
+        for local, section in enumerate(self.sections):
+            if isinstance(section, np.ndarray):
+                first = section.flat[0]
+                if np.all(section == first):
+                    self.sections[local] = int(first)
+        return self
+
+    def get_slab(self, low, high):
+        """Dichtes Array (size, high - low, size) der Welt-Höhen [low, high) - AIR außerhalb"""
+        slab = np.full((self.size, high - low, self.size), AIR, dtype=np.uint8)
+        for index in range(section_index(low), section_index(high - 1) + 1):
+            section = self.get_section(index)
+            base = index * SECTION_HEIGHT
+            start = max(low, base)
+            end = min(high, base + SECTION_HEIGHT)
+            if isinstance(section, np.ndarray):
+                slab[:, start - low:end - low, :] = section[:, start - base:end - base, :]
+            elif section != AIR:
+                slab[:, start - low:end - low, :] = section
+        return slab
+
+    @property
+    def blocks(self):
+        """Alle Blöcke als dichtes Array (size, max_y - min_y, size) - eine Kopie"""
+        return self.get_slab(self.min_y, self.max_y)
+
+    @blocks.setter
+    def blocks(self, blocks):
+        for local in range(len(self.sections)):
+            self.sections[local] = blocks[:, local * SECTION_HEIGHT:(local + 1) * SECTION_HEIGHT, :].copy()
+        self.compact()
+
+    def get_height(self, x, z):
+        """Generierte Terrain-Höhe an einer Welt-Säule (None ohne Heightmap/außerhalb)"""
+        local_x = x - self.world_x_start
+        local_z = z - self.world_z_start
+        if self.heightmap is None or not (0 <= local_x < self.size and 0 <= local_z < self.size):
+            return None
+        return int(self.heightmap[local_x, local_z])
+
+    def iter_blocks(self):
+        """Liefert (x, y, z, block_id) für alle Blöcke in Welt-Koordinaten"""
+        for index in self.section_indices():
+            section = self.section_array(index)
+            local_xs, local_ys, local_zs = np.nonzero(section != AIR)
+            base = index * SECTION_HEIGHT
+            for local_x, local_y, local_z in zip(local_xs.tolist(), local_ys.tolist(), local_zs.tolist()):
+                yield (self.world_x_start + local_x,
+                       base + local_y,
+                       self.world_z_start + local_z,
+                       int(section[local_x, local_y, local_z]))
+
+        for block in self.overflow:
+            yield block
+
+    @property
+    def block_count(self):
+        count = len(self.overflow)
+        for section in self.sections:
+            if isinstance(section, np.ndarray):
+                count += int(np.count_nonzero(section != AIR))
+            elif section != AIR:
+                count += self.size * SECTION_HEIGHT * self.size
+        return count
+
+    @property
+    def nbytes(self):
+        """Geschätzter Speicherbedarf der Voxel-Daten in Bytes"""
+        nbytes = len(self.overflow) * 4
+        for section in self.sections:
+            nbytes += section.nbytes if isinstance(section, np.ndarray) else 1
+        if self.heightmap is not None:
+            nbytes += self.heightmap.nbytes + self.biome_map.nbytes
+        return nbytes
+
+    def to_bytes(self):
+        """Serialisiert den Chunk (unkomprimiert) für die Persistenz"""
+        parts = [
+            _HEADER.pack(FORMAT_VERSION, self.chunk_x, self.chunk_z, self.size,
+                         self.min_y, self.max_y, len(self.overflow))
+        ]
+        for section in self.sections:
+            if isinstance(section, np.ndarray):
+                parts.append(_SECTION_UNIFORM.pack(False, 0))
+                parts.append(section.tobytes())
+            else:
+                parts.append(_SECTION_UNIFORM.pack(True, section))
+        parts.extend(_OVERFLOW_ENTRY.pack(*block) for block in self.overflow)
+        parts.append(_MAPS_FLAG.pack(self.heightmap is not None))
+        if self.heightmap is not None:
+            parts.append(self.heightmap.astype('<i2').tobytes())
+            parts.append(self.biome_map.astype(np.uint8).tobytes())
+        parts.append(json.dumps(self.metadata).encode('utf-8'))
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Gegenstück zu to_bytes - gibt None bei fremder Format-Version zurück
+
+        Version 1 (ohne Heightmap) und 2 (dichtes Array) werden noch gelesen,
+        heightmap bleibt bei Version 1 None.
+        """
+        version, chunk_x, chunk_z, size, min_y, max_y, overflow_count = _HEADER.unpack_from(data, 0)
+        if version not in (1, 2, FORMAT_VERSION):
+            return None
+
+        chunk = cls(chunk_x, chunk_z, size, min_y, max_y)
+        offset = _HEADER.size
+        if version >= 3:
+            section_bytes = size * SECTION_HEIGHT * size
+            for local in range(len(chunk.sections)):
+                uniform, block_id = _SECTION_UNIFORM.unpack_from(data, offset)
+                offset += _SECTION_UNIFORM.size
+                if uniform:
+                    chunk.sections[local] = block_id
+                else:
+                    chunk.sections[local] = np.frombuffer(data, dtype=np.uint8, count=section_bytes, offset=offset) \
+                        .reshape(size, SECTION_HEIGHT, size).copy()
+                    offset += section_bytes
+        else:
+            # Dichtes Array über [min_y, max_y) - auf die Section-Grenzen auffüllen
+            block_bytes = size * (max_y - min_y) * size
+            blocks = np.full((size, chunk.height, size), AIR, dtype=np.uint8)
+            blocks[:, min_y - chunk.min_y:max_y - chunk.min_y, :] = np.frombuffer(
+                data, dtype=np.uint8, count=block_bytes, offset=offset).reshape(size, max_y - min_y, size)
+            chunk.blocks = blocks
+            offset += block_bytes
+
+        for _ in range(overflow_count):
+            chunk.overflow.append(_OVERFLOW_ENTRY.unpack_from(data, offset))
+            offset += _OVERFLOW_ENTRY.size
+
+        if version >= 2:
+            has_maps, = _MAPS_FLAG.unpack_from(data, offset)
+            offset += _MAPS_FLAG.size
+            if has_maps:
+                columns = size * size
+                chunk.heightmap = np.frombuffer(data, dtype='<i2', count=columns, offset=offset) \
+                    .reshape(size, size).astype(np.int16)
+                offset += columns * 2
+                chunk.biome_map = np.frombuffer(data, dtype=np.uint8, count=columns, offset=offset) \
+                    .reshape(size, size).copy()
+                offset += columns
+
+        chunk.metadata = json.loads(bytes(data[offset:]).decode('utf-8'))
+        return chunk
+
+    def __repr__(self):
+        uniform = sum(1 for section in self.sections if not isinstance(section, np.ndarray))
+        return (f"ChunkData(({self.chunk_x}, {self.chunk_z}), size={self.size}, "
+                f"y={self.min_y}..{self.max_y}, sections={len(self.sections)} ({uniform} uniform), "
+                f"blocks={self.block_count})")
@@ -0,0 +1,236 @@
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor, ProcessPoolExecutor, wait
+from terrain_generator import FastWorldGenerator, record_generated_chunk
+
+
+class ChunkLoader:
+    """Generiert Chunks asynchron in Worker-Threads
+
+    request() stellt einen Chunk in die Warteschlange, fertige ChunkData
+    landen in einer Queue, die der Main-Thread mit drain() abholt.
+    Noch nicht gestartete Aufträge lassen sich mit cancel_except() verwerfen.
+    """
+
+    def __init__(self, world_generator, workers=2):
+        self.world_gen = world_generator
+        self.workers = workers
+        self._executor = self._create_executor()
+        self._results = queue.Queue()
+        self._pending = {}
+        self._lock = threading.Lock()
+
+        self.requested = 0
+        self.completed = 0
+        self.cancelled = 0
+
+    def _create_executor(self):
+        return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='chunk-gen')
+
+    def _submit(self, chunk_key):
+        """Startet die Generierung eines Chunks und gibt das Future zurück"""
+        return self._executor.submit(self.world_gen.get_chunk, *chunk_key)
+
+    def request(self, chunk_x, chunk_z):
+        """Fordert einen Chunk an (doppelte Anfragen werden ignoriert)"""
+        chunk_key = (chunk_x, chunk_z)
+        with self._lock:
+            if chunk_key in self._pending:
+                return False
+            future = self._submit(chunk_key)
+            self._pending[chunk_key] = future
+            self.requested += 1
+        future.add_done_callback(lambda done, key=chunk_key: self._on_done(key, done))
+        return True
+
+    def is_pending(self, chunk_key):
+        with self._lock:
+            return chunk_key in self._pending
+
+    def _on_done(self, chunk_key, future):
+        """Läuft im Worker- bzw. Executor-Thread"""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            self._results.put((chunk_key, None, error))
+        else:
+            self._results.put((chunk_key, self._accept(future.result()), None))
+
+    def _accept(self, chunk):
+        """Nachbearbeitung eines fertigen Chunks im Haupt-Prozess"""
+        return chunk
+
+    def generate_batch(self, chunk_keys):
+        """Generiert mehrere Chunks parallel und wartet auf alle (z.B. Spawn-Bereich)
+
+        Gibt {chunk_key: ChunkData} zurück, fehlgeschlagene Chunks fehlen.
+        """
+        futures = {chunk_key: self._submit(chunk_key) for chunk_key in chunk_keys}
+        wait(futures.values())
+
+        chunks = {}
+        for chunk_key, future in futures.items():
+            error = future.exception()
+            if error is not None:
+                print(f"Error generating chunk {chunk_key}: {error}")
+                continue
+            chunks[chunk_key] = self._accept(future.result())
+        return chunks
+
+    def cancel_except(self, wanted):
+        """Verwirft alle wartenden Aufträge, die nicht in wanted liegen"""
+        cancelled = 0
+        with self._lock:
+            for chunk_key in list(self._pending.keys()):
+                if chunk_key in wanted:
+                    continue
+                if self._pending[chunk_key].cancel():
+                    del self._pending[chunk_key]
+                    cancelled += 1
+        self.cancelled += cancelled
+        return cancelled
+
+    def drain(self, max_items=None):
+        """Gibt fertige Chunks als Liste von (chunk_key, chunk, error) zurück"""
+        finished = []
+        while max_items is None or len(finished) < max_items:
+            try:
+                chunk_key, chunk, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._pending.pop(chunk_key, None)
+            self.completed += 1
+            finished.append((chunk_key, chunk, error))
+        return finished
+
+    def get_stats(self):
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            'workers': self.workers,
+            'pending': pending,
+            'requested': self.requested,
+            'completed': self.completed,
+            'cancelled': self.cancelled
+        }
+
+    def shutdown(self):
+        """Bricht wartende Aufträge ab und beendet die Worker"""
+        self.cancel_except(set())
+        self._executor.shutdown(wait=False)
+
+
+class ProcessChunkLoader(ChunkLoader):
+    """Generiert Chunks in Worker-Prozessen (umgeht den GIL)
+
+    Jeder Prozess hält einen eigenen FastWorldGenerator für den Seed und
+    schickt nur die kompakten ChunkData zurück. Fertige Chunks werden im
+    Cache des Haupt-Generators abgelegt. Der Region-Store wird vorher in
+    einem eigenen I/O-Thread gefragt, nie im Main-Thread.
+    """
+
+    def __init__(self, world_generator, workers=None):
+        if workers is None:
+            workers = max(1, (os.cpu_count() or 2) - 1)
+        self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix='chunk-io')
+        super().__init__(world_generator, workers)
+
+    def _create_executor(self):
+        # spawn statt fork: der Haupt-Prozess hat bereits Panda3D/OpenGL Threads
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(self.world_gen.seed, self.world_gen.chunk_size, self.world_gen.deterministic,
+                      self.world_gen.density_caves)
+        )
+
+    def _submit(self, chunk_key):
+        # Gecachte Chunks nicht erneut verschicken
+        future = Future()
+        known = self.world_gen.get_cached_chunk(chunk_key)
+        if known is not None:
+            future.set_result(known)
+        elif self.world_gen.store:
+            # Store lesen (mmap + zlib) im I/O-Thread, erst bei einem Fehlschlag generieren
+            self._io.submit(self._load_or_generate, chunk_key, future)
+        else:
+            self._generate(chunk_key, future)
+        return future
+
+    def _load_or_generate(self, chunk_key, future):
+        """Läuft im I/O-Thread"""
+        if future.cancelled():
+            return
+        try:
+            stored = self.world_gen.store.load(chunk_key)
+        except Exception as e:
+            _set_future(future, error=e)
+            return
+        if stored is None:
+            self._generate(chunk_key, future)
+            return
+        self.world_gen.cache_chunk(stored)
+        _set_future(future, result=stored)
+
+    def _generate(self, chunk_key, future):
+        """Generiert im Worker-Prozess, future folgt dem Ergebnis (und cancel() in beide Richtungen)"""
+        try:
+            worker_future = self._executor.submit(_generate_in_worker, chunk_key)
+        except RuntimeError as e:  # Executor schon heruntergefahren
+            _set_future(future, error=e)
+            return
+        future.add_done_callback(lambda done: done.cancelled() and worker_future.cancel())
+        worker_future.add_done_callback(lambda done: _forward_future(done, future))
+
+    def _accept(self, chunk):
+        if self.world_gen.chunk_cache.peek(chunk.key) is chunk:
+            return chunk  # Kam aus Cache oder Store
+        # Metriken der Worker-Prozesse gehen verloren - hier nachtragen
+        record_generated_chunk(chunk)
+        self.world_gen.cache_chunk(chunk)
+        if self.world_gen.store:
+            self.world_gen.store.save_async(chunk)
+        return chunk
+
+    def shutdown(self):
+        self.cancel_except(set())
+        self._io.shutdown(wait=False, cancel_futures=True)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _set_future(future, result=None, error=None):
+    """Setzt Ergebnis bzw. Fehler, außer die Anfrage wurde inzwischen abgebrochen"""
+    try:
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+    except InvalidStateError:
+        pass
+
+
+def _forward_future(source, target):
+    if source.cancelled():
+        target.cancel()
+    else:
+        _set_future(target, source.result() if source.exception() is None else None, source.exception())
+
+
+# Worker-Prozess Zustand
+_worker_generator = None
+
+
+def _init_worker(seed, chunk_size, deterministic, density_caves):
+    """Initialisiert den Generator einmal pro Worker-Prozess"""
+    global _worker_generator
+    _worker_generator = FastWorldGenerator(seed, chunk_size, deterministic=deterministic,
+                                           density_caves=density_caves)
+
+
+def _generate_in_worker(chunk_key):
+    return _worker_generator.generate_chunk(*chunk_key)
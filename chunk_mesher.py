@@ -0,0 +1,531 @@
+import queue
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from chunk_data import AIR, SECTION_HEIGHT
+from lighting import MAX_LIGHT
+
+# Richtungen als (Achse, Vorzeichen): 0 = x, 1 = y, 2 = z
+FACE_DIRECTIONS = ((0, 1), (0, -1), (1, 1), (1, -1), (2, 1), (2, -1))
+
+# Textur-Achsen (u, v) je Achse der Flächennormale - Seitenflächen stehen aufrecht
+_UV_AXES = {0: (2, 1), 1: (0, 2), 2: (0, 1)}
+_U_AXIS = np.array([_UV_AXES[axis][0] for axis in range(3)])
+_V_AXIS = np.array([_UV_AXES[axis][1] for axis in range(3)])
+
+# Ob die Standard-Ecken (u, v) eines Quads für eine Normale umgedreht werden müssen:
+# Ursina (linkshändig) zeigt die Vorderseite, wenn cross(u, v) entgegen der Normale zeigt
+_FLIP_WINDING = {(0, 1): False, (0, -1): True, (1, 1): False, (1, -1): True, (2, 1): True, (2, -1): False}
+
+# Ecken eines Quads (0, 0), (w, 0), (w, h), (0, h) als Faktoren von Breite und Höhe
+_CORNER_U = np.array([0, 1, 1, 0])
+_CORNER_V = np.array([0, 0, 1, 1])
+_CORNERS = np.arange(4)
+_CORNERS_REVERSED = _CORNERS[::-1]
+
+# Gebackene Helligkeit: Licht-Stufe 0..15, feste Schattierung pro Flächen-Richtung
+# (ersetzt die DirectionalLight) und Ambient Occlusion 0 (drei Verdecker) .. 3 (frei)
+LIGHT_CURVE = np.array([max(0.12, 0.82 ** (MAX_LIGHT - level)) for level in range(MAX_LIGHT + 1)],
+                       dtype=np.float32)
+FACE_SHADE = {(0, 1): 0.8, (0, -1): 0.8, (1, 1): 1.0, (1, -1): 0.5, (2, 1): 0.65, (2, -1): 0.65}
+AO_CURVE = np.array([0.5, 0.68, 0.84, 1.0], dtype=np.float32)
+
+# Lookup-Tabellen pro Richtung für _quads_to_mesh, Index: Achse * 2 + (Vorzeichen > 0)
+_DIRECTIONS = [(index // 2, 1 if index % 2 else -1) for index in range(6)]
+_FLIP_TABLE = np.array([_FLIP_WINDING[direction] for direction in _DIRECTIONS])
+_FACE_SHADE_TABLE = np.array([FACE_SHADE[direction] for direction in _DIRECTIONS], dtype=np.float32)
+
+# Ecken eines Quads (0, 0), (w, 0), (w, h), (0, h) als Richtung (u, v) für die AO
+_AO_CORNERS = ((-1, -1), (1, -1), (1, 1), (-1, 1))
+
+# Schlüssel des Meshes der Blöcke außerhalb der Sections (ChunkData.overflow)
+OVERFLOW = 'overflow'
+
+# Flächen-Schlüssel beim Greedy-Merging: Block-ID | Licht << 8 | AO der 4 Ecken << 12
+_NO_FACE = -1
+_LIGHT_SHIFT = 8
+_AO_SHIFT = 12
+_AO_OPEN = 0xFF  # alle vier Ecken frei
+
+
+class ChunkMesh:
+    """Headless Mesh-Daten eines Chunks (Vertices, UVs, Normalen, Dreiecke)
+
+    block_ids enthält pro Vertex die Block-ID, damit der Renderer das Mesh
+    nach Textur aufteilen kann. shades ist die gebackene Helligkeit pro
+    Vertex (Licht, Flächen-Schattierung, Ambient Occlusion - 1.0 ohne Licht).
+    """
+
+    def __init__(self, vertices, uvs, normals, triangles, block_ids, shades=None):
+        self.vertices = vertices
+        self.uvs = uvs
+        self.normals = normals
+        self.triangles = triangles
+        self.block_ids = block_ids
+        self.shades = shades if shades is not None else np.ones(len(vertices), dtype=np.float32)
+
+    @classmethod
+    def empty(cls):
+        return cls(np.zeros((0, 3), dtype=np.float32),
+                   np.zeros((0, 2), dtype=np.float32),
+                   np.zeros((0, 3), dtype=np.float32),
+                   np.zeros((0, 3), dtype=np.int32),
+                   np.zeros(0, dtype=np.uint8),
+                   np.zeros(0, dtype=np.float32))
+
+    @classmethod
+    def from_quads(cls, vertices, normals, block_ids, shades=None, uvs=None):
+        """Mesh aus je 4 Vertices pro Quad (Ecken gegen den Uhrzeigersinn von außen)"""
+        vertices = np.asarray(vertices, dtype=np.float32).reshape(-1, 3)
+        if uvs is None:
+            uvs = np.zeros((len(vertices), 2), dtype=np.float32)
+        return cls(vertices, uvs, np.asarray(normals, dtype=np.float32).reshape(-1, 3),
+                   _quad_triangles(len(vertices) // 4), np.asarray(block_ids, dtype=np.uint8),
+                   None if shades is None else np.asarray(shades, dtype=np.float32))
+
+    @property
+    def is_shaded(self):
+        return bool(len(self.shades)) and bool((self.shades != 1).any())
+
+    @property
+    def vertex_count(self):
+        return len(self.vertices)
+
+    @property
+    def triangle_count(self):
+        return len(self.triangles)
+
+    @property
+    def quad_count(self):
+        return len(self.vertices) // 4
+
+    def select_quads(self, quads):
+        """Teil-Mesh aus den Quads mit den Indizes quads"""
+        vertex_index = (np.asarray(quads)[:, None] * 4 + np.arange(4)).ravel()
+        return ChunkMesh(
+            self.vertices[vertex_index],
+            self.uvs[vertex_index],
+            self.normals[vertex_index],
+            _quad_triangles(len(quads)),
+            self.block_ids[vertex_index],
+            self.shades[vertex_index]
+        )
+
+    @classmethod
+    def concatenate(cls, meshes):
+        """Fügt Meshes (z.B. die Sections eines Chunks) zu einem zusammen"""
+        meshes = [mesh for mesh in meshes if mesh.vertex_count]
+        if not meshes:
+            return cls.empty()
+        if len(meshes) == 1:
+            return meshes[0]
+        return cls(np.concatenate([mesh.vertices for mesh in meshes]),
+                   np.concatenate([mesh.uvs for mesh in meshes]),
+                   np.concatenate([mesh.normals for mesh in meshes]),
+                   _quad_triangles(sum(mesh.quad_count for mesh in meshes)),
+                   np.concatenate([mesh.block_ids for mesh in meshes]),
+                   np.concatenate([mesh.shades for mesh in meshes]))
+
+    def split_by_block(self):
+        """Teilt das Mesh in ein Teil-Mesh pro Block-ID auf"""
+        quad_ids = self.block_ids[::4]
+        return {block_id: self.select_quads(np.nonzero(quad_ids == block_id)[0])
+                for block_id in np.unique(quad_ids).tolist()}
+
+
+def build_chunk_mesh(chunk, transparent_ids=(), neighbours=None, light=None, ambient_occlusion=False):
+    """Baut ein face-culled, greedy gemergtes Mesh für einen Chunk
+
+    Args:
+        chunk: ChunkData des Chunks
+        transparent_ids: Block-IDs durch die man hindurchsieht (Wasser, Blätter, ...)
+        neighbours: dict {(dx, dz): ChunkData} der geladenen Nachbarn. Fehlende
+            Nachbarn gelten als Luft, die Randflächen werden also gezeichnet.
+        light: optional light(section_index) -> Licht-Volumen der Section mit
+            einer Zelle Rand (LightEngine.padded_light). Jede Fläche bekommt
+            das Licht der Zelle vor ihr als Vertex-Helligkeit (shades).
+        ambient_occlusion: Vertex-AO aus den drei Nachbarzellen jeder Ecke
+
+    Mit Licht oder AO werden nur Flächen gleicher Helligkeit gemergt.
+
+    Gebaut wird pro Section - einheitliche Sections ohne sichtbare Flächen
+    (Luft, oder rundum vom selben bzw. undurchsichtigen Block umgeben)
+    werden übersprungen. Die Koordinaten sind chunk-lokal: Zelle
+    (x, y - min_y, z) belegt den Würfel [x, x+1] x [y, y+1] x [z, z+1].
+    """
+    transparent = _transparent_table(transparent_ids)
+    neighbours = neighbours or {}
+
+    meshes = [build_section_mesh(chunk, index, transparent, neighbours, light, ambient_occlusion)
+              for index in chunk.section_indices()]
+    meshes.append(build_overflow_mesh(chunk))
+
+    return ChunkMesh.concatenate(meshes)
+
+
+def build_section_meshes(chunk, transparent_ids=(), neighbours=None, indices=None, light=None,
+                         ambient_occlusion=False):
+    """Einzelne Meshes {section_index: ChunkMesh} statt eines Chunk-Meshes
+
+    indices wählt die Sections (None: alle plus OVERFLOW), Indizes
+    außerhalb des Chunks werden ignoriert. Übrige Argumente wie bei
+    build_chunk_mesh - so kann jede Section als eigene Geometrie
+    hochgeladen und nach einem Edit einzeln ersetzt werden.
+    """
+    inputs = prepare_sections(chunk, transparent_ids, neighbours, indices, light, ambient_occlusion)
+    return mesh_sections(inputs, transparent_ids)
+
+
+def prepare_sections(chunk, transparent_ids=(), neighbours=None, indices=None, light=None,
+                     ambient_occlusion=False):
+    """Erster Teil von build_section_meshes: Kopien der Eingaben pro Section
+
+    Liest ChunkData, Nachbarn und Licht und muss daher im Main-Thread
+    laufen. Das Ergebnis {section_index: SectionInput, Quads bzw. None}
+    teilt keine Arrays mit den Chunks - mesh_sections kann es danach in
+    einem Worker-Thread bauen (siehe MeshWorker).
+    """
+    transparent = _transparent_table(transparent_ids)
+    neighbours = neighbours or {}
+    if indices is None:
+        indices = list(chunk.section_indices()) + [OVERFLOW]
+
+    inputs = {}
+    for index in indices:
+        if index == OVERFLOW:
+            inputs[index] = _overflow_quads(chunk)
+        elif index in chunk.section_indices():
+            inputs[index] = prepare_section(chunk, index, transparent, neighbours, light, ambient_occlusion)
+    return inputs
+
+
+def mesh_sections(inputs, transparent_ids=()):
+    """Zweiter Teil von build_section_meshes: {section_index: ChunkMesh} aus prepare_sections
+
+    Greift nicht auf ChunkData zu und ist damit thread-sicher.
+    """
+    transparent = _transparent_table(transparent_ids)
+    meshes = {}
+    for index, section_input in inputs.items():
+        if index == OVERFLOW:
+            meshes[index] = _quads_to_mesh(section_input)
+        else:
+            meshes[index] = mesh_section(section_input, transparent)
+    return meshes
+
+
+def build_overflow_mesh(chunk):
+    """Einzelne Würfel für Blöcke außerhalb der Sections (ohne Culling und Merging)"""
+    return _quads_to_mesh(_overflow_quads(chunk))
+
+
+def _overflow_quads(chunk):
+    quads = []
+    for x, y, z, block_id in chunk.overflow:
+        local = (x - chunk.world_x_start, y - chunk.min_y, z - chunk.world_z_start)
+        for axis, sign in FACE_DIRECTIONS:
+            plane = local[axis] + (1 if sign > 0 else 0)
+            u_axis, v_axis = _UV_AXES[axis]
+            quads.append((axis, sign, plane, local[u_axis], local[v_axis], 1, 1, block_id))
+    return quads
+
+
+# Eingaben einer Section für mesh_section: Voxel mit margin Zellen Rand,
+# Licht mit einer Zelle Rand (None: ohne Licht) und die y-Verschiebung
+SectionInput = namedtuple('SectionInput', ['padded', 'margin', 'light', 'ambient_occlusion', 'y_offset'])
+
+
+def build_section_mesh(chunk, index, transparent, neighbours, light=None, ambient_occlusion=False):
+    """Mesh einer Section in chunk-lokalen Koordinaten (transparent: Tabelle aus _transparent_table)"""
+    section_input = prepare_section(chunk, index, transparent, neighbours, light, ambient_occlusion)
+    return mesh_section(section_input, transparent)
+
+
+def prepare_section(chunk, index, transparent, neighbours, light=None, ambient_occlusion=False):
+    """SectionInput einer Section (None: keine sichtbare Fläche)"""
+    if _section_hidden(chunk, index, transparent, neighbours):
+        return None
+
+    # Für die AO braucht jede Zelle vor einer Fläche auch deren Nachbarn
+    margin = 2 if ambient_occlusion else 1
+    return SectionInput(
+        padded=_padded_section(chunk, index, neighbours, margin),
+        margin=margin,
+        light=light(index) if light is not None else None,
+        ambient_occlusion=ambient_occlusion,
+        y_offset=index * SECTION_HEIGHT - chunk.min_y
+    )
+
+
+def mesh_section(section_input, transparent):
+    """Face-Culling und Greedy-Merging einer vorbereiteten Section (None: leeres Mesh)"""
+    if section_input is None:
+        return ChunkMesh.empty()
+
+    padded, margin, light_volume, ambient_occlusion, y_offset = section_input
+    inner = _shifted(padded, margin)
+    opaque = ~transparent[padded] if ambient_occlusion else None
+    shaded = light_volume is not None or ambient_occlusion
+
+    quads = []
+    for axis, sign in FACE_DIRECTIONS:
+        # Nachbarzelle in Richtung der Flächennormale
+        offset = [0, 0, 0]
+        offset[axis] = sign
+        neighbour = _shifted(padded, margin, offset)
+
+        visible = (inner != AIR) & transparent[neighbour] & (neighbour != inner)
+        keys = inner.astype(np.int32)
+        if shaded:
+            if light_volume is not None:
+                keys |= _shifted(light_volume, 1, offset).astype(np.int32) << _LIGHT_SHIFT
+            else:
+                keys |= MAX_LIGHT << _LIGHT_SHIFT
+            if ambient_occlusion:
+                keys |= _ambient_occlusion(opaque, margin, axis, sign) << _AO_SHIFT
+            else:
+                keys |= _AO_OPEN << _AO_SHIFT
+        faces = np.where(visible, keys, _NO_FACE)
+        _greedy_quads(faces, axis, sign, quads)
+
+    mesh = _quads_to_mesh(quads, shaded)
+    mesh.vertices[:, 1] += y_offset
+    return mesh
+
+
+def _shifted(volume, margin, offset=(0, 0, 0)):
+    """Innerer Bereich eines Volumens mit margin Zellen Rand, um offset verschoben"""
+    return volume[tuple(slice(margin + o, volume.shape[axis] - margin + o) for axis, o in enumerate(offset))]
+
+
+def _ambient_occlusion(opaque, margin, axis, sign):
+    """AO-Stufen der vier Ecken jeder Fläche, je 2 Bit in der Reihenfolge von _AO_CORNERS
+
+    Pro Ecke zählen die beiden Kanten-Nachbarn und der Eck-Nachbar der Zelle
+    vor der Fläche. Sind beide Kanten verdeckt, ist die Ecke ganz dunkel.
+    """
+    u_axis, v_axis = _UV_AXES[axis]
+    result = np.zeros(_shifted(opaque, margin).shape, dtype=np.int32)
+    for corner_index, (du, dv) in enumerate(_AO_CORNERS):
+        side_u = [0, 0, 0]
+        side_u[axis], side_u[u_axis] = sign, du
+        side_v = [0, 0, 0]
+        side_v[axis], side_v[v_axis] = sign, dv
+        corner = list(side_u)
+        corner[v_axis] = dv
+
+        edge_u = _shifted(opaque, margin, side_u)
+        edge_v = _shifted(opaque, margin, side_v)
+        level = 3 - edge_u.astype(np.int32) - edge_v - _shifted(opaque, margin, corner)
+        level[edge_u & edge_v] = 0
+        result |= level << (2 * corner_index)
+    return result
+
+
+def _transparent_table(transparent_ids):
+    """Lookup-Tabelle Block-ID -> durchsichtig (Luft immer)"""
+    transparent = np.zeros(256, dtype=bool)
+    transparent[AIR] = True
+    transparent[list(transparent_ids)] = True
+    return transparent
+
+
+def _section_hidden(chunk, index, transparent, neighbours):
+    """Ob eine einheitliche Section sicher keine sichtbare Fläche hat
+
+    Eine Fläche ist sichtbar, wenn die Nachbarzelle durchsichtig ist und
+    einen anderen Block enthält - bei einheitlichen Nachbar-Sections lässt
+    sich das ohne Blick auf einzelne Zellen entscheiden.
+    """
+    section = chunk.get_section(index)
+    if isinstance(section, np.ndarray):
+        return False
+    if section == AIR:
+        return True
+
+    adjacent = [chunk.get_section(index - 1), chunk.get_section(index + 1)]
+    for offset in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+        neighbour = neighbours.get(offset)
+        adjacent.append(neighbour.get_section(index) if neighbour is not None else AIR)
+    return all(not isinstance(other, np.ndarray) and (other == section or not transparent[other])
+               for other in adjacent)
+
+
+def _padded_section(chunk, index, neighbours, margin=1):
+    """Voxel-Volumen einer Section mit margin Zellen Rand aus Nachbar-Sections und -Chunks
+
+    Diagonale Nachbar-Chunks fehlen - diese Ecken gelten als Luft.
+    """
+    size = chunk.size
+    base = index * SECTION_HEIGHT
+    m = margin
+    padded = np.full((size + 2 * m, SECTION_HEIGHT + 2 * m, size + 2 * m), AIR, dtype=np.uint8)
+    padded[m:-m, :, m:-m] = chunk.get_slab(base - m, base + SECTION_HEIGHT + m)
+
+    for (dx, dz), neighbour in neighbours.items():
+        if neighbour is None:
+            continue
+        column = neighbour.get_slab(base - m, base + SECTION_HEIGHT + m)
+        if dx == -1:
+            padded[:m, :, m:-m] = column[size - m:, :, :]
+        elif dx == 1:
+            padded[-m:, :, m:-m] = column[:m, :, :]
+        elif dz == -1:
+            padded[m:-m, :, :m] = column[:, :, size - m:]
+        elif dz == 1:
+            padded[m:-m, :, -m:] = column[:, :, :m]
+    return padded
+
+
+def _greedy_quads(faces, axis, sign, quads):
+    """Merged sichtbare Flächen mit gleichem Schlüssel (Block-ID, Licht, AO) pro Schicht zu Rechtecken"""
+    u_axis, v_axis = _UV_AXES[axis]
+    # Schichten entlang der Normale, 2D Maske mit Achsen (u, v)
+    layers = np.moveaxis(faces, (axis, u_axis, v_axis), (0, 1, 2))
+
+    for layer_index in range(layers.shape[0]):
+        layer = layers[layer_index]
+        if not np.any(layer != _NO_FACE):
+            continue
+
+        mask = layer.tolist()
+        size_u, size_v = layer.shape
+        plane = layer_index + (1 if sign > 0 else 0)
+
+        for v in range(size_v):
+            u = 0
+            while u < size_u:
+                key = mask[u][v]
+                if key == _NO_FACE:
+                    u += 1
+                    continue
+
+                # Breite entlang u
+                width = 1
+                while u + width < size_u and mask[u + width][v] == key:
+                    width += 1
+
+                # Höhe entlang v solange die ganze Zeile passt
+                height = 1
+                while v + height < size_v and all(
+                        mask[u + k][v + height] == key for k in range(width)):
+                    height += 1
+
+                for du in range(width):
+                    for dv in range(height):
+                        mask[u + du][v + dv] = _NO_FACE
+
+                quads.append((axis, sign, plane, u, v, width, height, key))
+                u += width
+
+
+def _quad_triangles(quad_count):
+    """Zwei Dreiecke pro Quad aus je 4 aufeinanderfolgenden Vertices"""
+    base = np.arange(quad_count, dtype=np.int32)[:, None] * 4
+    return (base + np.array([0, 1, 2, 0, 2, 3], dtype=np.int32)).reshape(-1, 3)
+
+
+def _quads_to_mesh(quads, shaded=False):
+    """Vertex-Daten aus Quads - mit shaded enthält der Schlüssel Licht und AO für die shades"""
+    if not quads:
+        return ChunkMesh.empty()
+
+    axis, sign, plane, u, v, width, height, key = np.array(quads, dtype=np.int64).T
+    direction = axis * 2 + (sign > 0)
+    # Vorderseite: Ecken von außen gesehen gegen den Uhrzeigersinn (Ursina Konvention)
+    corner = np.where(_FLIP_TABLE[direction][:, None], _CORNERS_REVERSED, _CORNERS)
+    cu = _CORNER_U[corner] * width[:, None]
+    cv = _CORNER_V[corner] * height[:, None]
+
+    rows = np.arange(len(quads) * 4)
+    axis = np.repeat(axis, 4)
+    vertices = np.zeros((len(rows), 3), dtype=np.float32)
+    vertices[rows, axis] = np.repeat(plane, 4)
+    vertices[rows, _U_AXIS[axis]] = (u[:, None] + cu).ravel()
+    vertices[rows, _V_AXIS[axis]] = (v[:, None] + cv).ravel()
+    uvs = np.stack([cu.ravel(), cv.ravel()], axis=1).astype(np.float32)
+    normals = np.zeros((len(rows), 3), dtype=np.float32)
+    normals[rows, axis] = np.repeat(sign, 4)
+    block_ids = np.repeat(key & 0xFF, 4).astype(np.uint8)
+
+    if shaded:
+        face_shade = _FACE_SHADE_TABLE[direction] * LIGHT_CURVE[(key >> _LIGHT_SHIFT) & 0xF]
+        ao = AO_CURVE[(key[:, None] >> (_AO_SHIFT + 2 * corner)) & 3]
+        shades = (face_shade[:, None] * ao).ravel().astype(np.float32)
+    else:
+        shades = np.ones(len(rows), dtype=np.float32)
+
+    return ChunkMesh(vertices, uvs, normals, _quad_triangles(len(quads)), block_ids, shades)
+
+
+class MeshWorker:
+    """Baut vorbereitete Sections (prepare_sections) in Worker-Threads zu Meshes
+
+    submit() übergibt die Eingaben eines Chunks an den Thread-Pool, fertige
+    {section_index: ChunkMesh} landen in einer Queue, die der Main-Thread
+    mit drain() abholt - dort werden nur noch Mesh und Entity erstellt.
+    finish(ChunkMesh) läuft ebenfalls im Worker und ersetzt die Meshes im
+    Ergebnis (z.B. ChunkRenderer.prepare_upload).
+    """
+
+    def __init__(self, transparent_ids=(), workers=1, finish=None):
+        self.transparent_ids = list(transparent_ids)
+        self.workers = workers
+        self.finish = finish
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='chunk-mesh')
+        self._results = queue.Queue()
+
+        self.submitted = 0
+        self.completed = 0
+
+    def submit(self, chunk_key, inputs, tag=None):
+        """Meshet inputs im Hintergrund, tag kommt unverändert mit dem Ergebnis zurück"""
+        return self.run(chunk_key, self._mesh, inputs, tag=tag)
+
+    def run(self, chunk_key, func, *args, tag=None):
+        """Führt andere Chunk-Arbeit func(*args) im Worker aus, Ergebnis wie bei submit über drain()"""
+        future = self._executor.submit(func, *args)
+        future.add_done_callback(lambda done: self._on_done(chunk_key, tag, done))
+        self.submitted += 1
+        return future
+
+    def _mesh(self, inputs):
+        meshes = mesh_sections(inputs, self.transparent_ids)
+        if self.finish is not None:
+            meshes = {index: self.finish(mesh) for index, mesh in meshes.items()}
+        return meshes
+
+    def _on_done(self, chunk_key, tag, future):
+        """Läuft im Worker-Thread"""
+        if future.cancelled():
+            return
+        error = future.exception()
+        self._results.put((chunk_key, tag, None if error is not None else future.result(), error))
+
+    def drain(self, max_items=None):
+        """Gibt fertige Ergebnisse als Liste von (chunk_key, tag, Ergebnis, error) zurück"""
+        results = []
+        while max_items is None or len(results) < max_items:
+            try:
+                results.append(self._results.get_nowait())
+            except queue.Empty:
+                break
+        self.completed += len(results)
+        return results
+
+    @property
+    def pending(self):
+        return self.submitted - self.completed
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self):
+        return {
+            'workers': self.workers,
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'pending': self.pending
+        }
@@ -0,0 +1,297 @@
+"""Level-of-Detail Terrain jenseits der voll geladenen Chunks
+
+Grobe Heightmap-Meshes aus demselben Noise wie FastWorldGenerator.get_height,
+ohne Voxel-Daten, Entities pro Block oder Collider. Mit der Entfernung wird
+die Oberfläche in größeren Schritten abgetastet (2, 4, 8 Blöcke).
+"""
+from collections import namedtuple
+
+import numpy as np
+from ursina import Entity, Mesh, Color, scene, destroy
+
+from block import BlockRegistry
+from chunk_mesher import ChunkMesh
+from scheduler import FrameScheduler
+from metrics import metrics
+
+# Ringe als (Abstand in Chunks, Abtast-Schritt in Blöcken) - von innen nach außen
+LOD_RINGS = ((6, 2), (12, 4), (24, 8))
+
+# Schürzen an Kachel- und Loch-Rändern reichen so weit unter die Oberfläche,
+# dass Sprünge zwischen LOD-Stufen und zu den vollen Chunks verdeckt sind
+SKIRT_DEPTH = 2
+
+# Gerenderte LOD-Kachel: Abtast-Schritt, ausgesparte (voll geladene) Chunks, Entity
+LodTile = namedtuple('LodTile', ['step', 'holes', 'entity', 'quad_count'])
+
+
+def sample_lod_tile(world_gen, x0, z0, size, step):
+    """Oberkante und Oberflächen-Block eines Quadrats [x0, x0 + size) x [z0, z0 + size)
+
+    Gibt (tops, block_ids) zurück: tops (n + 1, n + 1) ist die Höhe der
+    Oberfläche (Wasser auf Meereshöhe) an jedem Gitterpunkt, block_ids (n, n)
+    der Block an der unteren Ecke jedes Quads, mit n = size // step.
+    """
+    count = size // step
+    xs = x0 + np.arange(count + 1) * step
+    zs = z0 + np.arange(count + 1) * step
+    biome_grid = world_gen.get_biome_grid(xs, zs)
+    heights = world_gen.get_height_grid(xs, zs, biome_grid)
+
+    # Zelle y belegt [y - 1, y] - der oberste Block (Höhe - 1) endet bei Höhe - 1
+    tops = np.maximum(heights, world_gen.SEA_LEVEL) - 1
+    surface_ids = np.array([world_gen.BLOCKS[world_gen.BIOMES[name][0]] for name in world_gen.BIOME_NAMES])
+    block_ids = np.where(heights < world_gen.SEA_LEVEL, world_gen.BLOCKS['water'], surface_ids[biome_grid])
+    return tops.astype(np.float32), block_ids[:-1, :-1].astype(np.uint8)
+
+
+def build_lod_mesh(tops, block_ids, step, holes=None):
+    """Heightmap-Mesh einer Kachel in lokalen Koordinaten (Ecke bei 0, 0)
+
+    holes (bool, Form wie block_ids) markiert Quads, die ausgelassen werden.
+    An Kachelrändern und Löchern hängen senkrechte Schürzen nach unten.
+    Die Schattierung pro Quad kommt aus der Neigung (steile Hänge dunkler).
+    """
+    count = block_ids.shape[0]
+    keep = np.ones((count, count), dtype=bool) if holes is None else ~holes
+    quad_i, quad_j = np.nonzero(keep)
+    if not len(quad_i):
+        return ChunkMesh.empty()
+
+    # Oberfläche: Ecken (0, 0), (1, 0), (1, 1), (0, 1) in (x, z) - von oben gegen den Uhrzeigersinn
+    corner_i = quad_i[:, None] + np.array([0, 1, 1, 0])
+    corner_j = quad_j[:, None] + np.array([0, 0, 1, 1])
+    vertices = np.stack([corner_i * step, tops[corner_i, corner_j], corner_j * step], axis=-1).astype(np.float32)
+
+    diagonal_a = vertices[:, 2] - vertices[:, 0]
+    diagonal_b = vertices[:, 3] - vertices[:, 1]
+    normals = np.cross(diagonal_b, diagonal_a)
+    normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+    shades = np.repeat(0.6 + 0.4 * normals[:, 1], 4)
+    quad_normals = np.repeat(normals, 4, axis=0)
+    quad_ids = np.repeat(block_ids[quad_i, quad_j], 4)
+
+    skirts = _skirt_quads(tops, keep, quad_i, quad_j, step, block_ids)
+    top_mesh = ChunkMesh.from_quads(vertices, quad_normals, quad_ids, shades)
+    if not skirts:
+        return top_mesh
+    skirt_vertices, skirt_normals, skirt_ids = zip(*skirts)
+    skirt_mesh = ChunkMesh.from_quads(np.array(skirt_vertices), np.repeat(skirt_normals, 4, axis=0),
+                                      np.repeat(skirt_ids, 4), np.full(len(skirts) * 4, 0.55))
+    return ChunkMesh.concatenate([top_mesh, skirt_mesh])
+
+
+def _skirt_quads(tops, keep, quad_i, quad_j, step, block_ids):
+    """Senkrechte Quads an jeder Kante eines Quads ohne Nachbar-Quad in der Kachel"""
+    count = keep.shape[0]
+    quads = []
+    for i, j in zip(quad_i.tolist(), quad_j.tolist()):
+        for di, dj in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+            ni, nj = i + di, j + dj
+            if 0 <= ni < count and 0 <= nj < count and keep[ni, nj]:
+                continue
+            # Kante als zwei Gitterpunkte, Normale zeigt vom Quad weg
+            if di:
+                edge_i = i + (di > 0)
+                points = ((edge_i, j), (edge_i, j + 1))
+            else:
+                edge_j = j + (dj > 0)
+                points = ((i, edge_j), (i + 1, edge_j))
+            top_a, top_b = (float(tops[p]) for p in points)
+            bottom = min(top_a, top_b) - step - SKIRT_DEPTH
+            (ai, aj), (bi, bj) = points
+            corners = [(ai * step, bottom, aj * step), (bi * step, bottom, bj * step),
+                       (bi * step, top_b, bj * step), (ai * step, top_a, aj * step)]
+            # Vorderseite wie in chunk_mesher: cross(Kante, oben) zeigt entgegen der Normale
+            if (di < 0) if di else (dj > 0):
+                corners.reverse()
+            quads.append((corners, (di, 0, dj), block_ids[i, j]))
+    return quads
+
+
+class FarTerrain:
+    """LOD-Ringe aus Heightmap-Kacheln um die voll geladenen Chunks
+
+    Eine Kachel deckt tile_chunks x tile_chunks Chunks ab. Ihr Abtast-Schritt
+    hängt vom Abstand des nächsten Chunks zum Spieler ab (rings). Chunks, die
+    der Chunk-Manager voll geladen hat, werden aus der Kachel ausgespart -
+    nähert sich der Spieler, ersetzen die echten Chunks so nach und nach das
+    LOD-Mesh. Gebaut wird über den Scheduler des Chunk-Managers (niedrige
+    Priorität), die Abtastung wird pro Kachel und Schritt gecacht.
+    """
+
+    def __init__(self, chunk_manager, rings=LOD_RINGS, tile_chunks=4):
+        self.chunk_manager = chunk_manager
+        self.world_gen = chunk_manager.world_gen
+        # Ein Quad darf nicht über eine Chunk-Grenze reichen (Löcher pro Chunk)
+        self.rings = sorted((distance, min(step, self.world_gen.chunk_size)) for distance, step in rings)
+        self.tile_chunks = tile_chunks
+        self.tiles = {}
+        self._samples = {}
+        self._player_chunk = None
+        self._block_colors = None
+        self._quads_gauge = metrics.gauge('lod.quads')
+        self._quads_gauge.set(0)
+        metrics.gauge('lod.tiles', func=lambda: len(self.tiles))
+
+    def _defer(self, func, *args, key=None, priority=FrameScheduler.PRIORITY_LOW):
+        """Wie SimpleChunkManager._defer: über den Scheduler, ohne Scheduler sofort"""
+        scheduler = self.chunk_manager.scheduler
+        if scheduler:
+            return scheduler.schedule(func, *args, priority=priority, key=key)
+        func(*args)
+        return True
+
+    @property
+    def distance(self):
+        """Sichtweite der LOD-Ringe in Chunks"""
+        return self.rings[-1][0] if self.rings else 0
+
+    def tile_key(self, chunk_key):
+        return (chunk_key[0] // self.tile_chunks, chunk_key[1] // self.tile_chunks)
+
+    def tile_chunk_keys(self, tile_key):
+        base_x = tile_key[0] * self.tile_chunks
+        base_z = tile_key[1] * self.tile_chunks
+        return [(base_x + dx, base_z + dz) for dx in range(self.tile_chunks) for dz in range(self.tile_chunks)]
+
+    def _tile_step(self, tile_key):
+        """Abtast-Schritt einer Kachel nach dem Ring ihres nächsten Chunks (None: zu weit)"""
+        if self._player_chunk is None:
+            return None
+        player_x, player_z = self._player_chunk
+        low_x = tile_key[0] * self.tile_chunks
+        low_z = tile_key[1] * self.tile_chunks
+        distance = max(max(low_x - player_x, player_x - (low_x + self.tile_chunks - 1), 0),
+                       max(low_z - player_z, player_z - (low_z + self.tile_chunks - 1), 0))
+        for ring_distance, step in self.rings:
+            if distance <= ring_distance:
+                return step
+        return None
+
+    def _holes(self, tile_key):
+        loaded = self.chunk_manager.loaded_chunks
+        return frozenset(chunk_key for chunk_key in self.tile_chunk_keys(tile_key)
+                         if loaded.get(chunk_key) is not None)
+
+    def update(self, player_chunk):
+        """Plant Neubau für Kacheln mit neuem Schritt oder geänderten Löchern, entfernt zu weit entfernte"""
+        self._player_chunk = player_chunk
+        reach = self.distance
+        low = self.tile_key((player_chunk[0] - reach, player_chunk[1] - reach))
+        high = self.tile_key((player_chunk[0] + reach, player_chunk[1] + reach))
+        wanted = set()
+        for tile_x in range(low[0], high[0] + 1):
+            for tile_z in range(low[1], high[1] + 1):
+                tile_key = (tile_x, tile_z)
+                step = self._tile_step(tile_key)
+                if step is None:
+                    continue
+                wanted.add(tile_key)
+                tile = self.tiles.get(tile_key)
+                if tile is None or tile.step != step or tile.holes != self._holes(tile_key):
+                    self._defer(self._build_tile, tile_key, key=('lod', tile_key))
+
+        for tile_key in list(self.tiles):
+            if tile_key not in wanted:
+                self._remove_tile(tile_key)
+        for sample_key in list(self._samples):
+            if sample_key[0] not in wanted:
+                del self._samples[sample_key]
+
+    def chunk_changed(self, chunk_key):
+        """Ein Chunk wurde voll geladen oder entladen - Loch in seiner Kachel zügig anpassen"""
+        tile_key = self.tile_key(chunk_key)
+        if tile_key in self.tiles or self._tile_step(tile_key) is not None:
+            self._defer(self._build_tile, tile_key, key=('lod', tile_key),
+                        priority=FrameScheduler.PRIORITY_NORMAL)
+
+    def _build_tile(self, tile_key):
+        step = self._tile_step(tile_key)
+        holes = self._holes(tile_key)
+        tile = self.tiles.get(tile_key)
+        if tile is not None and tile.step == step and tile.holes == holes:
+            return  # Inzwischen schon aktuell
+        chunk_keys = self.tile_chunk_keys(tile_key)
+        if step is None or len(holes) == len(chunk_keys):
+            self._remove_tile(tile_key)
+            if step is not None:
+                self.tiles[tile_key] = LodTile(step, holes, None, 0)
+            return
+
+        with metrics.histogram('lod.build_ms').time():
+            chunk_size = self.world_gen.chunk_size
+            size = self.tile_chunks * chunk_size
+            x0 = tile_key[0] * size
+            z0 = tile_key[1] * size
+            sample_key = (tile_key, step)
+            if sample_key not in self._samples:
+                self._samples[sample_key] = sample_lod_tile(self.world_gen, x0, z0, size, step)
+            tops, block_ids = self._samples[sample_key]
+
+            per_chunk = chunk_size // step
+            hole_mask = np.zeros(block_ids.shape, dtype=bool)
+            for chunk_x, chunk_z in holes:
+                local_x = (chunk_x - tile_key[0] * self.tile_chunks) * per_chunk
+                local_z = (chunk_z - tile_key[1] * self.tile_chunks) * per_chunk
+                hole_mask[local_x:local_x + per_chunk, local_z:local_z + per_chunk] = True
+            lod_mesh = build_lod_mesh(tops, block_ids, step, hole_mask)
+            entity = self._create_entity(lod_mesh, x0, z0)
+
+        self._remove_tile(tile_key)
+        self.tiles[tile_key] = LodTile(step, holes, entity, lod_mesh.quad_count)
+        self._quads_gauge.inc(lod_mesh.quad_count)
+        metrics.counter('lod.tiles_built').inc()
+
+    def _create_entity(self, lod_mesh, x0, z0):
+        """Ein Entity pro Kachel - nur Vertex-Farben, keine Textur und kein Collider"""
+        if not lod_mesh.vertex_count:
+            return None
+        vertex_colors = self._colors()[lod_mesh.block_ids]
+        vertex_colors[:, :3] *= lod_mesh.shades[:, None]
+        mesh = Mesh(
+            vertices=lod_mesh.vertices.tolist(),
+            triangles=lod_mesh.triangles.tolist(),
+            normals=lod_mesh.normals.tolist(),
+            colors=[Color(*rgba) for rgba in vertex_colors.tolist()]
+        )
+        # Gitterpunkt (x, z) liegt auf der Ecke der Zelle x, z (Zelle reicht von x - 0.5 bis x + 0.5)
+        return Entity(parent=scene, model=mesh, position=(x0 - 0.5, 0, z0 - 0.5))
+
+    def _colors(self):
+        """Farbe pro Block-ID: Block-Farbe mal mittlere Texturfarbe aus dem Atlas"""
+        if self._block_colors is None:
+            renderer = self.chunk_manager.renderer
+            colors = renderer.block_lookup()[1].copy()
+            for block_id, name in renderer.block_names.items():
+                average = BlockRegistry.get_average_color(name)
+                if average is not None:
+                    colors[block_id] *= average
+            colors[:, 3] = 1  # Fern-Terrain immer deckend (auch Wasser)
+            self._block_colors = colors
+        return self._block_colors.copy()
+
+    def _remove_tile(self, tile_key):
+        tile = self.tiles.pop(tile_key, None)
+        if tile is None:
+            return
+        self._quads_gauge.dec(tile.quad_count)
+        if tile.entity is not None:
+            destroy(tile.entity)
+
+    def clear(self):
+        for tile_key in list(self.tiles):
+            self._remove_tile(tile_key)
+        self._samples.clear()
+
+    def get_stats(self):
+        steps = {}
+        for tile in self.tiles.values():
+            if tile.entity is not None:
+                steps[tile.step] = steps.get(tile.step, 0) + 1
+        return {
+            'tiles': sum(steps.values()),
+            'tiles_by_step': steps,
+            'quads': sum(tile.quad_count for tile in self.tiles.values()),
+            'distance_chunks': self.distance
+        }
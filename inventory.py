@@ -1,5 +1,6 @@
 from ursina import *
 from ursina import color as ursina_color
+from scheduler import frame_scheduler, FrameScheduler
 
 class ItemStack:
     """Repräsentiert einen Stapel von Items"""
@@ -347,8 +348,10 @@ class InventoryManager:
     def add_new_item_type(self, item_type):
         """Fügt einen neuen Item-Typ zum Creative-Inventar hinzu"""
         if self.creative_inventory:
-            # Creative-Inventar aktualisieren
-            self.creative_inventory.refresh_items()
+            # Creative-Inventar im nächsten Frame aktualisieren - mehrere neue
+            # Blöcke hintereinander lösen nur einen Refresh aus
+            frame_scheduler.schedule(self.creative_inventory.refresh_items,
+                                     priority=FrameScheduler.PRIORITY_LOW, key='inventory_refresh')
             print(f"Inventar aktualisiert - Block verfügbar: {item_type}")
     
     def select_hotbar_slot(self, slot_index):
@@ -0,0 +1,394 @@
+"""Gebackenes Voxel-Licht: Skylight und Block-Licht per Flood-Fill über die Chunk-Daten
+
+Ersetzt die DirectionalLight mit Shadow-Map: das Licht wird beim Meshen in die
+Vertex-Farben gebacken (siehe chunk_mesher), zur Laufzeit kostet es nichts.
+"""
+from collections import deque
+
+import numpy as np
+
+from chunk_data import AIR, SECTION_HEIGHT, section_index
+
+MAX_LIGHT = 15
+
+SKY = 0
+BLOCK = 1
+
+_NEIGHBOURS = ((1, 0, 0), (-1, 0, 0), (0, 1, 0), (0, -1, 0), (0, 0, 1), (0, 0, -1))
+
+# Verlust pro Zelle: Luft 1, durchsichtige Blöcke (Wasser, Blätter, Glas) 2
+_AIR_COST = 1
+_FILTER_COST = 2
+
+
+class LightEngine:
+    """Licht-Stufen 0..MAX_LIGHT pro Zelle für die geladenen Chunks
+
+    Zwei Kanäle pro Chunk als uint8 Arrays (size, height, size) mit Index
+    [x, y - min_y, z] wie ChunkData. Skylight fällt von oben ohne Verlust
+    durch Luft und breitet sich sonst um eine Stufe pro Zelle aus,
+    Block-Licht geht von leuchtenden Blöcken aus. Durchsichtige Blöcke
+    lassen Licht mit mehr Verlust durch, alle anderen halten es auf.
+
+    light_chunk füllt einen neu geladenen Chunk vektorisiert (BFS in Wellen,
+    eine Stufe pro Iteration), update_block leuchtet nach einer Änderung nur
+    die betroffene Umgebung neu aus (Entfernen- und Ausbreiten-BFS mit
+    Queues). Beide geben {chunk_key: Sections} zurück, deren Mesh neu
+    gebacken werden muss.
+
+    chunks ist das loaded_chunks Dict des Chunk-Managers (geteilt, nicht
+    kopiert). block_store (optional, WorldBlockStore) liefert platzierte
+    Blöcke über chunk_cells und light_properties(x, y, z) -> (durchsichtig,
+    Leuchtkraft) oder None.
+    """
+
+    def __init__(self, chunks, chunk_size, transparent_ids=(), emission=None, block_store=None):
+        self.chunks = chunks
+        self.chunk_size = chunk_size
+        self.block_store = block_store
+        self.volumes = ({}, {})  # Pro Kanal: chunk_key -> uint8 Array
+
+        self._transparent = np.zeros(256, dtype=bool)
+        self._transparent[AIR] = True
+        self._transparent[list(transparent_ids)] = True
+        self._cost = np.where(self._transparent, _FILTER_COST, 0).astype(np.uint8)
+        self._cost[AIR] = _AIR_COST
+        self._emission = np.zeros(256, dtype=np.uint8)
+        for block_id, level in (emission or {}).items():
+            self._emission[block_id] = min(MAX_LIGHT, level)
+        # Gleiche Tabellen als Tupel für die Queue-BFS (schneller als numpy Skalare)
+        self._properties = [(bool(t), int(c), int(e))
+                            for t, c, e in zip(self._transparent, self._cost, self._emission)]
+
+    def is_lit(self, chunk_key):
+        return chunk_key in self.volumes[SKY]
+
+    def get_light(self, x, y, z):
+        """(Skylight, Block-Licht) einer Zelle - über dem Chunk volles Skylight, sonst 0"""
+        return self._read(SKY, x, y, z), self._read(BLOCK, x, y, z)
+
+    def remove_chunk(self, chunk_key):
+        for volumes in self.volumes:
+            volumes.pop(chunk_key, None)
+
+    def clear(self):
+        for volumes in self.volumes:
+            volumes.clear()
+
+    # --- Ganzer Chunk (vektorisiert) ---
+
+    def light_chunk(self, chunk_key):
+        """Berechnet das Licht eines (neu geladenen) Chunks und trägt es in die Nachbarn
+
+        Licht der schon beleuchteten Nachbarn fließt über die Ränder herein,
+        eigenes Licht danach per Queue-BFS in die Nachbarn hinaus.
+        """
+        chunk = self.chunks.get(chunk_key)
+        if chunk is None:
+            return {}
+
+        blocks = chunk.blocks
+        transparent = self._transparent[blocks]
+        cost = self._cost[blocks]
+        emission = self._emission[blocks]
+        air = blocks == AIR
+        if self.block_store is not None:
+            for x, y, z in self.block_store.chunk_cells.get(chunk_key, ()):
+                if not chunk.contains(x, y, z):
+                    continue
+                local = (x - chunk.world_x_start, y - chunk.min_y, z - chunk.world_z_start)
+                transparent[local], cost[local], emission[local] = self._placed_properties(x, y, z)
+                air[local] = False
+
+        # Von oben offene Luft-Säulen bekommen volles Skylight
+        open_sky = np.logical_and.accumulate(air[:, ::-1, :], axis=1)[:, ::-1, :]
+        sky_seed = np.where(open_sky, MAX_LIGHT, 0).astype(np.uint8)
+
+        self.volumes[SKY][chunk_key] = self._flood(chunk, SKY, sky_seed, transparent, cost, air)
+        self.volumes[BLOCK][chunk_key] = self._flood(chunk, BLOCK, emission, transparent, cost, air)
+
+        changed = set()
+        for channel in (SKY, BLOCK):
+            self._propagate(channel, self._border_sources(chunk, channel), changed)
+        return self._dirty_sections(changed)
+
+    def _flood(self, chunk, channel, seed, transparent, cost, air):
+        """Breitet seed wellenweise aus, bis sich nichts mehr ändert
+
+        Jede Welle ist eine BFS-Stufe über alle Zellen gleichzeitig. Der Rand
+        (eine Zelle rundum in x/z) kommt aus dem Licht der Nachbar-Chunks.
+        """
+        size = chunk.size
+        padded = np.zeros((size + 2, chunk.height, size + 2), dtype=np.int16)
+        padded[1:-1, :, 1:-1] = seed
+        for (dx, dz), plane in self._neighbour_planes(chunk, channel).items():
+            if dx == -1:
+                padded[0, :, 1:-1] = plane
+            elif dx == 1:
+                padded[-1, :, 1:-1] = plane
+            elif dz == -1:
+                padded[1:-1, :, 0] = plane
+            else:
+                padded[1:-1, :, -1] = plane
+
+        cost = cost.astype(np.int16)
+        lossless = air if channel == SKY else None
+        inner = padded[1:-1, :, 1:-1]
+        for _ in range(chunk.height + MAX_LIGHT):
+            incoming = np.maximum(np.maximum(padded[:-2, :, 1:-1], padded[2:, :, 1:-1]),
+                                  np.maximum(padded[1:-1, :, :-2], padded[1:-1, :, 2:]))
+            above = np.zeros_like(inner)
+            above[:, :-1, :] = inner[:, 1:, :]
+            incoming = np.maximum(incoming, above)
+            incoming[:, 1:, :] = np.maximum(incoming[:, 1:, :], inner[:, :-1, :])
+
+            updated = np.where(transparent, np.maximum(inner, incoming - cost), inner)
+            if lossless is not None:
+                updated[lossless & (above == MAX_LIGHT)] = MAX_LIGHT
+            if np.array_equal(updated, inner):
+                break
+            inner[...] = updated
+        return inner.astype(np.uint8)
+
+    def _neighbour_planes(self, chunk, channel):
+        """Licht der angrenzenden Zell-Ebene jedes beleuchteten Nachbarn ({(dx, dz): Ebene})"""
+        planes = {}
+        for dx, dz in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+            neighbour_key = (chunk.chunk_x + dx, chunk.chunk_z + dz)
+            slab = self._light_slab(neighbour_key, channel, chunk.min_y, chunk.max_y)
+            if slab is None:
+                continue
+            if dx == -1:
+                planes[(dx, dz)] = slab[-1, :, :]
+            elif dx == 1:
+                planes[(dx, dz)] = slab[0, :, :]
+            elif dz == -1:
+                planes[(dx, dz)] = slab[:, :, -1]
+            else:
+                planes[(dx, dz)] = slab[:, :, 0]
+        return planes
+
+    def _light_slab(self, chunk_key, channel, low, high):
+        """Licht eines Chunks für die Welt-Höhen [low, high) - None wenn nicht beleuchtet"""
+        volume = self.volumes[channel].get(chunk_key)
+        chunk = self.chunks.get(chunk_key)
+        if volume is None or chunk is None:
+            return None
+        size = chunk.size
+        slab = np.zeros((size, high - low, size), dtype=np.uint8)
+        if channel == SKY and high > chunk.max_y:
+            slab[:, max(0, chunk.max_y - low):, :] = MAX_LIGHT
+        start = max(low, chunk.min_y)
+        end = min(high, chunk.max_y)
+        if start < end:
+            slab[:, start - low:end - low, :] = volume[:, start - chunk.min_y:end - chunk.min_y, :]
+        return slab
+
+    def _border_sources(self, chunk, channel):
+        """Randzellen des Chunks, deren Licht den Nachbarn noch heller machen kann"""
+        volume = self.volumes[channel][chunk.key]
+        size = chunk.size
+        sources = deque()
+        for (dx, dz), plane in self._neighbour_planes(chunk, channel).items():
+            if dx:
+                local_x = 0 if dx < 0 else size - 1
+                own = volume[local_x, :, :]
+            else:
+                local_z = 0 if dz < 0 else size - 1
+                own = volume[:, :, local_z]
+            # own und plane: (height, size) für x-Nachbarn, (size, height) für z-Nachbarn
+            for first, second in zip(*np.nonzero(own.astype(np.int16) - _AIR_COST > plane)):
+                if dx:
+                    local = (local_x, first, second)
+                else:
+                    local = (first, second, local_z)
+                sources.append((chunk.world_x_start + local[0], chunk.min_y + local[1],
+                                chunk.world_z_start + local[2]))
+        return sources
+
+    # --- Einzelne Änderungen (Queue-BFS) ---
+
+    def update_block(self, x, y, z):
+        """Leuchtet die Umgebung einer geänderten Zelle neu aus (nach dem Setzen des Blocks)
+
+        Erst wird das alte Licht der Zelle und alles, was davon abhing,
+        entfernt, dann von den verbleibenden Quellen am Rand wieder ausgebreitet.
+        """
+        located = self._locate(x, y, z)
+        if located is None:
+            return {}
+        chunk_key, local = located
+        chunk = self.chunks[chunk_key]
+        transparent, cost, emission = self._cell_properties(chunk, x, y, z)
+
+        changed = {(x, y, z)}
+        for channel in (SKY, BLOCK):
+            volume = self.volumes[channel][chunk_key]
+            old = int(volume[local])
+            volume[local] = 0
+            sources = self._unpropagate(channel, deque([(x, y, z, old)]), changed) if old else deque()
+
+            if channel == BLOCK and emission:
+                volume[local] = emission
+                sources.append((x, y, z))
+            if transparent:
+                if channel == SKY and cost == _AIR_COST and y + 1 >= chunk.max_y:
+                    volume[local] = MAX_LIGHT  # Offener Himmel über dem Chunk
+                    sources.append((x, y, z))
+                for dx, dy, dz in _NEIGHBOURS:
+                    if self._read(channel, x + dx, y + dy, z + dz, outside=0):
+                        sources.append((x + dx, y + dy, z + dz))
+            self._propagate(channel, sources, changed)
+        return self._dirty_sections(changed)
+
+    def _unpropagate(self, channel, queue, changed):
+        """Entfernen-BFS: löscht Licht, das von den Zellen in queue abhing
+
+        Gibt die Zellen zurück, deren Licht aus anderen Quellen stammt - von
+        dort wird danach wieder ausgebreitet.
+        """
+        volumes = self.volumes[channel]
+        sources = deque()
+        while queue:
+            x, y, z, level = queue.popleft()
+            for dx, dy, dz in _NEIGHBOURS:
+                nx, ny, nz = x + dx, y + dy, z + dz
+                located = self._locate(nx, ny, nz)
+                if located is None:
+                    continue
+                chunk_key, local = located
+                volume = volumes[chunk_key]
+                neighbour_level = int(volume[local])
+                if not neighbour_level:
+                    continue
+                sky_below = channel == SKY and dy == -1 and level == MAX_LIGHT
+                if neighbour_level < level or (sky_below and neighbour_level == MAX_LIGHT):
+                    volume[local] = 0
+                    changed.add((nx, ny, nz))
+                    queue.append((nx, ny, nz, neighbour_level))
+                    if channel == BLOCK:
+                        emission = self._cell_properties(self.chunks[chunk_key], nx, ny, nz)[2]
+                        if emission:
+                            volume[local] = emission
+                            sources.append((nx, ny, nz))
+                else:
+                    sources.append((nx, ny, nz))
+        return sources
+
+    def _propagate(self, channel, queue, changed):
+        """Ausbreiten-BFS von den Zellen in queue (ihr Licht ist bereits gesetzt)"""
+        volumes = self.volumes[channel]
+        while queue:
+            x, y, z = queue.popleft()
+            level = self._read(channel, x, y, z, outside=0)
+            if level <= _AIR_COST:
+                continue
+            for dx, dy, dz in _NEIGHBOURS:
+                nx, ny, nz = x + dx, y + dy, z + dz
+                located = self._locate(nx, ny, nz)
+                if located is None:
+                    continue
+                chunk_key, local = located
+                transparent, cost, _ = self._cell_properties(self.chunks[chunk_key], nx, ny, nz)
+                if not transparent:
+                    continue
+                if channel == SKY and dy == -1 and level == MAX_LIGHT and cost == _AIR_COST:
+                    new_level = MAX_LIGHT
+                else:
+                    new_level = level - cost
+                volume = volumes[chunk_key]
+                if new_level > volume[local]:
+                    volume[local] = new_level
+                    changed.add((nx, ny, nz))
+                    queue.append((nx, ny, nz))
+
+    def _cell_properties(self, chunk, x, y, z):
+        """(durchsichtig, Verlust, Leuchtkraft) einer Zelle - platzierte Blöcke vor Terrain"""
+        placed = self._placed_properties(x, y, z)
+        if placed is not None:
+            return placed
+        return self._properties[chunk.get_block(x, y, z)]
+
+    def _placed_properties(self, x, y, z):
+        if self.block_store is None:
+            return None
+        placed = self.block_store.light_properties(x, y, z)
+        if placed is None:
+            return None
+        transparent, emission = placed
+        return transparent, _FILTER_COST if transparent else 0, min(MAX_LIGHT, emission)
+
+    def _locate(self, x, y, z):
+        """(chunk_key, lokaler Index) einer Zelle in einem beleuchteten Chunk oder None"""
+        size = self.chunk_size
+        chunk_key = (x // size, z // size)
+        chunk = self.chunks.get(chunk_key)
+        if chunk is None or chunk_key not in self.volumes[SKY]:
+            return None
+        local_y = y - chunk.min_y
+        if not 0 <= local_y < chunk.height:
+            return None
+        return chunk_key, (x - chunk_key[0] * size, local_y, z - chunk_key[1] * size)
+
+    def _read(self, channel, x, y, z, outside=None):
+        """Licht einer Zelle - außerhalb beleuchteter Chunks outside (None: Himmel bzw. 0)"""
+        size = self.chunk_size
+        chunk_key = (x // size, z // size)
+        chunk = self.chunks.get(chunk_key)
+        volume = self.volumes[channel].get(chunk_key)
+        if chunk is None or volume is None:
+            return outside if outside is not None else 0
+        local_y = y - chunk.min_y
+        if local_y >= chunk.height:
+            if outside is not None:
+                return outside
+            return MAX_LIGHT if channel == SKY else 0
+        if local_y < 0:
+            return 0
+        return int(volume[x - chunk_key[0] * size, local_y, z - chunk_key[1] * size])
+
+    def _dirty_sections(self, cells):
+        """Sections, deren Flächen an den geänderten Zellen liegen ({chunk_key: Sections})"""
+        size = self.chunk_size
+        dirty = {}
+        for x, y, z in cells:
+            for dx, dy, dz in ((0, 0, 0),) + _NEIGHBOURS:
+                chunk_key = ((x + dx) // size, (z + dz) // size)
+                dirty.setdefault(chunk_key, set()).add(section_index(y + dy))
+        return dirty
+
+    # --- Mesher ---
+
+    def padded_light(self, chunk_key, index):
+        """Licht max(Sky, Block) einer Section mit einer Zelle Rand, Form (size+2, SECTION_HEIGHT+2, size+2)
+
+        Der Rand kommt aus den Nachbar-Chunks, nicht beleuchtete Nachbarn
+        gelten als hell (ihre Randflächen werden ohnehin neu gebaut).
+        """
+        low = index * SECTION_HEIGHT - 1
+        high = (index + 1) * SECTION_HEIGHT + 1
+        size = self.chunk_size
+        padded = np.full((size + 2, high - low, size + 2), MAX_LIGHT, dtype=np.uint8)
+        for dx, dz in ((0, 0), (-1, 0), (1, 0), (0, -1), (0, 1)):
+            neighbour_key = (chunk_key[0] + dx, chunk_key[1] + dz)
+            sky = self._light_slab(neighbour_key, SKY, low, high)
+            if sky is None:
+                continue
+            combined = np.maximum(sky, self._light_slab(neighbour_key, BLOCK, low, high))
+            if (dx, dz) == (0, 0):
+                padded[1:-1, :, 1:-1] = combined
+            elif dx == -1:
+                padded[0, :, 1:-1] = combined[-1, :, :]
+            elif dx == 1:
+                padded[-1, :, 1:-1] = combined[0, :, :]
+            elif dz == -1:
+                padded[1:-1, :, 0] = combined[:, :, -1]
+            else:
+                padded[1:-1, :, -1] = combined[:, :, 0]
+        return padded
+
+    def get_stats(self):
+        return {
+            'lit_chunks': len(self.volumes[SKY]),
+            'bytes': sum(volume.nbytes for volumes in self.volumes for volume in volumes.values())
+        }
@@ -3,24 +3,30 @@ from ursina.prefabs.first_person_controller import FirstPersonController
 import time
 import random
 
-from block import BlockRegistry, get_performance_stats
+from block import BlockRegistry, Block, get_performance_stats
 from skybox import Skybox
 from world_generator import create_world_generator, update_world_around_player
+from scheduler import frame_scheduler
+from metrics import metrics
 from inventory import create_inventory, handle_inventory_input, get_current_block, add_new_block_type
+from interaction import BlockInteraction
+from player_physics import VoxelFirstPersonController
 
-# Basic App Setup
-app = Ursina()
-
-# Window Settings
-window.fps_counter.enabled = True
-window.title = 'HyMine - Optimized World Generator'
-window.vsync = False  # Disable VSync for better performance
-window.borderless = False
-window.fullscreen = False
-
-# Mouse Settings
-mouse.locked = True
-camera.fov = 90
+# Basic App Setup - nur im Haupt-Prozess, Worker-Prozesse (spawn) importieren
+# dieses Modul erneut und dürfen kein Fenster öffnen
+if __name__ == "__main__":
+    app = Ursina()
+    
+    # Window Settings
+    window.fps_counter.enabled = True
+    window.title = 'HyMine - Optimized World Generator'
+    window.vsync = False  # Disable VSync for better performance
+    window.borderless = False
+    window.fullscreen = False
+    
+    # Mouse Settings
+    mouse.locked = True
+    camera.fov = 90
 
 class SimplePerformanceMonitor:
     def __init__(self):
@@ -78,10 +84,18 @@ class SimplePerformanceMonitor:
                 if self.world_gen and hasattr(self, 'stats_display') and self.stats_display:
                     stats = self.world_gen.get_stats()
                     if isinstance(stats, dict):  # Verify stats is a dictionary
+                        scheduler_stats = frame_scheduler.get_stats()
+                        generate_ms = metrics.histogram('chunk.generate_ms')
+                        load_ms = metrics.histogram('chunk.load_ms')
                         self.stats_display.text = (
                             f"Chunks: {stats.get('loaded_chunks', 0)} | "
                             f"Blocks: {stats.get('total_blocks', 0)} | "
-                            f"Seed: {stats.get('seed', 0)}"
+                            f"Seed: {stats.get('seed', 0)}\n"
+                            f"Jobs: {scheduler_stats['queue_depth']} | "
+                            f"Overruns: {scheduler_stats['overruns']}\n"
+                            f"Gen p95: {generate_ms.percentile(95):.1f}ms | "
+                            f"Load p95: {load_ms.percentile(95):.1f}ms | "
+                            f"Cache: {metrics.value('cache.data.hit_rate', 0.0) or 0.0:.0%}"
                         )
                 
                 self.frame_count = 0
@@ -100,8 +114,13 @@ class SimplePerformanceMonitor:
             print(f"Error toggling visibility: {e}")
 
 # Global variables
+WORLD_DIR = 'worlds'  # Region-Dateien generierter Chunks (pro Seed ein Ordner)
+ATLAS_CACHE_DIR = 'atlas_cache'  # Gepackter Textur-Atlas, Schlüssel: Hash der Quell-Texturen
+PLAYER_PHYSICS = 'voxel'  # 'voxel': AABB gegen Voxel-Gitter, 'colliders': Ursina-Raycasts gegen Collider
+BAKED_LIGHTING = True  # Licht per Flood-Fill in die Chunk-Meshes backen statt DirectionalLight mit Shadow-Map
 perf_monitor = None  # Initialize as None
 world_generator = None
+block_interaction = BlockInteraction()  # Abbauen/Platzieren per Voxel-Raycast
 game_initialized = False
 
 # The relevant parts that need to be fixed:
@@ -120,13 +139,15 @@ def initialize_game():
         # Block Registration with error handling
         perf_monitor.set_loading_text("Loading blocks...")
         register_blocks()
+        BlockRegistry.build_atlas(cache_dir=ATLAS_CACHE_DIR)
         
         # Inventory Setup
         perf_monitor.set_loading_text("Setting up inventory...")
         setup_inventory()
         
         # Create player BEFORE world setup
-        player = FirstPersonController()
+        player = create_player()
+        block_interaction.set_player(player)
         player.cursor.visible = True
         player.speed = 6
         player.mouse_sensitivity = Vec2(40, 40)
@@ -153,6 +174,18 @@ def initialize_game():
         print(f"Critical error during initialization: {e}")
         raise
 
+def create_player():
+    """Erstellt den Spieler je nach PLAYER_PHYSICS"""
+    if PLAYER_PHYSICS == 'voxel':
+        # Kollision über die Voxel-Daten - Blöcke und Terrain brauchen keine Collider
+        Block.colliders_enabled = False
+        return VoxelFirstPersonController(
+            is_solid=block_interaction.is_solid,
+            is_loaded=lambda x, z: world_generator is not None and world_generator.is_loaded_at(x, z)
+        )
+    Block.colliders_enabled = True
+    return FirstPersonController()
+
 def setup_world():
     """Helper function to setup world generation"""
     global world_generator
@@ -165,15 +198,18 @@ def setup_world():
         world_generator = create_world_generator(
             seed=WORLD_SEED,
             chunk_size=CHUNK_SIZE,
-            render_distance=RENDER_DISTANCE
+            render_distance=RENDER_DISTANCE,
+            scheduler=frame_scheduler,
+            world_dir=WORLD_DIR,
+            lighting=BAKED_LIGHTING
         )
         
         if perf_monitor:
             perf_monitor.set_world_generator(world_generator)
+        block_interaction.set_world(world_generator)
         
         # Generate spawn area
-        spawn_x, spawn_z = 0, 0
-        spawn_height = world_generator.get_height_at(spawn_x, spawn_z)
+        spawn_x, spawn_z, spawn_height = world_generator.find_spawn(0, 0)
         world_generator.generate_spawn_area(spawn_x, spawn_z, radius=1)
         
         # Move player to spawn position if it exists
@@ -241,15 +277,18 @@ def setup_world():
         world_generator = create_world_generator(
             seed=WORLD_SEED,
             chunk_size=CHUNK_SIZE,
-            render_distance=RENDER_DISTANCE
+            render_distance=RENDER_DISTANCE,
+            scheduler=frame_scheduler,
+            world_dir=WORLD_DIR,
+            lighting=BAKED_LIGHTING
         )
         
         if perf_monitor:
             perf_monitor.set_world_generator(world_generator)
+        block_interaction.set_world(world_generator)
         
         # Generate spawn area
-        spawn_x, spawn_z = 0, 0
-        spawn_height = world_generator.get_height_at(spawn_x, spawn_z)
+        spawn_x, spawn_z, spawn_height = world_generator.find_spawn(0, 0)
         world_generator.generate_spawn_area(spawn_x, spawn_z, radius=1)
         
         if player:
@@ -269,6 +308,9 @@ def setup_environment():
             print(f"Skybox error: {sky_error}, using default sky")
             sky = Sky()
         
+        if BAKED_LIGHTING:
+            return  # Licht steckt in den Vertex-Farben der Chunks (lighting.LightEngine)
+        
         # Lighting setup with fixed shadow map resolution
         sun = DirectionalLight()
         sun.look_at(Vec3(1, -1, -1))
@@ -287,6 +329,7 @@ def print_controls():
     print("\n=== Controls ===")
     print("F1 - Toggle performance display")
     print("F3 - Show world statistics")
+    print("F5 - Export metrics snapshot (JSON)")
     print("F4 - Generate new world")
     print("ESC - Toggle mouse lock")
 
@@ -307,6 +350,10 @@ def input(key):
         if handle_inventory_input(key):
             return
         
+        # Abbauen/Platzieren - ein Raycast statt input() auf jedem Block
+        if block_interaction.handle_input(key):
+            return
+        
         if key == 'escape':
             mouse.locked = not mouse.locked
         elif key == 'f1' and perf_monitor:
@@ -315,6 +362,8 @@ def input(key):
             show_world_stats()
         elif key == 'f4':
             generate_new_world()
+        elif key == 'f5':
+            export_metrics()
             
     except Exception as e:
         print(f"Error handling input {key}: {e}")
@@ -328,11 +377,38 @@ def show_world_stats():
             print(f"Seed: {stats.get('seed', 'Unknown')}")
             print(f"Loaded Chunks: {stats.get('loaded_chunks', 0)}")
             print(f"Total Blocks: {stats.get('total_blocks', 0)}")
+            print(f"Chunk Entities: {stats.get('total_entities', 0)}")
             print(f"Render Distance: {stats.get('render_distance', 0)}")
+            for tier, cache_stats in stats.get('cache', {}).items():
+                print(f"Cache ({tier}): {cache_stats['entries']} entries, "
+                      f"{cache_stats['bytes'] / 1024:.0f} KB, "
+                      f"hit rate {cache_stats['hit_rate']:.0%}, "
+                      f"{cache_stats['evictions']} evictions")
+            scheduler_stats = frame_scheduler.get_stats()
+            print(f"Scheduler: {scheduler_stats['queue_depth']} queued, "
+                  f"{scheduler_stats['overruns']} overruns, "
+                  f"max job {scheduler_stats['max_job_ms']:.1f}ms")
+            
+            snapshot = metrics.snapshot()
+            for name, value in snapshot['counters'].items():
+                print(f"{name}: {value}")
+            for name, histogram in snapshot['histograms'].items():
+                print(f"{name}: n={histogram['count']}, mean {histogram['mean']:.1f}ms, "
+                      f"p50 {histogram['p50']:.1f}ms, p95 {histogram['p95']:.1f}ms, "
+                      f"p99 {histogram['p99']:.1f}ms")
             print("========================\n")
         except Exception as e:
             print(f"Error showing world stats: {e}")
 
+def export_metrics():
+    """Schreibt einen JSON-Snapshot aller Metriken ins aktuelle Verzeichnis"""
+    path = f"metrics_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    try:
+        metrics.write_json(path)
+        print(f"Metrics written to {path}")
+    except OSError as e:
+        print(f"Error exporting metrics: {e}")
+
 def generate_new_world():
     """Helper function to generate new world"""
     global world_generator, last_player_chunk
@@ -340,22 +416,29 @@ def generate_new_world():
     try:
         if world_generator:
             print("Generating new world...")
+            world_generator.shutdown()
             new_seed = random.randint(0, 999999)
             
+            frame_scheduler.clear()
+            metrics.reset()
             world_generator = create_world_generator(
                 seed=new_seed,
                 chunk_size=8,
-                render_distance=2
+                render_distance=2,
+                scheduler=frame_scheduler,
+                world_dir=WORLD_DIR,
+                lighting=BAKED_LIGHTING
             )
             
             if perf_monitor:
                 perf_monitor.set_world_generator(world_generator)
+            block_interaction.set_world(world_generator)
             
             # New spawn location
-            spawn_height = world_generator.get_height_at(0, 0)
-            world_generator.generate_spawn_area(0, 0, radius=1)
+            spawn_x, spawn_z, spawn_height = world_generator.find_spawn(0, 0)
+            world_generator.generate_spawn_area(spawn_x, spawn_z, radius=1)
             if player:
-                player.position = (0, spawn_height + 2, 0)
+                player.position = (spawn_x, spawn_height + 2, spawn_z)
             last_player_chunk = None
             
             print(f"Generated new world with seed {new_seed}")
@@ -384,6 +467,17 @@ def update():
             update_chunks()
             last_chunk_update = current_time
         
+        # Fertige Section-Meshes aus dem Mesh-Worker als Upload-Jobs einplanen
+        if world_generator:
+            world_generator.integrate_meshes()
+
+        # Main-Thread Jobs (Chunks rendern/entladen) im Frame-Budget abarbeiten
+        frame_scheduler.run()
+        
+        # Von der Kamera aus verdeckte Sections ausblenden (nur bei Section-Wechsel neu berechnet)
+        if world_generator:
+            world_generator.update_visibility(camera.world_position)
+        
         # Anti-fall system
         check_player_fall()
         
@@ -398,12 +492,10 @@ def update_chunks():
         try:
             current_player_chunk = world_generator.get_chunk_coords(player.x, player.z)
             
-            if current_player_chunk != last_player_chunk:
-                loaded, unloaded = update_world_around_player(world_generator, player)
-                last_player_chunk = current_player_chunk
-                
-                if loaded > 0 or unloaded > 0:
-                    print(f"Chunks updated: +{loaded} -{unloaded}")
+            # Nicht-blockierend: fordert fehlende Chunks an und baut fertige ein
+            # (Zähler für geladene/entladene Chunks stehen in metrics)
+            update_world_around_player(world_generator, player)
+            last_player_chunk = current_player_chunk
                     
         except Exception as e:
             print(f"Error updating chunks: {e}")
@@ -0,0 +1,224 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+# Obergrenzen der Latenz-Buckets in Millisekunden (letzter Bucket: alles darüber)
+DEFAULT_LATENCY_BUCKETS_MS = (0.5, 1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+
+class Counter:
+    """Zählt nur aufwärts (z.B. generierte Chunks)"""
+
+    def __init__(self, name, lock):
+        self.name = name
+        self.value = 0
+        self._lock = lock
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def reset(self):
+        with self._lock:
+            self.value = 0
+
+    def snapshot(self):
+        return self.value
+
+
+class Gauge:
+    """Aktueller Wert, der steigen und fallen kann
+
+    Mit func wird der Wert erst beim Auslesen berechnet (z.B. Queue-Tiefe).
+    """
+
+    def __init__(self, name, lock, func=None):
+        self.name = name
+        self.func = func
+        self._value = 0
+        self._lock = lock
+
+    @property
+    def value(self):
+        if self.func is not None:
+            try:
+                return self.func()
+            except Exception:
+                return None
+        return self._value
+
+    def set(self, value):
+        with self._lock:
+            self._value = value
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount=1):
+        with self._lock:
+            self._value -= amount
+
+    def reset(self):
+        with self._lock:
+            self._value = 0
+
+    def snapshot(self):
+        return self.value
+
+
+class Histogram:
+    """Latenz-Verteilung mit festen Buckets - konstanter Speicher, O(Buckets) pro Wert"""
+
+    def __init__(self, name, lock, buckets=DEFAULT_LATENCY_BUCKETS_MS):
+        self.name = name
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self._lock = lock
+
+    def observe(self, value):
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += value
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+
+    def reset(self):
+        with self._lock:
+            self.counts = [0] * (len(self.buckets) + 1)
+            self.count = 0
+            self.total = 0.0
+            self.min = None
+            self.max = None
+
+    @contextmanager
+    def time(self):
+        """Misst die Dauer des with-Blocks in Millisekunden"""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe((time.perf_counter() - start_time) * 1000)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent):
+        """Obergrenze des Buckets, in dem das Perzentil liegt (max für den letzten)"""
+        if not self.count:
+            return 0.0
+        rank = self.count * percent / 100
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return min(self.buckets[i], self.max) if i < len(self.buckets) else self.max
+        return self.max
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'count': self.count,
+                'sum': self.total,
+                'mean': self.mean,
+                'min': self.min,
+                'max': self.max,
+                'p50': self.percentile(50),
+                'p95': self.percentile(95),
+                'p99': self.percentile(99),
+                'buckets': dict(zip([str(bound) for bound in self.buckets] + ['inf'], self.counts))
+            }
+
+
+class MetricsRegistry:
+    """Prozess-lokale Metriken: Counter, Gauges und Histogramme nach Namen
+
+    Metriken werden beim ersten Zugriff angelegt, ein erneuter Aufruf mit
+    gleichem Namen gibt dieselbe Instanz zurück. Alle Updates sind
+    thread-sicher (Chunks werden in Worker-Threads generiert).
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._metrics = {}
+
+    def _get_or_create(self, name, cls, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, self._lock, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise TypeError(f"Metric '{name}' is a {type(metric).__name__}, not a {cls.__name__}")
+            return metric
+
+    def counter(self, name):
+        return self._get_or_create(name, Counter)
+
+    def gauge(self, name, func=None):
+        """Gauge nach Namen - mit func wird die Berechnungsfunktion (neu) gesetzt"""
+        gauge = self._get_or_create(name, Gauge)
+        if func is not None:
+            gauge.func = func
+        return gauge
+
+    def histogram(self, name, buckets=DEFAULT_LATENCY_BUCKETS_MS):
+        return self._get_or_create(name, Histogram, buckets=buckets)
+
+    def get(self, name):
+        with self._lock:
+            return self._metrics.get(name)
+
+    def value(self, name, default=0):
+        """Aktueller Wert eines Counters/Gauges (default wenn unbekannt)"""
+        metric = self.get(name)
+        if metric is None or isinstance(metric, Histogram):
+            return default
+        return metric.value
+
+    def snapshot(self):
+        """Alle Metriken als JSON-taugliches Dict, nach Typ gruppiert"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        snapshot = {'timestamp': time.time(), 'counters': {}, 'gauges': {}, 'histograms': {}}
+        for metric in sorted(metrics, key=lambda metric: metric.name):
+            if isinstance(metric, Counter):
+                snapshot['counters'][metric.name] = metric.snapshot()
+            elif isinstance(metric, Gauge):
+                snapshot['gauges'][metric.name] = metric.snapshot()
+            else:
+                snapshot['histograms'][metric.name] = metric.snapshot()
+        return snapshot
+
+    def to_json(self, indent=2):
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_json())
+
+    def reset(self):
+        """Setzt alle Werte zurück (z.B. beim Generieren einer neuen Welt)
+
+        Die Instanzen bleiben erhalten, gehaltene Referenzen gelten weiter.
+        """
+        with self._lock:
+            for metric in self._metrics.values():
+                metric.reset()
+
+
+# Globale Registry des Prozesses
+metrics = MetricsRegistry()
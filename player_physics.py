@@ -0,0 +1,181 @@
+import math
+
+from ursina import held_keys, mouse, time, clamp, Vec3
+from ursina.prefabs.first_person_controller import FirstPersonController
+
+# Abstand zu Block-Flächen, damit die AABB nach dem Auflösen nicht wieder überlappt
+_SKIN = 1e-4
+
+
+def _cell_range_xz(low, high):
+    """Zellen, deren Ausdehnung (c - 0.5, c + 0.5) das Intervall (low, high) schneidet"""
+    return range(math.floor(low - 0.5) + 1, math.ceil(high + 0.5))
+
+
+def _cell_range_y(low, high):
+    """Zellen, deren Ausdehnung (c - 1, c) das Intervall (low, high) schneidet"""
+    return range(math.floor(low) + 1, math.ceil(high + 1))
+
+
+class VoxelAABB:
+    """Achsenparallele Box eines Körpers mit Fußpunkt-Position
+
+    Ein Block bei Zelle (x, y, z) belegt [x-0.5, x+0.5] x [y-1, y] x [z-0.5, z+0.5]
+    (origin_y=0.5). Getestet werden nur die Zellen, die die Box berührt -
+    die Kosten hängen nicht von der Anzahl geladener Blöcke ab.
+    """
+
+    def __init__(self, half_width=0.3, height=1.8):
+        self.half_width = half_width
+        self.height = height
+
+    def bounds(self, position):
+        x, y, z = position
+        w = self.half_width
+        return (x - w, y, z - w), (x + w, y + self.height, z + w)
+
+    def overlapping_cells(self, position):
+        (min_x, min_y, min_z), (max_x, max_y, max_z) = self.bounds(position)
+        for cx in _cell_range_xz(min_x + _SKIN, max_x - _SKIN):
+            for cz in _cell_range_xz(min_z + _SKIN, max_z - _SKIN):
+                for cy in _cell_range_y(min_y + _SKIN, max_y - _SKIN):
+                    yield cx, cy, cz
+
+    def collides(self, position, is_solid):
+        return any(is_solid(*cell) for cell in self.overlapping_cells(position))
+
+    def sweep_axis(self, position, axis, distance, is_solid):
+        """Bewegt position entlang axis (0=x, 1=y, 2=z) bis zur ersten festen Zelle
+
+        distance sollte kleiner als ein Block sein (sonst in Teilschritten
+        aufrufen). Gibt (neue Position als Liste, blockiert) zurück.
+        """
+        moved = list(position)
+        moved[axis] += distance
+        blocking = [cell for cell in self.overlapping_cells(moved) if is_solid(*cell)]
+        if not blocking:
+            return moved, False
+
+        if axis == 1:
+            if distance < 0:
+                # Auf der höchsten Oberkante landen
+                moved[1] = max(cell[1] for cell in blocking) + _SKIN
+            else:
+                moved[1] = min(cell[1] - 1 for cell in blocking) - self.height - _SKIN
+        else:
+            if distance > 0:
+                moved[axis] = min(cell[axis] - 0.5 for cell in blocking) - self.half_width - _SKIN
+            else:
+                moved[axis] = max(cell[axis] + 0.5 for cell in blocking) + self.half_width + _SKIN
+
+        # Nie weiter zurück als die Startposition (Körper steckte schon fest)
+        if (moved[axis] - position[axis]) * distance < 0:
+            moved[axis] = position[axis]
+        return moved, True
+
+
+def move_body(body, position, velocity, dt, is_solid, grounded=False, step_height=1.0):
+    """Bewegt body um velocity * dt gegen das Voxel-Gitter
+
+    Pro Achse ein Sweep (y zuerst, dann x und z). Stößt ein Körper am Boden
+    horizontal an eine Kante von höchstens step_height, steigt er hinauf.
+    Gibt (position, velocity, grounded) zurück.
+    """
+    position = list(position)
+    velocity = list(velocity)
+
+    # Teilschritte, damit kein Sweep weiter als einen halben Block reicht
+    largest = max(abs(v) * dt for v in velocity)
+    steps = max(1, math.ceil(largest / 0.45))
+    step_dt = dt / steps
+
+    for _ in range(steps):
+        position, blocked = body.sweep_axis(position, 1, velocity[1] * step_dt, is_solid)
+        if blocked:
+            grounded = velocity[1] <= 0
+            velocity[1] = 0
+        elif velocity[1] != 0:
+            grounded = False
+
+        for axis in (0, 2):
+            distance = velocity[axis] * step_dt
+            if distance == 0:
+                continue
+            moved, blocked = body.sweep_axis(position, axis, distance, is_solid)
+            if blocked and grounded and step_height:
+                stepped = _try_step_up(body, position, axis, distance, step_height, is_solid)
+                if stepped is not None:
+                    moved, blocked = stepped, False
+            if blocked:
+                velocity[axis] = 0
+            position = moved
+
+    return position, velocity, grounded
+
+
+def _try_step_up(body, position, axis, distance, step_height, is_solid):
+    """Versucht eine Kante hinaufzusteigen - None wenn kein Platz ist"""
+    raised = list(position)
+    raised[1] += step_height
+    if body.collides(raised, is_solid):
+        return None
+    raised[axis] += distance
+    if body.collides(raised, is_solid):
+        return None
+    # Wieder auf die Oberkante absenken
+    landed, _ = body.sweep_axis(raised, 1, -step_height, is_solid)
+    return landed
+
+
+class VoxelFirstPersonController(FirstPersonController):
+    """FirstPersonController mit Kollision direkt gegen das Voxel-Gitter
+
+    Braucht keine Collider: is_solid(x, y, z) beantwortet pro Zelle, ob sie
+    fest ist. is_loaded(x, z) (optional) hält den Spieler an, solange sein
+    Chunk noch nicht geladen ist, damit er nicht durch fehlendes Terrain fällt.
+    """
+
+    def __init__(self, is_solid, is_loaded=None, **kwargs):
+        self.is_solid = is_solid
+        self.is_loaded = is_loaded
+        self.body = VoxelAABB(half_width=0.3, height=1.8)
+        self.velocity = Vec3(0, 0, 0)
+        self.gravity_acceleration = 25.0
+        self.terminal_velocity = 40.0
+        self.step_height = 1.0
+        super().__init__(**kwargs)
+
+    def update(self):
+        self.rotation_y += mouse.velocity[0] * self.mouse_sensitivity[1]
+        self.camera_pivot.rotation_x -= mouse.velocity[1] * self.mouse_sensitivity[0]
+        self.camera_pivot.rotation_x = clamp(self.camera_pivot.rotation_x, -90, 90)
+
+        if self.is_loaded is not None and not self.is_loaded(self.x, self.z):
+            return  # Terrain unter dem Spieler fehlt noch
+
+        self.direction = Vec3(
+            self.forward * (held_keys['w'] - held_keys['s'])
+            + self.right * (held_keys['d'] - held_keys['a'])
+        ).normalized()
+
+        dt = min(time.dt, 0.05)  # Lange Frames (Laden) nicht durch Wände tunneln lassen
+        velocity = [self.direction.x * self.speed, self.velocity.y, self.direction.z * self.speed]
+        if self.gravity:
+            velocity[1] = max(velocity[1] - self.gravity_acceleration * self.gravity * dt,
+                              -self.terminal_velocity)
+
+        was_grounded = self.grounded
+        position, velocity, self.grounded = move_body(
+            self.body, self.position, velocity, dt, self.is_solid,
+            grounded=self.grounded, step_height=self.step_height
+        )
+        self.position = Vec3(*position)
+        self.velocity = Vec3(0, velocity[1], 0)
+        if self.grounded and not was_grounded:
+            self.land()
+
+    def jump(self):
+        if not self.grounded:
+            return
+        self.grounded = False
+        self.velocity = Vec3(0, math.sqrt(2 * self.gravity_acceleration * self.jump_height), 0)
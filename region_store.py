@@ -0,0 +1,262 @@
+import atexit
+import json
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from chunk_data import ChunkData
+
+# Region-Datei: Header + feste Offset-Tabelle (offset, länge) pro Chunk + komprimierte Payloads
+_MAGIC = b'HMRG'
+_REGION_HEADER = struct.Struct('<4sHH')
+_REGION_VERSION = 1
+_TABLE_ENTRY = struct.Struct('<II')
+
+
+class RegionStore:
+    """Speichert generierte Chunks in Region-Dateien unter einem Welt-Ordner
+
+    Je region_size x region_size Chunks teilen sich eine Datei. Gelesen wird
+    über mmap: ein Chunk ist ein Tabellen-Lookup, ein Slice und ein
+    zlib-decompress. Geänderte Chunks werden ans Dateiende angehängt und
+    der Tabelleneintrag überschrieben (kein Compacting).
+
+    generator (FastWorldGenerator.generator_options) landet mit Seed und
+    Chunk-Größe in level.json - ein Ordner einer anderen Generator-Version
+    oder mit anderen Optionen wird nicht benutzt, sonst entstünden Nähte
+    zwischen gespeicherten und neu generierten Chunks.
+    """
+
+    MAX_OPEN_REGIONS = 16
+
+    def __init__(self, world_dir, seed, chunk_size, region_size=16, compression_level=6, generator=None):
+        self.world_dir = world_dir
+        self.region_dir = os.path.join(world_dir, 'region')
+        self.region_size = region_size
+        self.compression_level = compression_level
+        self.enabled = True
+        self.closed = False
+
+        self._lock = threading.RLock()
+        self._open_regions = OrderedDict()
+        self._write_queue = queue.Queue()
+        self._writer = None
+
+        self.reads = 0
+        self.read_misses = 0
+        self.writes = 0
+        self.read_time = 0.0
+        self.bytes_written = 0
+
+        os.makedirs(self.region_dir, exist_ok=True)
+        self._check_level(seed, chunk_size, generator or {})
+        atexit.register(self.close)
+
+    def _check_level(self, seed, chunk_size, generator):
+        """Schreibt level.json bzw. prüft, ob der Ordner zu dieser Welt passt"""
+        level_path = os.path.join(self.world_dir, 'level.json')
+        level = {'seed': seed, 'chunk_size': chunk_size, 'region_size': self.region_size, 'generator': generator}
+
+        if os.path.exists(level_path):
+            try:
+                with open(level_path, 'r', encoding='utf-8') as f:
+                    existing = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"[RegionStore] Could not read {level_path}: {e} - persistence disabled")
+                self.enabled = False
+                return
+            if existing != level:
+                print(f"[RegionStore] {self.world_dir} belongs to another world {existing} - persistence disabled")
+                self.enabled = False
+            return
+
+        with open(level_path, 'w', encoding='utf-8') as f:
+            json.dump(level, f)
+
+    def _region_location(self, chunk_key):
+        chunk_x, chunk_z = chunk_key
+        region_key = (chunk_x // self.region_size, chunk_z // self.region_size)
+        index = (chunk_x % self.region_size) * self.region_size + (chunk_z % self.region_size)
+        return region_key, index
+
+    def _region_path(self, region_key):
+        return os.path.join(self.region_dir, f"r.{region_key[0]}.{region_key[1]}.bin")
+
+    def _table_offset(self, index):
+        return _REGION_HEADER.size + index * _TABLE_ENTRY.size
+
+    def _open_region(self, region_key, create=False):
+        """Gibt (file, mmap) einer Region zurück - mmap ist None bis gelesen wird
+
+        Eine Datei mit falschem Header oder abgeschnittener Offset-Tabelle
+        gilt als kaputt: gelesen wird sie nicht, beim Schreiben wird sie als
+        .corrupt beiseitegelegt und neu angelegt.
+        """
+        region = self._open_regions.get(region_key)
+        if region is not None:
+            self._open_regions.move_to_end(region_key)
+            return region
+
+        path = self._region_path(region_key)
+        if os.path.exists(path) and not self._valid_region(path):
+            if not create:
+                return None
+            os.replace(path, path + '.corrupt')
+        if not os.path.exists(path):
+            if not create:
+                return None
+            with open(path, 'wb') as f:
+                f.write(_REGION_HEADER.pack(_MAGIC, _REGION_VERSION, self.region_size))
+                f.write(bytes(_TABLE_ENTRY.size * self.region_size * self.region_size))
+
+        region = [open(path, 'r+b'), None]
+        self._open_regions[region_key] = region
+        while len(self._open_regions) > self.MAX_OPEN_REGIONS:
+            _, (old_file, old_map) = self._open_regions.popitem(last=False)
+            if old_map is not None:
+                old_map.close()
+            old_file.close()
+        return region
+
+    def _valid_region(self, path):
+        """Prüft Magic, Version und region_size des Headers und die Länge der Offset-Tabelle"""
+        try:
+            with open(path, 'rb') as f:
+                header = f.read(_REGION_HEADER.size)
+                size = os.fstat(f.fileno()).st_size
+        except OSError as e:
+            print(f"[RegionStore] Could not read region {path}: {e}")
+            return False
+        if len(header) == _REGION_HEADER.size:
+            magic, version, region_size = _REGION_HEADER.unpack(header)
+            if (magic == _MAGIC and version == _REGION_VERSION and region_size == self.region_size
+                    and size >= self._table_offset(self.region_size * self.region_size)):
+                return True
+        print(f"[RegionStore] Corrupt region {path} - ignored")
+        return False
+
+    def load(self, chunk_key):
+        """Lädt einen Chunk - None wenn er nicht gespeichert ist"""
+        if not self.enabled or self.closed:
+            return None
+
+        start_time = time.perf_counter()
+        region_key, index = self._region_location(chunk_key)
+        with self._lock:
+            region = self._open_region(region_key)
+            if region is None:
+                self.read_misses += 1
+                return None
+            if region[1] is None:
+                region[1] = mmap.mmap(region[0].fileno(), 0, access=mmap.ACCESS_READ)
+
+            offset, length = _TABLE_ENTRY.unpack_from(region[1], self._table_offset(index))
+            if length == 0:
+                self.read_misses += 1
+                return None
+            payload = region[1][offset:offset + length]
+
+        try:
+            chunk = ChunkData.from_bytes(zlib.decompress(payload))
+        except (zlib.error, struct.error, ValueError) as e:
+            print(f"[RegionStore] Corrupt chunk {chunk_key}: {e}")
+            chunk = None
+
+        self.reads += 1
+        self.read_time += time.perf_counter() - start_time
+        return chunk
+
+    def save(self, chunk, raw=None):
+        """Schreibt einen Chunk synchron (raw: bereits serialisierte Bytes)"""
+        if not self.enabled or self.closed:
+            return
+        payload = zlib.compress(raw if raw is not None else chunk.to_bytes(), self.compression_level)
+        region_key, index = self._region_location(chunk.key)
+
+        with self._lock:
+            region = self._open_region(region_key, create=True)
+            # mmap schließen, damit die Datei wachsen darf (wird beim Lesen neu erstellt)
+            if region[1] is not None:
+                region[1].close()
+                region[1] = None
+
+            f = region[0]
+            f.seek(0, os.SEEK_END)
+            offset = f.tell()
+            f.write(payload)
+            f.seek(self._table_offset(index))
+            f.write(_TABLE_ENTRY.pack(offset, len(payload)))
+            f.flush()
+
+            self.writes += 1
+            self.bytes_written += len(payload)
+
+    def save_async(self, chunk):
+        """Schreibt einen Chunk im Hintergrund-Thread
+
+        Der Chunk wird sofort serialisiert, spätere Änderungen am Objekt
+        landen also erst mit dem nächsten save_async auf der Platte.
+        Nach close() wird nichts mehr angenommen.
+        """
+        if not self.enabled:
+            return
+        if self.closed:
+            print(f"[RegionStore] Store {self.world_dir} is closed - chunk {chunk.key} not saved")
+            return
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, name='region-writer', daemon=True)
+            self._writer.start()
+        self._write_queue.put((chunk, chunk.to_bytes()))
+
+    def _write_loop(self):
+        while True:
+            item = self._write_queue.get()
+            try:
+                if item is None:
+                    return
+                chunk, raw = item
+                self.save(chunk, raw)
+            except Exception as e:
+                print(f"[RegionStore] Could not write chunk: {e}")
+            finally:
+                self._write_queue.task_done()
+
+    def flush(self):
+        """Wartet bis alle Hintergrund-Schreibvorgänge erledigt sind"""
+        if self._writer is not None:
+            self._write_queue.join()
+
+    def close(self):
+        """Schreibt ausstehende Chunks, beendet den Writer-Thread und schließt alle Region-Dateien"""
+        if self.closed:
+            return
+        # Sonst hielte die atexit-Liste den Store (mmaps, Writer) bis Programmende am Leben
+        atexit.unregister(self.close)
+        if self._writer is not None:
+            self._write_queue.put(None)
+            self._writer.join()
+            self._writer = None
+        self.closed = True
+        with self._lock:
+            for region_file, region_map in self._open_regions.values():
+                if region_map is not None:
+                    region_map.close()
+                region_file.close()
+            self._open_regions.clear()
+
+    def get_stats(self):
+        return {
+            'enabled': self.enabled,
+            'closed': self.closed,
+            'reads': self.reads,
+            'read_misses': self.read_misses,
+            'writes': self.writes,
+            'pending_writes': self._write_queue.qsize(),
+            'bytes_written': self.bytes_written,
+            'avg_read_ms': self.read_time / self.reads * 1000 if self.reads else 0.0
+        }
@@ -0,0 +1,119 @@
+import heapq
+import time
+
+
+class FrameScheduler:
+    """Verteilt Main-Thread Arbeit mit Prioritäten und Zeitbudget auf Frames
+
+    Ursina/Panda3D sind nicht thread-safe - Entities erstellen, Meshes
+    hochladen und destroy() müssen im Main-Thread laufen. Statt alles auf
+    einmal zu erledigen, arbeitet run() pro Frame nur so viele Jobs ab,
+    wie ins Budget passen. Der Rest wartet auf den nächsten Frame.
+    """
+
+    PRIORITY_HIGH = 0
+    PRIORITY_NORMAL = 1
+    PRIORITY_LOW = 2
+
+    def __init__(self, budget_ms=4.0):
+        self.budget_ms = budget_ms
+        self._queue = []
+        self._jobs_by_key = {}
+        self._sequence = 0
+
+        # Statistiken
+        self.jobs_run = 0
+        self.jobs_failed = 0
+        self.overruns = 0
+        self.frames = 0
+        self.last_frame_ms = 0.0
+        self.max_job_ms = 0.0
+
+    def schedule(self, func, *args, priority=PRIORITY_NORMAL, key=None):
+        """Stellt einen Job ein
+
+        Jobs mit gleichem key werden nur einmal ausgeführt - ein erneuter
+        Aufruf übernimmt die höhere Priorität, erzeugt aber keinen neuen Job.
+        Gibt True zurück wenn ein neuer Job eingestellt wurde.
+        """
+        if key is not None and key in self._jobs_by_key:
+            job = self._jobs_by_key[key]
+            if priority < job[0]:
+                job[3] = None  # Alten Eintrag verwerfen, mit höherer Priorität neu einstellen
+                del self._jobs_by_key[key]
+                self.schedule(func, *args, priority=priority, key=key)
+            return False
+
+        self._sequence += 1
+        job = [priority, self._sequence, key, func, args]
+        heapq.heappush(self._queue, job)
+        if key is not None:
+            self._jobs_by_key[key] = job
+        return True
+
+    def cancel(self, key):
+        """Verwirft einen wartenden Job"""
+        job = self._jobs_by_key.pop(key, None)
+        if job is None:
+            return False
+        job[3] = None
+        return True
+
+    def is_scheduled(self, key):
+        return key in self._jobs_by_key
+
+    def run(self, budget_ms=None):
+        """Arbeitet Jobs ab bis das Budget verbraucht ist (mindestens einen)"""
+        budget = (self.budget_ms if budget_ms is None else budget_ms) / 1000
+        start_time = time.perf_counter()
+        jobs_run = 0
+
+        while self._queue:
+            if jobs_run > 0 and time.perf_counter() - start_time >= budget:
+                break
+
+            priority, sequence, key, func, args = heapq.heappop(self._queue)
+            if func is None:
+                continue  # Abgebrochen
+            if key is not None:
+                self._jobs_by_key.pop(key, None)
+
+            job_start = time.perf_counter()
+            try:
+                func(*args)
+            except Exception as e:
+                self.jobs_failed += 1
+                print(f"[Scheduler] Job {key or func} failed: {e}")
+            self.max_job_ms = max(self.max_job_ms, (time.perf_counter() - job_start) * 1000)
+            jobs_run += 1
+
+        self.last_frame_ms = (time.perf_counter() - start_time) * 1000
+        if jobs_run:
+            self.frames += 1
+            self.jobs_run += jobs_run
+            if self.last_frame_ms > budget * 1000:
+                self.overruns += 1
+        return jobs_run
+
+    @property
+    def queue_depth(self):
+        return len(self._queue) - sum(1 for job in self._queue if job[3] is None)
+
+    def clear(self):
+        self._queue.clear()
+        self._jobs_by_key.clear()
+
+    def get_stats(self):
+        return {
+            'queue_depth': self.queue_depth,
+            'budget_ms': self.budget_ms,
+            'jobs_run': self.jobs_run,
+            'jobs_failed': self.jobs_failed,
+            'overruns': self.overruns,
+            'last_frame_ms': self.last_frame_ms,
+            'max_job_ms': self.max_job_ms
+        }
+
+
+# Globaler Scheduler für den Main-Thread (wird in main.update() abgearbeitet)
+frame_scheduler = FrameScheduler(budget_ms=4.0)
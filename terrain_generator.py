@@ -0,0 +1,645 @@
+"""Voxel-Generierung aus Noise: Höhen, Biome, Höhlen und Bäume als ChunkData
+
+Ohne Ursina und BlockRegistry - die Worker-Prozesse des ProcessChunkLoader
+importieren nur dieses Modul (numpy und der Noise-Code). Das Rendern der
+Chunks übernimmt world_generator.
+"""
+import random
+import math
+import time
+import numpy as np
+from chunk_data import ChunkData, AIR
+from chunk_cache import LRUByteCache
+from metrics import metrics
+
+
+class SimpleNoise:
+    """Einfache und schnelle Noise-Implementierung"""
+    
+    def __init__(self, seed=0):
+        # Eigene Random-Instanz - der globale random Zustand bleibt unberührt
+        rng = random.Random(seed)
+        self.perm = [i for i in range(256)]
+        rng.shuffle(self.perm)
+        self.perm *= 2
+        self._perm_array = np.array(self.perm, dtype=np.int64)
+    
+    def noise2d(self, x, z, scale=1.0):
+        """Einfache 2D Noise Funktion"""
+        x *= scale
+        z *= scale
+        
+        # Integer Koordinaten
+        xi = int(x) & 255
+        zi = int(z) & 255
+        
+        # Fractional Koordinaten
+        xf = x - int(x)
+        zf = z - int(z)
+        
+        # Fade Kurven
+        u = self._fade(xf)
+        v = self._fade(zf)
+        
+        # Hash Koordinaten
+        aa = self.perm[self.perm[xi] + zi]
+        ab = self.perm[self.perm[xi] + zi + 1]
+        ba = self.perm[self.perm[xi + 1] + zi]
+        bb = self.perm[self.perm[xi + 1] + zi + 1]
+        
+        # Interpolation
+        x1 = self._lerp(self._grad(aa, xf, zf), self._grad(ba, xf - 1, zf), u)
+        x2 = self._lerp(self._grad(ab, xf, zf - 1), self._grad(bb, xf - 1, zf - 1), u)
+        
+        return self._lerp(x1, x2, v)
+    
+    def noise2d_grid(self, xs, zs, scale=1.0):
+        """Vektorisierte 2D Noise über ein ganzes Gitter
+        
+        xs und zs sind 1D Koordinaten-Achsen (z.B. alle X und Z eines Chunks).
+        Das Ergebnis hat die Form (len(xs), len(zs)) und ist bitgleich mit
+        noise2d(xs[i], zs[j], scale).
+        """
+        xs = np.asarray(xs, dtype=np.float64).reshape(-1, 1)
+        zs = np.asarray(zs, dtype=np.float64).reshape(1, -1)
+        return self.noise2d_array(xs, zs, scale)
+    
+    def noise2d_array(self, x, z, scale=1.0):
+        """Elementweise 2D Noise für broadcastbare Arrays (bitgleich mit noise2d)"""
+        x = np.asarray(x, dtype=np.float64) * scale
+        z = np.asarray(z, dtype=np.float64) * scale
+        
+        # int() schneidet Richtung 0 ab - np.trunc verhält sich identisch
+        x_int = np.trunc(x)
+        z_int = np.trunc(z)
+        xi = x_int.astype(np.int64) & 255
+        zi = z_int.astype(np.int64) & 255
+        
+        xf = x - x_int
+        zf = z - z_int
+        
+        u = self._fade(xf)
+        v = self._fade(zf)
+        
+        perm = self._perm_array
+        aa = perm[perm[xi] + zi]
+        ab = perm[perm[xi] + zi + 1]
+        ba = perm[perm[xi + 1] + zi]
+        bb = perm[perm[xi + 1] + zi + 1]
+        
+        x1 = self._lerp(self._grad_array(aa, xf, zf), self._grad_array(ba, xf - 1, zf), u)
+        x2 = self._lerp(self._grad_array(ab, xf, zf - 1), self._grad_array(bb, xf - 1, zf - 1), u)
+        
+        return self._lerp(x1, x2, v)
+    
+    def noise3d(self, x, y, z, scale=1.0):
+        """3D Gradient Noise (Improved Perlin), Werte etwa in [-1, 1]"""
+        x *= scale
+        y *= scale
+        z *= scale
+        
+        x0 = math.floor(x)
+        y0 = math.floor(y)
+        z0 = math.floor(z)
+        xi, yi, zi = x0 & 255, y0 & 255, z0 & 255
+        xf, yf, zf = x - x0, y - y0, z - z0
+        
+        u = self._fade(xf)
+        v = self._fade(yf)
+        w = self._fade(zf)
+        
+        perm = self.perm
+        a = perm[xi] + yi
+        aa = perm[a] + zi
+        ab = perm[a + 1] + zi
+        b = perm[xi + 1] + yi
+        ba = perm[b] + zi
+        bb = perm[b + 1] + zi
+        
+        grad = self._grad3
+        x1 = self._lerp(grad(perm[aa], xf, yf, zf), grad(perm[ba], xf - 1, yf, zf), u)
+        x2 = self._lerp(grad(perm[ab], xf, yf - 1, zf), grad(perm[bb], xf - 1, yf - 1, zf), u)
+        x3 = self._lerp(grad(perm[aa + 1], xf, yf, zf - 1), grad(perm[ba + 1], xf - 1, yf, zf - 1), u)
+        x4 = self._lerp(grad(perm[ab + 1], xf, yf - 1, zf - 1), grad(perm[bb + 1], xf - 1, yf - 1, zf - 1), u)
+        return self._lerp(self._lerp(x1, x2, v), self._lerp(x3, x4, v), w)
+    
+    def noise3d_grid(self, xs, ys, zs, scale=1.0):
+        """Vektorisierte 3D Noise über ein Gitter - Form (len(xs), len(ys), len(zs))
+        
+        Gleiche Werte wie noise3d(xs[i], ys[j], zs[k], scale).
+        """
+        xs = np.asarray(xs, dtype=np.float64).reshape(-1, 1, 1)
+        ys = np.asarray(ys, dtype=np.float64).reshape(1, -1, 1)
+        zs = np.asarray(zs, dtype=np.float64).reshape(1, 1, -1)
+        return self.noise3d_array(xs, ys, zs, scale)
+    
+    def noise3d_array(self, x, y, z, scale=1.0):
+        """Elementweise 3D Noise für broadcastbare Arrays (siehe noise3d)"""
+        x, y, z = np.broadcast_arrays(np.asarray(x, dtype=np.float64) * scale,
+                                      np.asarray(y, dtype=np.float64) * scale,
+                                      np.asarray(z, dtype=np.float64) * scale)
+        
+        x0 = np.floor(x)
+        y0 = np.floor(y)
+        z0 = np.floor(z)
+        xi = x0.astype(np.int64) & 255
+        yi = y0.astype(np.int64) & 255
+        zi = z0.astype(np.int64) & 255
+        xf, yf, zf = x - x0, y - y0, z - z0
+        
+        u = self._fade(xf)
+        v = self._fade(yf)
+        w = self._fade(zf)
+        
+        perm = self._perm_array
+        a = perm[xi] + yi
+        aa = perm[a] + zi
+        ab = perm[a + 1] + zi
+        b = perm[xi + 1] + yi
+        ba = perm[b] + zi
+        bb = perm[b + 1] + zi
+        
+        grad = self._grad3_array
+        x1 = self._lerp(grad(perm[aa], xf, yf, zf), grad(perm[ba], xf - 1, yf, zf), u)
+        x2 = self._lerp(grad(perm[ab], xf, yf - 1, zf), grad(perm[bb], xf - 1, yf - 1, zf), u)
+        x3 = self._lerp(grad(perm[aa + 1], xf, yf, zf - 1), grad(perm[ba + 1], xf - 1, yf, zf - 1), u)
+        x4 = self._lerp(grad(perm[ab + 1], xf, yf - 1, zf - 1), grad(perm[bb + 1], xf - 1, yf - 1, zf - 1), u)
+        return self._lerp(self._lerp(x1, x2, v), self._lerp(x3, x4, v), w)
+    
+    def _fade(self, t):
+        return t * t * t * (t * (t * 6 - 15) + 10)
+    
+    def _lerp(self, a, b, t):
+        return a + t * (b - a)
+    
+    def _grad(self, hash_val, x, z):
+        h = hash_val & 15
+        u = x if h < 8 else z
+        v = z if h < 4 else (x if h == 12 or h == 14 else 0)
+        return (u if (h & 1) == 0 else -u) + (v if (h & 2) == 0 else -v)
+    
+    def _grad3(self, hash_val, x, y, z):
+        """Einer der 12 Kanten-Gradienten des Würfels (Improved Perlin)"""
+        h = hash_val & 15
+        u = x if h < 8 else y
+        v = y if h < 4 else (x if h == 12 or h == 14 else z)
+        return (u if (h & 1) == 0 else -u) + (v if (h & 2) == 0 else -v)
+    
+    def _grad3_array(self, hash_val, x, y, z):
+        """Array-Variante von _grad3"""
+        h = hash_val & 15
+        u = np.where(h < 8, x, y)
+        v = np.where(h < 4, y, np.where((h == 12) | (h == 14), x, z))
+        return np.where((h & 1) == 0, u, -u) + np.where((h & 2) == 0, v, -v)
+    
+    def _grad_array(self, hash_val, x, z):
+        """Array-Variante von _grad"""
+        h = hash_val & 15
+        u = np.where(h < 8, x, z)
+        v_is_zero = (h >= 4) & (h != 12) & (h != 14)
+        v = np.where(h < 4, z, x)
+        u = np.where((h & 1) == 0, u, -u)
+        v = np.where((h & 2) == 0, v, -v)
+        # Skalar wird hier die Ganzzahl 0 addiert (-0.0 + 0 ergibt +0.0)
+        v = np.where(v_is_zero, 0.0, v)
+        return u + v
+
+
+_MASK64 = (1 << 64) - 1
+_GOLDEN64 = 0x9E3779B97F4A7C15
+
+
+def _mix64(value):
+    """SplitMix64 Finalizer"""
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return value ^ (value >> 31)
+
+
+class PositionalRandom:
+    """Deterministischer Zufall aus Hash(seed, x, y, z, purpose)
+    
+    Jede Entscheidung hängt nur von Seed und Welt-Position ab, nicht von der
+    Reihenfolge der Aufrufe - Chunks sind damit unabhängig von Thread,
+    Prozess und Lade-Reihenfolge.
+    """
+    
+    # Verwendungszwecke, damit verschiedene Entscheidungen an derselben
+    # Position unabhängig voneinander sind
+    TREE = 1
+    TREE_HEIGHT = 2
+    LEAVES = 3
+    
+    def __init__(self, seed):
+        self.seed = seed & _MASK64
+    
+    def hash(self, x, y, z, purpose):
+        value = self.seed
+        for part in (x, y, z, purpose):
+            value = _mix64((value + _GOLDEN64 + (part & _MASK64)) & _MASK64)
+        return value
+    
+    def random(self, x, y, z, purpose):
+        """Float in [0, 1)"""
+        return (self.hash(x, y, z, purpose) >> 11) * (1.0 / (1 << 53))
+    
+    def randint(self, a, b, x, y, z, purpose):
+        """Ganzzahl in [a, b] wie random.randint"""
+        return a + int(self.random(x, y, z, purpose) * (b - a + 1))
+    
+    def random_grid(self, xs, zs, y, purpose):
+        """random() für ein ganzes Gitter (Form len(xs) x len(zs)), bitgleich"""
+        xs = np.asarray(xs, dtype=np.int64).astype(np.uint64).reshape(-1, 1)
+        zs = np.asarray(zs, dtype=np.int64).astype(np.uint64).reshape(1, -1)
+        
+        value = np.full(np.broadcast_shapes(xs.shape, zs.shape), self.seed, dtype=np.uint64)
+        for part in (xs, np.uint64(y & _MASK64), zs, np.uint64(purpose)):
+            value = self._mix64_array(value + np.uint64(_GOLDEN64) + part)
+        return (value >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+    
+    @staticmethod
+    def _mix64_array(value):
+        value = (value ^ (value >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        value = (value ^ (value >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return value ^ (value >> np.uint64(31))
+
+
+class FastWorldGenerator:
+    """Optimierter World Generator - Einfach und Schnell"""
+    
+    # Block Typen
+    BLOCKS = {
+        'grass': 0,
+        'dirt': 1, 
+        'stone': 2,
+        'sand': 3,
+        'water': 4,
+        'wood': 5,
+        'leaves': 6
+    }
+    BLOCK_NAMES = {block_id: name for name, block_id in BLOCKS.items()}
+    
+    # Flüssigkeiten: bleiben in den Voxel-Daten, werden aber als eigene Schicht gerendert
+    LIQUID_BLOCKS = ('water',)
+    
+    # Biom Definitionen: [surface, subsurface, tree_chance, base_height, height_variation]
+    BIOMES = {
+        'plains': ['grass', 'dirt', 0.01, 5, 2],  # Reduzierte Werte für bessere Performance
+        'desert': ['sand', 'sand', 0.001, 4, 1], 
+        'hills': ['grass', 'stone', 0.005, 8, 3],
+        'mountains': ['stone', 'stone', 0.001, 12, 4]
+    }
+    BIOME_NAMES = tuple(BIOMES)
+    
+    # Vertikale Grenzen der Generierung
+    WORLD_MIN_Y = -5
+    SEA_LEVEL = 3
+    TREE_MAX_HEIGHT = 4
+    
+    # Oberkante (exklusiv) der Bedrock-Schicht ab WORLD_MIN_Y
+    BEDROCK_MAX_Y = -3
+    
+    # Höhlen-Bereich (y) für _is_simple_cave (density_caves=False)
+    CAVE_MIN_Y = -8
+    CAVE_MAX_Y = 0
+    
+    # 3D Dichtefeld-Höhlen: Tunnel, wo zwei Noise-Felder zugleich nahe 0 sind
+    CAVE_SCALE = 0.07
+    CAVE_VERTICAL_SCALE = 2.0  # Gestaucht - Tunnel verlaufen eher horizontal
+    CAVE_TUNNEL_WIDTH = 0.1
+    CAVE_SURFACE_MARGIN = 3  # Höhlen enden so viele Blöcke unter der Oberfläche
+    
+    # Erhöhen, wenn sich das Ergebnis der Generierung ändert - gespeicherte
+    # Welten eines anderen Stands passen dann nicht mehr an neue Chunks
+    GENERATOR_VERSION = 2
+    
+    def __init__(self, seed=None, chunk_size=8, cache_bytes=32 * 1024 * 1024, deterministic=True,
+                 density_caves=True):  # Kleinere Chunks für bessere Performance
+        self.seed = seed or random.randint(0, 999999)
+        self.chunk_size = chunk_size
+        self.noise = SimpleNoise(self.seed)
+        
+        # deterministic: Chunks sind eine reine Funktion von Seed und Koordinaten.
+        # Sonst (alt) ziehen Bäume der Reihe nach aus einem Random-Generator.
+        self.deterministic = deterministic
+        # density_caves: Höhlen aus einem 3D Dichtefeld über das ganze Chunk-Volumen.
+        # Sonst (alt) 2D Noise pro Zelle und nur für CAVE_MIN_Y <= y < CAVE_MAX_Y.
+        self.density_caves = density_caves
+        self.positional_random = PositionalRandom(self.seed)
+        self._sequential_random = random.Random(self.seed)
+        
+        # Biom-Parameter als Arrays für die vektorisierte Höhenberechnung
+        self._biome_base_heights = np.array([self.BIOMES[name][3] for name in self.BIOME_NAMES], dtype=np.float64)
+        self._biome_height_vars = np.array([self.BIOMES[name][4] for name in self.BIOME_NAMES], dtype=np.float64)
+        self._biome_tree_chances = np.array([self.BIOMES[name][2] for name in self.BIOME_NAMES], dtype=np.float64)
+        
+        # Chunk Cache für Voxel-Daten: LRU mit Byte-Budget, thread-sicher
+        self.chunk_cache = LRUByteCache(cache_bytes, name='chunk_data')
+        
+        # Optionaler Region-Store auf der Platte (siehe get_chunk)
+        self.store = None
+        
+        print(f"World Generator initialized - Seed: {self.seed}, Chunk Size: {self.chunk_size}")
+    
+    def generator_options(self):
+        """Version und Optionen, von denen die generierten Blöcke abhängen (level.json, Chunk-Metadaten)"""
+        return {
+            'version': self.GENERATOR_VERSION,
+            'deterministic': self.deterministic,
+            'density_caves': self.density_caves
+        }
+    
+    def get_biome(self, x, z):
+        """Bestimmt Biom basierend auf Koordinaten"""
+        biome_noise = self.noise.noise2d(x, z, 0.005)
+        
+        if biome_noise < -0.3:
+            return 'desert'
+        elif biome_noise < 0.1:
+            return 'plains'
+        elif biome_noise < 0.4:
+            return 'hills'
+        else:
+            return 'mountains'
+    
+    def get_biome_grid(self, xs, zs):
+        """Biom-Indizes (in BIOME_NAMES) für ein ganzes Gitter"""
+        biome_noise = self.noise.noise2d_grid(xs, zs, 0.005)
+        
+        return np.select(
+            [biome_noise < -0.3, biome_noise < 0.1, biome_noise < 0.4],
+            [self.BIOME_NAMES.index('desert'),
+             self.BIOME_NAMES.index('plains'),
+             self.BIOME_NAMES.index('hills')],
+            default=self.BIOME_NAMES.index('mountains')
+        )
+    
+    def get_height(self, x, z, biome=None):
+        """Berechnet Höhe für gegebene Koordinaten (biome optional vorberechnet)"""
+        if biome is None:
+            biome = self.get_biome(x, z)
+        biome_data = self.BIOMES[biome]
+        
+        base_height = biome_data[3]
+        height_var = biome_data[4]
+        
+        # Einfachere Noise für bessere Performance
+        height_noise = self.noise.noise2d(x, z, 0.02)
+        
+        return int(base_height + height_noise * height_var)
+    
+    def get_height_grid(self, xs, zs, biome_grid=None):
+        """Berechnet Höhen für ein ganzes Gitter (identisch zu get_height)"""
+        if biome_grid is None:
+            biome_grid = self.get_biome_grid(xs, zs)
+        
+        base_height = self._biome_base_heights[biome_grid]
+        height_var = self._biome_height_vars[biome_grid]
+        
+        height_noise = self.noise.noise2d_grid(xs, zs, 0.02)
+        
+        return np.trunc(base_height + height_noise * height_var).astype(np.int64)
+    
+    def generate_chunk(self, chunk_x, chunk_z):
+        """Generiert einen einzelnen Chunk als ChunkData (ohne Entities)"""
+        chunk_key = (chunk_x, chunk_z)
+        
+        # Check Cache
+        cached = self.get_cached_chunk(chunk_key)
+        if cached is not None:
+            return cached
+        
+        start_time = time.perf_counter()
+        
+        # World Koordinaten
+        world_x_start = chunk_x * self.chunk_size
+        world_z_start = chunk_z * self.chunk_size
+        
+        # Noise für den ganzen Chunk auf einmal berechnen - mit einem Block Rand,
+        # da Baumkronen aus Nachbar-Säulen in den Chunk ragen können
+        xs = np.arange(world_x_start - 1, world_x_start + self.chunk_size + 1)
+        zs = np.arange(world_z_start - 1, world_z_start + self.chunk_size + 1)
+        biome_grid = self.get_biome_grid(xs, zs)
+        height_grid = self.get_height_grid(xs, zs, biome_grid)
+        cave_grid = None if self.density_caves else self.get_cave_grid(xs[1:-1], zs[1:-1])
+        
+        # Höhenbereich: Bedrock bis höchste Oberfläche plus Baumhöhe
+        max_y = max(int(height_grid.max()), self.SEA_LEVEL) + self.TREE_MAX_HEIGHT
+        chunk = ChunkData(chunk_x, chunk_z, self.chunk_size, self.WORLD_MIN_Y, max_y,
+                          metadata={'seed': self.seed, 'generator': self.generator_options()})
+        chunk.heightmap = height_grid[1:-1, 1:-1].astype(np.int16)
+        chunk.biome_map = biome_grid[1:-1, 1:-1].astype(np.uint8)
+        
+        # Batch-Generierung für bessere Performance
+        for local_x in range(self.chunk_size):
+            for local_z in range(self.chunk_size):
+                world_x = world_x_start + local_x
+                world_z = world_z_start + local_z
+                
+                self._generate_column(
+                    chunk, world_x, world_z,
+                    height=int(height_grid[local_x + 1, local_z + 1]),
+                    biome=self.BIOME_NAMES[biome_grid[local_x + 1, local_z + 1]],
+                    caves=cave_grid[local_x, local_z] if cave_grid is not None else None
+                )
+        
+        if self.density_caves:
+            self._carve_caves(chunk, xs[1:-1], zs[1:-1], height_grid[1:-1, 1:-1])
+        if self.deterministic:
+            self._generate_trees(chunk, xs, zs, biome_grid, height_grid)
+        chunk.compact()  # Einheitliche Sections (Luft, Gestein) auf eine Block-ID reduzieren
+        
+        self.cache_chunk(chunk)
+        
+        gen_time = (time.perf_counter() - start_time) * 1000
+        chunk.metadata['generation_ms'] = gen_time
+        record_generated_chunk(chunk)
+        
+        return chunk
+    
+    def get_chunk(self, chunk_x, chunk_z):
+        """Holt einen Chunk: Cache, dann Region-Store, sonst Generierung
+        
+        Neu generierte Chunks werden im Hintergrund in den Store geschrieben.
+        """
+        chunk_key = (chunk_x, chunk_z)
+        cached = self.get_cached_chunk(chunk_key)
+        if cached is not None:
+            return cached
+        
+        if self.store:
+            stored = self.store.load(chunk_key)
+            if stored is not None:
+                metrics.counter('chunk.store_loads').inc()
+                self.cache_chunk(stored)
+                return stored
+        
+        chunk = self.generate_chunk(chunk_x, chunk_z)
+        if self.store:
+            self.store.save_async(chunk)
+        return chunk
+    
+    def get_cached_chunk(self, chunk_key):
+        """Gibt gecachte ChunkData zurück (oder None)"""
+        return self.chunk_cache.get(chunk_key)
+    
+    def cache_chunk(self, chunk):
+        """Legt ChunkData im Cache ab (auch für Chunks aus Worker-Prozessen)"""
+        self.chunk_cache.put(chunk.key, chunk, chunk.nbytes)
+    
+    def _generate_column(self, chunk, x, z, height=None, biome=None, caves=None):
+        """Generiert eine vertikale Säule von Blöcken in chunk
+        
+        height, biome und caves (Zeile aus get_cave_grid) können vorberechnet
+        übergeben werden, sonst werden sie per Noise bestimmt. Mit density_caves
+        bleibt die Säule massiv - generate_chunk schneidet die Höhlen danach
+        für den ganzen Chunk auf einmal heraus (_carve_caves).
+        """
+        if biome is None:
+            biome = self.get_biome(x, z)
+        if height is None:
+            height = self.get_height(x, z, biome)
+        biome_data = self.BIOMES[biome]
+        
+        surface_block = self.BLOCKS[biome_data[0]]
+        subsurface_block = self.BLOCKS[biome_data[1]]
+        tree_chance = biome_data[2]
+        
+        # Reduzierte Tiefe für bessere Performance
+        # Bedrock Layer
+        chunk.set_column(x, z, self.WORLD_MIN_Y, self.BEDROCK_MAX_Y, self.BLOCKS['stone'])
+        
+        # Underground - nur bis zu einer bestimmten Tiefe
+        if self.density_caves:
+            chunk.set_column(x, z, self.BEDROCK_MAX_Y, max(0, height - 1), subsurface_block)
+        else:
+            for y in range(self.BEDROCK_MAX_Y, 0):
+                # Einfachere Höhlen Logik
+                if self._is_cave(x, y, z, caves):
+                    continue
+                chunk.set_block(x, y, z, subsurface_block)
+            chunk.set_column(x, z, 0, height - 1, subsurface_block)
+        
+        # Surface
+        if height > 0:
+            chunk.set_block(x, height - 1, z, surface_block)
+        
+        # Wasser (vereinfacht)
+        if height < self.SEA_LEVEL:
+            chunk.set_column(x, z, max(0, height), self.SEA_LEVEL, self.BLOCKS['water'])
+        
+        # Weniger Bäume für bessere Performance (deterministisch: _generate_trees)
+        if not self.deterministic:
+            if self._sequential_random.random() < tree_chance and height >= self.SEA_LEVEL:
+                self._generate_simple_tree(chunk, x, height, z)
+    
+    def _is_simple_cave(self, x, y, z):
+        """Sehr einfache Höhlen Generation"""
+        if y >= self.CAVE_MAX_Y or y < self.CAVE_MIN_Y:
+            return False
+        
+        cave_noise = self.noise.noise2d(x + y, z + y, 0.05)
+        return cave_noise > 0.7
+    
+    def _is_cave(self, x, y, z, caves=None):
+        """Höhlen-Test mit optional vorberechneter Höhlen-Säule"""
+        if caves is None:
+            return self._is_simple_cave(x, y, z)
+        if y >= self.CAVE_MAX_Y or y < self.CAVE_MIN_Y:
+            return False
+        return bool(caves[y - self.CAVE_MIN_Y])
+    
+    def get_density_cave_grid(self, xs, ys, zs):
+        """3D Höhlen-Maske der Form (len(xs), len(ys), len(zs)) - True heißt Luft
+        
+        Zwei unabhängige Gradient-Noise-Felder über das ganze Volumen, Höhle
+        wo beide nahe 0 sind (Schnitt zweier Flächen: verzweigte Tunnel).
+        Ein vektorisierter Schwellwert statt eines Noise-Aufrufs pro Zelle.
+        """
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64) * self.CAVE_VERTICAL_SCALE
+        zs = np.asarray(zs, dtype=np.float64)
+        first = self.noise.noise3d_grid(xs, ys, zs, self.CAVE_SCALE)
+        # Zweites Feld: gleiche Permutation, weit entfernte Koordinaten
+        second = self.noise.noise3d_grid(xs + 1031.7, ys - 517.3, zs + 2063.9, self.CAVE_SCALE)
+        return (np.abs(first) < self.CAVE_TUNNEL_WIDTH) & (np.abs(second) < self.CAVE_TUNNEL_WIDTH)
+    
+    def is_density_cave(self, x, y, z):
+        """Skalar-Variante von get_density_cave_grid für eine Zelle"""
+        y *= self.CAVE_VERTICAL_SCALE
+        first = self.noise.noise3d(x, y, z, self.CAVE_SCALE)
+        second = self.noise.noise3d(x + 1031.7, y - 517.3, z + 2063.9, self.CAVE_SCALE)
+        return abs(first) < self.CAVE_TUNNEL_WIDTH and abs(second) < self.CAVE_TUNNEL_WIDTH
+    
+    def _carve_caves(self, chunk, xs, zs, heights):
+        """Schneidet Höhlen aus dem Untergrund des ganzen Chunks
+        
+        Zwischen Bedrock und CAVE_SURFACE_MARGIN Blöcke unter der Oberfläche
+        jeder Säule (heights[x, z]) - Wasser und Oberfläche bleiben dicht.
+        """
+        top = int(heights.max()) - self.CAVE_SURFACE_MARGIN
+        if top <= self.BEDROCK_MAX_Y:
+            return
+        ys = np.arange(self.BEDROCK_MAX_Y, top)
+        caves = self.get_density_cave_grid(xs, ys, zs)
+        caves &= ys[None, :, None] < (heights[:, None, :] - self.CAVE_SURFACE_MARGIN)
+        chunk.fill_where(self.BEDROCK_MAX_Y, top, caves, AIR)
+    
+    def get_cave_grid(self, xs, zs):
+        """Höhlen-Maske für ein ganzes Gitter
+        
+        Ergebnis hat die Form (len(xs), len(zs), CAVE_MAX_Y - CAVE_MIN_Y),
+        Index [.., .., y - CAVE_MIN_Y] entspricht _is_simple_cave(x, y, z).
+        """
+        xs = np.asarray(xs, dtype=np.float64).reshape(-1, 1, 1)
+        zs = np.asarray(zs, dtype=np.float64).reshape(1, -1, 1)
+        ys = np.arange(self.CAVE_MIN_Y, self.CAVE_MAX_Y, dtype=np.float64).reshape(1, 1, -1)
+        
+        cave_noise = self.noise.noise2d_array(xs + ys, zs + ys, 0.05)
+        return cave_noise > 0.7
+    
+    def _generate_trees(self, chunk, xs, zs, biome_grid, height_grid):
+        """Setzt alle Bäume, deren Stamm oder Krone in chunk liegt
+        
+        Baum-Entscheidungen kommen aus PositionalRandom, Säulen am Rand
+        werden deshalb von beiden Nachbar-Chunks identisch berechnet.
+        """
+        tree_rolls = self.positional_random.random_grid(xs, zs, 0, PositionalRandom.TREE)
+        has_tree = (tree_rolls < self._biome_tree_chances[biome_grid]) & (height_grid >= self.SEA_LEVEL)
+        
+        for i, j in np.argwhere(has_tree).tolist():
+            self._generate_simple_tree(chunk, int(xs[i]), int(height_grid[i, j]), int(zs[j]))
+    
+    def _generate_simple_tree(self, chunk, x, base_y, z):
+        """Generiert einen einfachen Baum"""
+        if self.deterministic:
+            rng = self.positional_random
+            tree_height = rng.randint(2, self.TREE_MAX_HEIGHT, x, base_y, z, PositionalRandom.TREE_HEIGHT)
+        else:
+            tree_height = self._sequential_random.randint(2, self.TREE_MAX_HEIGHT)  # Kleinere Bäume
+        
+        # Stamm
+        for y in range(base_y, base_y + tree_height):
+            if not self.deterministic or chunk.contains(x, y, z):
+                chunk.set_block(x, y, z, self.BLOCKS['wood'])
+        
+        # Einfache Blätter
+        crown_y = base_y + tree_height - 1
+        for dx in [-1, 0, 1]:
+            for dz in [-1, 0, 1]:
+                if dx == 0 and dz == 0:
+                    continue
+                if not self.deterministic:
+                    if self._sequential_random.random() < 0.6:
+                        chunk.set_block(x + dx, crown_y, z + dz, self.BLOCKS['leaves'])
+                # Blätter nur in Luft, Stämme haben Vorrang - unabhängig von der Reihenfolge
+                elif (rng.random(x + dx, crown_y, z + dz, PositionalRandom.LEAVES) < 0.6
+                        and chunk.get_block(x + dx, crown_y, z + dz) == AIR
+                        and chunk.contains(x + dx, crown_y, z + dz)):
+                    chunk.set_block(x + dx, crown_y, z + dz, self.BLOCKS['leaves'])
+
+
+def record_generated_chunk(chunk):
+    """Zählt einen neu generierten Chunk in den Metriken (auch für Worker-Prozesse)"""
+    metrics.counter('chunk.generated').inc()
+    metrics.histogram('chunk.generate_ms').observe(chunk.metadata.get('generation_ms', 0.0))
@@ -0,0 +1,61 @@
+"""Vertex-/Dreieckszahlen von build_chunk_mesh (headless, ohne Ursina)"""
+import numpy as np
+
+from chunk_data import ChunkData
+from chunk_mesher import build_chunk_mesh
+
+STONE = 2
+WATER = 4
+
+
+def make_chunk(chunk_x=0, chunk_z=0, blocks=()):
+    chunk = ChunkData(chunk_x, chunk_z, 8, 0, 16)
+    for x, y, z, block_id in blocks:
+        chunk.set_block(x, y, z, block_id)
+    return chunk
+
+
+def test_single_block():
+    mesh = build_chunk_mesh(make_chunk(blocks=[(3, 5, 3, STONE)]))
+    assert mesh.quad_count == 6
+    assert mesh.vertex_count == 24
+    assert mesh.triangle_count == 12
+    assert mesh.vertices.min(axis=0).tolist() == [3, 5, 3]
+    assert mesh.vertices.max(axis=0).tolist() == [4, 6, 4]
+
+
+def test_two_adjacent_blocks_merge():
+    # Gemeinsame Flächen verschwinden, die Seiten werden zu 2x1 Rechtecken gemergt
+    mesh = build_chunk_mesh(make_chunk(blocks=[(3, 5, 3, STONE), (4, 5, 3, STONE)]))
+    assert mesh.quad_count == 6
+    assert mesh.vertex_count == 24
+    assert mesh.triangle_count == 12
+
+
+def test_two_adjacent_blocks_of_different_types():
+    # Gemeinsame Flächen verschwinden, gemergt wird aber nur gleicher Block-Typ
+    mesh = build_chunk_mesh(make_chunk(blocks=[(3, 5, 3, STONE), (4, 5, 3, 1)]))
+    assert mesh.quad_count == 10
+    assert mesh.vertex_count == 40
+    assert mesh.triangle_count == 20
+
+
+def test_culling_across_chunk_border():
+    chunk = make_chunk(blocks=[(7, 5, 3, STONE)])
+    solid_neighbour = make_chunk(1, 0, blocks=[(8, 5, 3, STONE)])
+    water_neighbour = make_chunk(1, 0, blocks=[(8, 5, 3, WATER)])
+
+    # Fehlende Nachbarn gelten als Luft
+    assert build_chunk_mesh(chunk).quad_count == 6
+    assert build_chunk_mesh(chunk, neighbours={(1, 0): solid_neighbour}).quad_count == 5
+    # Hinter durchsichtigen Blöcken bleibt die Fläche sichtbar
+    assert build_chunk_mesh(chunk, [WATER], neighbours={(1, 0): water_neighbour}).quad_count == 6
+
+
+def test_winding_faces_outwards():
+    mesh = build_chunk_mesh(make_chunk(blocks=[(3, 5, 3, STONE)]), ambient_occlusion=True)
+    corners = mesh.vertices[mesh.triangles]
+    cross = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    normals = mesh.normals[mesh.triangles[:, 0]]
+    # Ursina (linkshändig): Vorderseite wenn das Kreuzprodukt entgegen der Normale zeigt
+    assert (np.einsum('ij,ij->i', cross, normals) < 0).all()
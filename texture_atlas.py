@@ -0,0 +1,308 @@
+import hashlib
+import json
+import os
+
+from PIL import Image
+
+# Chunk-Meshes kodieren den Atlas-Slot in der U-Koordinate: u = slot * TILE_STRIDE + lokales u.
+# Größer als jede gemergte Fläche, damit der Shader Slot und Kachel-Koordinate trennen kann.
+TILE_STRIDE = 256
+
+_LAYOUT_VERSION = 1
+
+
+class TextureAtlas:
+    """Packt Block-Texturen in eine Textur für einen Draw-Call pro Chunk
+
+    Jede Textur bekommt einen festen Slot in einem Raster aus Zellen von
+    tile_size + 2 * padding Pixeln. Der Rand jeder Kachel wird mit den
+    Randpixeln aufgefüllt, damit Filterung und Mipmaps nicht in die
+    Nachbarkachel bluten (padding = tile_size / 2 hält Zellen und Atlas
+    bei Zweierpotenzen). Neue Texturen werden in den nächsten freien Slot
+    kopiert, nur wenn das Raster voll ist, wird es verdoppelt und neu
+    gepackt - die Slots bleiben dabei gleich.
+    """
+
+    def __init__(self, tile_size=32, padding=None, columns=2):
+        self.tile_size = tile_size
+        self.padding = tile_size // 2 if padding is None else padding
+        self.columns = columns
+        self.rows = columns
+        self.slots = {}      # key -> Slot-Index
+        self.digests = {}    # key -> Hash der Quell-Textur
+        self._tiles = {}     # key -> Kachel als PIL-Image (tile_size x tile_size)
+        self.image = Image.new('RGBA', (self.atlas_size, self.atlas_size))
+        self.version = 0
+        self._texture = None
+        self._bound_nodes = []
+
+    @property
+    def cell_size(self):
+        return self.tile_size + 2 * self.padding
+
+    @property
+    def atlas_size(self):
+        return self.columns * self.cell_size
+
+    def __contains__(self, key):
+        return key in self.slots
+
+    def __len__(self):
+        return len(self.slots)
+
+    def add(self, key, source):
+        """Fügt eine Textur hinzu oder aktualisiert sie - gibt True bei Änderungen zurück
+
+        source: Dateipfad, PIL-Image oder Ursina-Texture.
+        """
+        image, digest = _load_source(source)
+        if self.digests.get(key) == digest:
+            return False
+
+        tile = image.convert('RGBA').resize((self.tile_size, self.tile_size), Image.NEAREST)
+        self._tiles[key] = tile
+        self.digests[key] = digest
+        if key not in self.slots:
+            self.slots[key] = len(self.slots)
+            if len(self.slots) > self.columns * self.rows:
+                self._grow()
+                return True
+
+        self._paste(self.slots[key], tile)
+        self._changed()
+        return True
+
+    def slot(self, key):
+        return self.slots.get(key)
+
+    def average_color(self, key):
+        """Mittlere Farbe (r, g, b, a) einer Kachel als floats 0..1 - z.B. für LOD-Terrain"""
+        tile = self._tiles.get(key)
+        if tile is None:
+            return None
+        return tuple(channel / 255 for channel in tile.resize((1, 1), Image.BOX).getpixel((0, 0)))
+
+    def uv_rect(self, key):
+        """(u0, v0, u1, v1) der Kachel ohne Rand - v wie in Panda3D von unten"""
+        left, top, right, bottom = self._tile_box(self.slots[key])
+        size = float(self.atlas_size)
+        return (left / size, 1 - bottom / size, right / size, 1 - top / size)
+
+    def _tile_box(self, slot):
+        """Pixel-Rechteck (links, oben, rechts, unten) einer Kachel ohne Rand"""
+        column, row = slot % self.columns, slot // self.columns
+        left = column * self.cell_size + self.padding
+        top = row * self.cell_size + self.padding
+        return left, top, left + self.tile_size, top + self.tile_size
+
+    def _grow(self):
+        """Verdoppelt das Raster und kopiert alle Kacheln an ihre neuen Positionen"""
+        while len(self.slots) > self.columns * self.rows:
+            self.columns *= 2
+            self.rows = self.columns
+        self.image = Image.new('RGBA', (self.atlas_size, self.atlas_size))
+        for key, slot in self.slots.items():
+            self._paste(slot, self._tiles[key])
+        self._changed()
+
+    def _paste(self, slot, tile):
+        left, top, _, _ = self._tile_box(slot)
+        pad, size = self.padding, self.tile_size
+
+        # Randpixel nach außen ziehen (clamp), Ecken inklusive
+        cell = Image.new('RGBA', (self.cell_size, self.cell_size))
+        cell.paste(tile.crop((0, 0, size, 1)).resize((size, pad)), (pad, 0))
+        cell.paste(tile.crop((0, size - 1, size, size)).resize((size, pad)), (pad, pad + size))
+        cell.paste(tile.crop((0, 0, 1, size)).resize((pad, size)), (0, pad))
+        cell.paste(tile.crop((size - 1, 0, size, size)).resize((pad, size)), (pad + size, pad))
+        for corner_x, corner_y, target_x, target_y in ((0, 0, 0, 0), (size - 1, 0, pad + size, 0),
+                                                        (0, size - 1, 0, pad + size),
+                                                        (size - 1, size - 1, pad + size, pad + size)):
+            corner = tile.getpixel((corner_x, corner_y))
+            cell.paste(Image.new('RGBA', (pad, pad), corner), (target_x, target_y))
+        cell.paste(tile, (pad, pad))
+        self.image.paste(cell, (left - pad, top - pad))
+
+    def _changed(self):
+        self.version += 1
+        if self._texture is not None:
+            self._upload()
+        for node in self._bound_nodes:
+            self.apply_shader_inputs(node)
+
+    @property
+    def texture(self):
+        """Ursina-Texture des Atlas (wird bei Änderungen in-place aktualisiert)"""
+        if self._texture is None:
+            from ursina import Texture
+            self._texture = Texture(self.image.copy(), filtering='mipmap')
+        return self._texture
+
+    def _upload(self):
+        from panda3d.core import Texture as PandaTexture
+        texture = self._texture
+        if texture._texture.get_x_size() != self.atlas_size:
+            texture._texture.setup2dTexture(self.atlas_size, self.atlas_size,
+                                            PandaTexture.TUnsignedByte, PandaTexture.FRgba)
+        texture._cached_image = self.image.copy()
+        texture.apply()
+
+    def apply_shader_inputs(self, node):
+        """Setzt die Raster-Uniforms für atlas_shader (werden an Kinder vererbt)"""
+        node.set_shader_input('atlas_grid', (float(self.columns), float(self.rows)))
+        node.set_shader_input('atlas_tile', (self.tile_size / self.cell_size, self.padding / self.cell_size))
+
+    def bind(self, node):
+        """Wie apply_shader_inputs, aktualisiert node aber auch bei späterem Wachstum"""
+        if node not in self._bound_nodes:
+            self._bound_nodes.append(node)
+        self.apply_shader_inputs(node)
+
+    def cache_key(self):
+        """Hash über Layout-Parameter und alle Quell-Texturen"""
+        return _cache_key(self.tile_size, self.padding, self.digests)
+
+    def save(self, cache_dir):
+        """Schreibt Atlas-Bild und Layout unter cache_dir/atlas_<hash>.*"""
+        os.makedirs(cache_dir, exist_ok=True)
+        base = os.path.join(cache_dir, f"atlas_{self.cache_key()}")
+        self.image.save(base + '.png')
+        with open(base + '.json', 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': _LAYOUT_VERSION,
+                'tile_size': self.tile_size,
+                'padding': self.padding,
+                'columns': self.columns,
+                'slots': self.slots,
+                'digests': self.digests
+            }, f)
+        return base
+
+    @classmethod
+    def load(cls, cache_dir, cache_key):
+        """Lädt einen gespeicherten Atlas - None wenn nicht vorhanden oder ungültig"""
+        base = os.path.join(cache_dir, f"atlas_{cache_key}")
+        try:
+            with open(base + '.json', 'r', encoding='utf-8') as f:
+                layout = json.load(f)
+            image = Image.open(base + '.png').convert('RGBA')
+        except (OSError, ValueError):
+            return None
+        if layout.get('version') != _LAYOUT_VERSION:
+            return None
+
+        atlas = cls(layout['tile_size'], layout['padding'], layout['columns'])
+        atlas.slots = dict(layout['slots'])
+        atlas.digests = dict(layout['digests'])
+        atlas.image = image
+        # Kacheln aus dem Bild zurückholen, damit späteres Wachstum neu packen kann
+        for key, slot in atlas.slots.items():
+            atlas._tiles[key] = image.crop(atlas._tile_box(slot))
+        return atlas
+
+    @classmethod
+    def build(cls, sources, cache_dir=None, tile_size=32, padding=None):
+        """Baut einen Atlas aus {key: source} - mit cache_dir ohne Neu-Packen, wenn unverändert"""
+        loaded = {key: _load_source(source) for key, source in sources.items()}
+        padding = tile_size // 2 if padding is None else padding
+
+        if cache_dir:
+            digests = {key: digest for key, (_, digest) in loaded.items()}
+            cached = cls.load(cache_dir, _cache_key(tile_size, padding, digests))
+            if cached is not None:
+                return cached
+
+        atlas = cls(tile_size, padding)
+        for key in sorted(loaded):
+            image, _ = loaded[key]
+            atlas.add(key, image)
+            atlas.digests[key] = loaded[key][1]
+        if cache_dir:
+            atlas.save(cache_dir)
+        return atlas
+
+
+def _cache_key(tile_size, padding, digests):
+    hasher = hashlib.sha1(f"{_LAYOUT_VERSION}:{tile_size}:{padding}".encode('utf-8'))
+    for key in sorted(digests):
+        hasher.update(f"{key}={digests[key]};".encode('utf-8'))
+    return hasher.hexdigest()[:16]
+
+
+def _load_source(source):
+    """Gibt (PIL-Image, Hash) für einen Dateipfad, ein PIL-Image oder eine Ursina-Texture zurück"""
+    if isinstance(source, Image.Image):
+        return source, hashlib.sha1(source.convert('RGBA').tobytes()).hexdigest()
+
+    path = getattr(source, 'path', source)
+    if path is not None and not isinstance(path, Image.Image):
+        with open(path, 'rb') as f:
+            data = f.read()
+        image = Image.open(path)
+        image.load()
+        return image, hashlib.sha1(data).hexdigest()
+
+    image = getattr(source, '_cached_image', None)
+    if image is None:
+        raise ValueError(f"Unsupported texture source: {source!r}")
+    return image, hashlib.sha1(image.convert('RGBA').tobytes()).hexdigest()
+
+
+# Shader für Chunk-Meshes mit Atlas: u kodiert Slot und Kachel-Koordinate (siehe TILE_STRIDE),
+# fract() wiederholt die Kachel über gemergte Flächen. textureGrad nutzt die Ableitungen der
+# lokalen Koordinate, damit die Mip-Stufe an den Kachel-Sprüngen nicht springt.
+_ATLAS_VERTEX = f'''#version 140
+
+uniform mat4 p3d_ModelViewProjectionMatrix;
+in vec4 p3d_Vertex;
+in vec2 p3d_MultiTexCoord0;
+in vec4 p3d_Color;
+
+out vec2 tile_uv;
+flat out float tile_slot;
+out vec4 vertex_color;
+
+void main() {{
+    gl_Position = p3d_ModelViewProjectionMatrix * p3d_Vertex;
+    tile_slot = floor((p3d_MultiTexCoord0.x + 0.5) / {TILE_STRIDE}.0);
+    tile_uv = vec2(p3d_MultiTexCoord0.x - tile_slot * {TILE_STRIDE}.0, p3d_MultiTexCoord0.y);
+    vertex_color = p3d_Color;
+}}
+'''
+
+_ATLAS_FRAGMENT = '''#version 140
+
+uniform sampler2D p3d_Texture0;
+uniform vec4 p3d_ColorScale;
+uniform vec2 atlas_grid;   // Spalten, Zeilen
+uniform vec2 atlas_tile;   // Kachel- und Randbreite relativ zur Zelle
+
+in vec2 tile_uv;
+flat in float tile_slot;
+in vec4 vertex_color;
+out vec4 fragColor;
+
+void main() {
+    vec2 cell = vec2(mod(tile_slot, atlas_grid.x), floor(tile_slot / atlas_grid.x));
+    vec2 local = fract(tile_uv);
+    // Bild-Zeilen laufen von oben, v von unten
+    vec2 in_cell = vec2(atlas_tile.y + local.x * atlas_tile.x,
+                        atlas_tile.y + (1.0 - local.y) * atlas_tile.x);
+    vec2 uv = vec2((cell.x + in_cell.x) / atlas_grid.x, 1.0 - (cell.y + in_cell.y) / atlas_grid.y);
+    vec2 scale = atlas_tile.x / atlas_grid;
+    vec4 color = textureGrad(p3d_Texture0, uv, dFdx(tile_uv) * scale, dFdy(tile_uv) * scale);
+    fragColor = color * p3d_ColorScale * vertex_color;
+}
+'''
+
+_atlas_shader = None
+
+
+def get_atlas_shader():
+    """Ursina-Shader für Atlas-Meshes (erst nach dem Start der App erstellen)"""
+    global _atlas_shader
+    if _atlas_shader is None:
+        from ursina import Shader
+        _atlas_shader = Shader(name='atlas_shader', language=Shader.GLSL,
+                               vertex=_ATLAS_VERTEX, fragment=_ATLAS_FRAGMENT)
+    return _atlas_shader
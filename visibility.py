@@ -0,0 +1,166 @@
+"""Sichtbarkeits-Graph pro Section für Occlusion Culling
+
+Pro Section wird gespeichert, welche ihrer sechs Flächen sich durch Luft oder
+durchsichtige Blöcke gegenseitig sehen können. Eine BFS von der Section der
+Kamera durch diesen Graphen liefert die potentiell sichtbaren Sections -
+Chunks, die sie nicht erreicht, sind von festem Terrain verdeckt.
+"""
+from collections import deque
+
+import numpy as np
+
+from chunk_data import AIR
+
+# Flächen einer Section als Richtung (dx, dy, dz) - der Index ist die Flächen-Nummer
+FACES = ((-1, 0, 0), (1, 0, 0), (0, -1, 0), (0, 1, 0), (0, 0, -1), (0, 0, 1))
+OPPOSITE = (1, 0, 3, 2, 5, 4)
+
+# Verbindungen als Bitmaske: Bit a * 6 + b gesetzt = Fläche a sieht Fläche b
+ALL_CONNECTED = (1 << 36) - 1
+NONE_CONNECTED = 0
+
+
+def connects(mask, face_a, face_b):
+    return (mask >> (face_a * 6 + face_b)) & 1
+
+
+def section_connectivity(section, transparent):
+    """Verbindungs-Maske einer Section (Block-ID wenn einheitlich, sonst uint8 Array)
+
+    transparent ist eine Lookup-Tabelle Block-ID -> durchsichtig. Die offenen
+    Zellen werden in Zusammenhangskomponenten zerlegt (Minimum-Label
+    vektorisiert ausbreiten), jede Komponente verbindet alle Flächen, die sie
+    berührt.
+    """
+    if not isinstance(section, np.ndarray):
+        return ALL_CONNECTED if transparent[section] else NONE_CONNECTED
+    open_cells = transparent[section]
+    if not open_cells.any():
+        return NONE_CONNECTED
+    if open_cells.all():
+        return ALL_CONNECTED
+
+    closed = np.iinfo(np.int32).max
+    labels = np.where(open_cells, np.arange(open_cells.size, dtype=np.int32).reshape(open_cells.shape), closed)
+    while True:
+        previous = labels
+        labels = labels.copy()
+        for axis in range(3):
+            for shift in (1, -1):
+                neighbour = np.full_like(labels, closed)
+                source = [slice(None)] * 3
+                target = [slice(None)] * 3
+                source[axis] = slice(None, -1) if shift > 0 else slice(1, None)
+                target[axis] = slice(1, None) if shift > 0 else slice(None, -1)
+                neighbour[tuple(target)] = labels[tuple(source)]
+                np.minimum(labels, neighbour, out=labels, where=open_cells)
+        # Pointer-Jumping: Label des Label-Ursprungs übernehmen (schnellere Konvergenz)
+        flat = labels.ravel()
+        open_flat = open_cells.ravel()
+        flat[open_flat] = flat[flat[open_flat]]
+        if np.array_equal(labels, previous):
+            break
+
+    face_labels = []
+    for axis in range(3):
+        for layer in (0, -1):
+            index = [slice(None)] * 3
+            index[axis] = layer
+            face_open = open_cells[tuple(index)]
+            face_labels.append(set(np.unique(labels[tuple(index)][face_open]).tolist()))
+
+    mask = NONE_CONNECTED
+    for face_a in range(6):
+        for face_b in range(face_a, 6):
+            if face_labels[face_a] & face_labels[face_b]:
+                mask |= (1 << (face_a * 6 + face_b)) | (1 << (face_b * 6 + face_a))
+    return mask
+
+
+class VisibilityGraph:
+    """Verbindungs-Masken aller Sections der geladenen Chunks und die Sichtbarkeits-BFS
+
+    Die Masken werden beim Laden eines Chunks (update_chunk) und nach
+    Block-Änderungen (update_section) berechnet, nicht pro Frame.
+    Sections über einem Chunk gelten als Luft, unter ihm als fest.
+    """
+
+    def __init__(self, transparent_ids=()):
+        self.transparent = np.zeros(256, dtype=bool)
+        self.transparent[AIR] = True
+        self.transparent[list(transparent_ids)] = True
+        self.sections = {}  # chunk_key -> {section_index: Maske}
+
+    def update_chunk(self, chunk):
+        self.sections[chunk.key] = self.connectivity({index: chunk.get_section(index)
+                                                      for index in chunk.section_indices()})
+
+    @staticmethod
+    def snapshot(chunk):
+        """Kopie der Sections eines Chunks, damit connectivity in einem Worker-Thread laufen kann"""
+        sections = {}
+        for index in chunk.section_indices():
+            section = chunk.get_section(index)
+            sections[index] = section.copy() if isinstance(section, np.ndarray) else section
+        return sections
+
+    def connectivity(self, sections):
+        """Masken {section_index: Maske} für {section_index: Section} (liest keine Chunks)"""
+        return {index: section_connectivity(section, self.transparent) for index, section in sections.items()}
+
+    def set_chunk(self, chunk_key, masks):
+        self.sections[chunk_key] = masks
+
+    def update_section(self, chunk, index):
+        masks = self.sections.get(chunk.key)
+        if masks is not None and index in masks:
+            masks[index] = section_connectivity(chunk.get_section(index), self.transparent)
+
+    def remove_chunk(self, chunk_key):
+        self.sections.pop(chunk_key, None)
+
+    def clear(self):
+        self.sections.clear()
+
+    def _mask(self, chunk_key, index):
+        masks = self.sections[chunk_key]
+        mask = masks.get(index)
+        if mask is not None:
+            return mask
+        return ALL_CONNECTED if index > max(masks) else NONE_CONNECTED
+
+    def visible_sections(self, chunk_key, index):
+        """Potentiell sichtbare (chunk_key, section_index) von der Kamera-Section aus
+
+        BFS über die Nachbar-Sections: eine Section wird nur über eine Fläche
+        verlassen, die mit der Eintritts-Fläche verbunden ist, und nie in
+        eine Richtung entgegen einer schon gegangenen (der Blick kehrt nicht
+        um). Gibt None zurück, wenn der Chunk der Kamera nicht geladen ist
+        (dann wird nichts ausgeblendet).
+        """
+        if chunk_key not in self.sections:
+            return None
+        # Eine Reihe Himmel über dem höchsten Chunk, damit Blicke über Hügel gehen
+        top = max((max(masks) for masks in self.sections.values() if masks), default=index) + 1
+        # Kamera unter der Welt: von der untersten Section aus suchen
+        start = (chunk_key, max(min(index, top), min(self.sections[chunk_key], default=index)))
+        visited = {start}
+        queue = deque([(start, None, 0)])
+        while queue:
+            (current_key, current_index), entered, directions = queue.popleft()
+            mask = self._mask(current_key, current_index)
+            for face, (dx, dy, dz) in enumerate(FACES):
+                if directions & (1 << OPPOSITE[face]):
+                    continue
+                if entered is not None and not connects(mask, entered, face):
+                    continue
+                neighbour_key = (current_key[0] + dx, current_key[1] + dz)
+                neighbour_index = current_index + dy
+                if neighbour_key not in self.sections or neighbour_index > top:
+                    continue
+                node = (neighbour_key, neighbour_index)
+                if node in visited or (dy < 0 and neighbour_index < min(self.sections[neighbour_key], default=0)):
+                    continue
+                visited.add(node)
+                queue.append((node, OPPOSITE[face], directions | (1 << face)))
+        return visited
@@ -1,378 +1,1136 @@
+import os
 import random
 import math
 import time
-from collections import defaultdict
+from collections import defaultdict, namedtuple
+import numpy as np
 from ursina import *
-from block import BlockRegistry
+from block import BlockRegistry, Block, world_store
+from chunk_data import AIR, SECTION_HEIGHT, section_index
+from chunk_mesher import OVERFLOW, MeshWorker, build_section_meshes, prepare_sections
+from lighting import LightEngine
+from far_terrain import FarTerrain, LOD_RINGS
+from visibility import VisibilityGraph
+from chunk_loader import ChunkLoader, ProcessChunkLoader
+from scheduler import FrameScheduler
+from chunk_cache import ChunkRenderCache
+from region_store import RegionStore
+from metrics import metrics
+from texture_atlas import TILE_STRIDE, get_atlas_shader
+from terrain_generator import FastWorldGenerator
 
 
-class SimpleNoise:
-    """Einfache und schnelle Noise-Implementierung"""
-    
-    def __init__(self, seed=0):
-        random.seed(seed)
-        self.perm = [i for i in range(256)]
-        random.shuffle(self.perm)
-        self.perm *= 2
-    
-    def noise2d(self, x, z, scale=1.0):
-        """Einfache 2D Noise Funktion"""
-        x *= scale
-        z *= scale
-        
-        # Integer Koordinaten
-        xi = int(x) & 255
-        zi = int(z) & 255
-        
-        # Fractional Koordinaten
-        xf = x - int(x)
-        zf = z - int(z)
-        
-        # Fade Kurven
-        u = self._fade(xf)
-        v = self._fade(zf)
-        
-        # Hash Koordinaten
-        aa = self.perm[self.perm[xi] + zi]
-        ab = self.perm[self.perm[xi] + zi + 1]
-        ba = self.perm[self.perm[xi + 1] + zi]
-        bb = self.perm[self.perm[xi + 1] + zi + 1]
-        
-        # Interpolation
-        x1 = self._lerp(self._grad(aa, xf, zf), self._grad(ba, xf - 1, zf), u)
-        x2 = self._lerp(self._grad(ab, xf, zf - 1), self._grad(bb, xf - 1, zf - 1), u)
-        
-        return self._lerp(x1, x2, v)
-    
-    def _fade(self, t):
-        return t * t * t * (t * (t * 6 - 15) + 10)
-    
-    def _lerp(self, a, b, t):
-        return a + t * (b - a)
-    
-    def _grad(self, hash_val, x, z):
-        h = hash_val & 15
-        u = x if h < 8 else z
-        v = z if h < 4 else (x if h == 12 or h == 14 else 0)
-        return (u if (h & 1) == 0 else -u) + (v if (h & 2) == 0 else -v)
+class TerrainChunk(Entity):
+    """Ein Entity pro Chunk, darunter ein Geometrie-Node pro Section
+    
+    sections bildet den Section-Index (bzw. OVERFLOW) auf den Node ab. Ein
+    Edit ersetzt nur die Nodes der betroffenen Sections, der Rest des Chunks
+    bleibt hochgeladen. Kollision nur für nicht-walkthrough Blöcke
+    (Spieler-Physik). Abbauen und Platzieren läuft über
+    interaction.BlockInteraction.
+    """
+    
+    def __init__(self, chunk, chunk_manager=None):
+        super().__init__(
+            parent=scene,
+            # Zelle (x, y, z) belegt wie ein Block [x-0.5, x+0.5] x [y-1, y] x [z-0.5, z+0.5]
+            position=(chunk.world_x_start - 0.5, chunk.min_y - 1, chunk.world_z_start - 0.5)
+        )
+        self.chunk_key = chunk.key
+        self.chunk_manager = chunk_manager
+        self.chunk_data = chunk
+        self.sections = {}
+        self.section_bytes = {}
+        self.neighbour_keys = frozenset()
+        self.render_bytes = ChunkRenderer.ENTITY_BYTES
 
 
-class FastWorldGenerator:
-    """Optimierter World Generator - Einfach und Schnell"""
-    
-    # Block Typen
-    BLOCKS = {
-        'grass': 0,
-        'dirt': 1, 
-        'stone': 2,
-        'sand': 3,
-        'water': 4,
-        'wood': 5,
-        'leaves': 6
-    }
+class ChunkRenderer:
+    """Erzeugt aus ChunkData ein Chunk-Entity mit einem Mesh pro Section (getrennt von der Generierung)
     
-    # Biom Definitionen: [surface, subsurface, tree_chance, base_height, height_variation]
-    BIOMES = {
-        'plains': ['grass', 'dirt', 0.01, 5, 2],  # Reduzierte Werte für bessere Performance
-        'desert': ['sand', 'sand', 0.001, 4, 1], 
-        'hills': ['grass', 'stone', 0.005, 8, 3],
-        'mountains': ['stone', 'stone', 0.001, 12, 4]
-    }
+    Flüssigkeiten (liquid_names) landen in einem eigenen, halbtransparenten
+    Kind-Entity pro Section: gemergte Oberfläche plus freiliegende Seiten.
+    Das Terrain bleibt dadurch undurchsichtig.
+    """
     
-    def __init__(self, seed=None, chunk_size=8):  # Kleinere Chunks für bessere Performance
-        self.seed = seed or random.randint(0, 999999)
-        self.chunk_size = chunk_size
-        self.noise = SimpleNoise(self.seed)
-        
-        # Chunk Cache
-        self.chunk_cache = {}
-        self.max_cached_chunks = 25  # Reduziert für weniger Memory Usage
-        
-        print(f"World Generator initialized - Seed: {self.seed}, Chunk Size: {self.chunk_size}")
+    ENTITY_BYTES = 4096  # Geschätzter Overhead pro Entity (Node, Collider)
+    LIQUID_ALPHA = 0.7
     
-    def get_biome(self, x, z):
-        """Bestimmt Biom basierend auf Koordinaten"""
-        biome_noise = self.noise.noise2d(x, z, 0.005)
-        
-        if biome_noise < -0.3:
-            return 'desert'
-        elif biome_noise < 0.1:
-            return 'plains'
-        elif biome_noise < 0.4:
-            return 'hills'
-        else:
-            return 'mountains'
+    def __init__(self, block_names=None, ambient_occlusion=False, liquid_names=None):
+        self.block_names = block_names or FastWorldGenerator.BLOCK_NAMES
+        self.transparent_ids = [
+            block_id for block_id, name in self.block_names.items()
+            if BlockRegistry.is_walkthrough(name)
+        ]
+        if liquid_names is None:
+            liquid_names = FastWorldGenerator.LIQUID_BLOCKS
+        self.liquid_ids = [block_id for block_id, name in self.block_names.items() if name in liquid_names]
+        self.emission = {
+            block_id: BlockRegistry.get_light(name) for block_id, name in self.block_names.items()
+            if BlockRegistry.get_light(name)
+        }
+        self.ambient_occlusion = ambient_occlusion
+        # (Schlüssel, slots, colors) aus block_lookup - neu nur bei anderem Atlas oder Block-Set
+        self._lookup = None
     
-    def get_height(self, x, z):
-        """Berechnet Höhe für gegebene Koordinaten"""
-        biome = self.get_biome(x, z)
-        biome_data = self.BIOMES[biome]
+    def _padded_light(self, chunk, light):
+        if light is not None and light.is_lit(chunk.key):
+            return lambda index: light.padded_light(chunk.key, index)
+        return None
+    
+    def build_section_meshes(self, chunk, neighbours=None, sections=None, light=None):
+        """Headless: {section_index: ChunkMesh} für sections (None: alle plus OVERFLOW)"""
+        return build_section_meshes(chunk, self.transparent_ids, neighbours, sections,
+                                    self._padded_light(chunk, light), self.ambient_occlusion)
+    
+    def prepare_sections(self, chunk, neighbours=None, sections=None, light=None):
+        """Main-Thread Teil von build_section_meshes - das Meshen übernimmt ein MeshWorker"""
+        return prepare_sections(chunk, self.transparent_ids, neighbours, sections,
+                                self._padded_light(chunk, light), self.ambient_occlusion)
+    
+    def render(self, chunk, neighbours=None, chunk_manager=None):
+        """Erstellt das Chunk-Entity mit allen Section-Nodes und gibt es als Liste zurück"""
+        terrain = TerrainChunk(chunk, chunk_manager)
+        self.update(terrain, chunk, neighbours, chunk_manager)
+        return [terrain]
+    
+    def update(self, terrain, chunk, neighbours=None, chunk_manager=None, sections=None):
+        """Meshet sections (None: alle) neu und ersetzt nur deren Nodes"""
+        light = chunk_manager.light if chunk_manager is not None else None
+        with metrics.histogram('chunk.mesh_ms').time():
+            meshes = self.build_section_meshes(chunk, neighbours, sections, light)
+            prepared = {index: self.prepare_upload(section_mesh) for index, section_mesh in meshes.items()}
+        self.replace_sections(terrain, prepared, neighbour_key_set(chunk.key, neighbours))
+        return meshes
+    
+    def replace_sections(self, terrain, sections, neighbour_keys):
+        """Lädt vorbereitete Sections {index: PreparedSection} hoch (neighbour_keys: mit welchen Nachbarn gebaut)"""
+        for index, prepared in sections.items():
+            self.replace_section(terrain, index, prepared)
+        terrain.neighbour_keys = neighbour_keys
+    
+    def replace_section(self, terrain, index, prepared):
+        """Ersetzt den Geometrie-Node einer Section (leere Section: Node entfällt)
         
-        base_height = biome_data[3]
-        height_var = biome_data[4]
+        prepared kommt aus prepare_upload - hier werden nur noch Meshes und
+        Entities erstellt.
+        """
+        old = terrain.sections.pop(index, None)
+        if old is not None:
+            destroy(old)
+        terrain.section_bytes.pop(index, None)
         
-        # Einfachere Noise für bessere Performance
-        height_noise = self.noise.noise2d(x, z, 0.02)
+        if prepared.vertex_count:
+            node = Entity(parent=terrain)
+            node.section_index = index
+            for part in prepared.parts:
+                try:
+                    self._create_entity(node, part)
+                except Exception as e:
+                    print(f"Warning: Could not create {part.name} mesh for chunk {terrain.chunk_key}: {e}")
+            terrain.sections[index] = node
+            terrain.section_bytes[index] = prepared.render_bytes
+        terrain.render_bytes = self.ENTITY_BYTES + sum(terrain.section_bytes.values())
+        return terrain.sections.get(index)
+    
+    def prepare_upload(self, section_mesh):
+        """Thread-sicherer Teil des Hochladens: alle Kind-Entities einer Section als fertige Arrays
         
-        return int(base_height + height_noise * height_var)
+        Flüssigkeit, Collider und Atlas- bzw. Block-Teile werden hier
+        aufgeteilt und eingefärbt, der MeshWorker macht das gleich nach dem
+        Meshen. Im Main-Thread bleibt nur Mesh und Entity erstellen.
+        """
+        parts = []
+        liquid_mesh, solid_mesh = self.split_liquid(section_mesh)
+        if liquid_mesh.vertex_count:
+            parts.extend(self._liquid_parts(liquid_mesh))
+        if solid_mesh.vertex_count:
+            collider = self._collider_part(solid_mesh)
+            if collider is not None:
+                parts.append(collider)
+            if BlockRegistry.atlas is not None:
+                parts.append(self._atlas_part(solid_mesh))
+            else:
+                parts.extend(self._block_parts(solid_mesh))
+        render_bytes = self.estimate_bytes(section_mesh) if section_mesh.vertex_count else 0
+        return PreparedSection(parts, section_mesh.vertex_count, render_bytes)
     
-    def generate_chunk(self, chunk_x, chunk_z):
-        """Generiert einen einzelnen Chunk"""
-        chunk_key = (chunk_x, chunk_z)
+    def _create_entity(self, node, part):
+        """Main-Thread: Mesh und Entity aus einem UploadPart"""
+        entity_args = dict(part.entity)
+        if part.atlas:
+            BlockRegistry.atlas.bind(scene)
+            entity_args.update(texture=BlockRegistry.atlas.texture, shader=get_atlas_shader())
+        entity = Entity(parent=node, model=Mesh(**part.mesh), **entity_args)
+        if part.transparent:
+            entity.set_transparency(True)
+        return entity
+    
+    def split_liquid(self, chunk_mesh):
+        """Teilt ein Chunk-Mesh in (Flüssigkeits-Schicht, Rest)"""
+        is_liquid = np.isin(chunk_mesh.block_ids[::4], self.liquid_ids)
+        return (chunk_mesh.select_quads(np.nonzero(is_liquid)[0]),
+                chunk_mesh.select_quads(np.nonzero(~is_liquid)[0]))
+    
+    def estimate_bytes(self, chunk_mesh):
+        """Grobe Schätzung des Speichers eines gerenderten Chunks bzw. einer Section"""
+        # Position, UV, Normale als float32 pro Vertex + Indizes + Entity/Collider Overhead
+        return (chunk_mesh.vertex_count * 32 + chunk_mesh.triangle_count * 12
+                + self.ENTITY_BYTES * (1 + len(set(chunk_mesh.block_ids[::4].tolist()))))
+    
+    def _lookup_key(self):
+        atlas = BlockRegistry.atlas
+        return (id(atlas), atlas.version if atlas is not None else None,
+                tuple(id(BlockRegistry.get_block_info(name)) for name in self.block_names.values()))
+    
+    def block_lookup(self):
+        """Atlas-Slot und Farbe pro Block-ID als Arrays für Vektor-Lookups (nur lesen)
         
-        # Check Cache
-        if chunk_key in self.chunk_cache:
-            return self.chunk_cache[chunk_key]
+        Gecacht, bis sich der Atlas (version) oder die registrierten Blöcke
+        ändern - prepare_upload braucht die Tabelle für jede Section.
+        """
+        key = self._lookup_key()
+        lookup = self._lookup
+        if lookup is not None and lookup[0] == key:
+            return lookup[1], lookup[2]
+        slots = np.zeros(256, dtype=np.float32)
+        colors = np.ones((256, 4), dtype=np.float32)
+        for block_id, name in self.block_names.items():
+            block_data = BlockRegistry.get_block_info(name)
+            if block_data is None:
+                continue
+            slots[block_id] = BlockRegistry.get_atlas_slot(name) or 0
+            colors[block_id] = tuple(self._block_color(block_data))
+        slots.flags.writeable = False
+        colors.flags.writeable = False
+        # Ein Tupel zuweisen - MeshWorker-Threads sehen nie eine halbe Tabelle
+        self._lookup = (key, slots, colors)
+        return slots, colors
+    
+    def _atlas_mesh(self, chunk_mesh, alpha=None):
+        """Mesh-Arrays mit Atlas-UVs und Block-Farbe (mal gebackener Helligkeit) als Vertex-Farbe"""
+        slots, colors = self.block_lookup()
         
-        start_time = time.perf_counter()
-        blocks = []
+        uvs = chunk_mesh.uvs.copy()
+        uvs[:, 0] += slots[chunk_mesh.block_ids] * TILE_STRIDE
+        vertex_colors = colors[chunk_mesh.block_ids]
+        vertex_colors[:, :3] *= chunk_mesh.shades[:, None]
+        if alpha is not None:
+            vertex_colors[:, 3] *= alpha
+        return _flat_mesh(chunk_mesh, uvs, vertex_colors), vertex_colors
+    
+    def _atlas_part(self, chunk_mesh):
+        """Ein Entity für die ganze Section: alle Block-Typen über den Textur-Atlas"""
+        mesh, vertex_colors = self._atlas_mesh(chunk_mesh)
+        return UploadPart('atlas', mesh, {}, atlas=True, transparent=bool((vertex_colors[:, 3] < 1).any()))
+    
+    def _collider_part(self, chunk_mesh):
+        """Unsichtbares Kollisions-Mesh nur aus festen Blöcken (nur mit Collidern)"""
+        if not Block.colliders_enabled:
+            return None
+        solid = chunk_mesh.select_quads(np.nonzero(~np.isin(chunk_mesh.block_ids[::4], self.transparent_ids))[0])
+        if not solid.vertex_count:
+            return None
+        # MeshCollider liest die Vertices als Liste von Punkten, nicht als flachen Puffer
+        mesh = {'vertices': solid.vertices.tolist(), 'triangles': solid.triangles.tolist()}
+        return UploadPart('collider', mesh, {'collider': 'mesh', 'visible': False})
+    
+    def _liquid_parts(self, liquid_mesh):
+        """Halbtransparente Flüssigkeits-Schicht der Section (ohne Collider)
         
-        # World Koordinaten
-        world_x_start = chunk_x * self.chunk_size
-        world_z_start = chunk_z * self.chunk_size
+        Beidseitig gezeichnet, damit die Oberfläche auch von unter Wasser
+        sichtbar ist. Ohne Atlas bekommt jede Flüssigkeit ihre eigene Textur.
+        """
+        if BlockRegistry.atlas is not None:
+            mesh, _ = self._atlas_mesh(liquid_mesh, alpha=self.LIQUID_ALPHA)
+            return [UploadPart('liquid', mesh, {'double_sided': True}, atlas=True, transparent=True)]
         
-        # Batch-Generierung für bessere Performance
-        for local_x in range(self.chunk_size):
-            for local_z in range(self.chunk_size):
-                world_x = world_x_start + local_x
-                world_z = world_z_start + local_z
-                
-                column_blocks = self._generate_column(world_x, world_z)
-                blocks.extend(column_blocks)
-        
-        # Cache Management
-        if len(self.chunk_cache) >= self.max_cached_chunks:
-            # Entferne ältesten Chunk
-            oldest_key = next(iter(self.chunk_cache))
-            del self.chunk_cache[oldest_key]
-        
-        self.chunk_cache[chunk_key] = blocks
-        
-        gen_time = (time.perf_counter() - start_time) * 1000
-        print(f"Chunk ({chunk_x}, {chunk_z}) generated in {gen_time:.1f}ms - {len(blocks)} blocks")
-        
-        return blocks
-    
-    def _generate_column(self, x, z):
-        """Generiert eine vertikale Säule von Blöcken"""
-        blocks = []
-        height = self.get_height(x, z)
-        biome = self.get_biome(x, z)
-        biome_data = self.BIOMES[biome]
-        
-        surface_block = biome_data[0]
-        subsurface_block = biome_data[1]
-        tree_chance = biome_data[2]
-        
-        # Reduzierte Tiefe für bessere Performance
-        # Bedrock Layer
-        for y in range(-5, -3):
-            block = self._create_block('stone', x, y, z)
-            if block:
-                blocks.append(block)
-        
-        # Underground - nur bis zu einer bestimmten Tiefe
-        for y in range(-3, max(0, height - 1)):
-            # Einfachere Höhlen Logik
-            if y < 0 and self._is_simple_cave(x, y, z):
+        parts = []
+        for part in self._block_parts(liquid_mesh):
+            part.entity.update(alpha=self.LIQUID_ALPHA, double_sided=True)
+            parts.append(part._replace(name='liquid', transparent=True))
+        return parts
+    
+    def _block_color(self, block_data):
+        block_color = block_data['color']
+        if block_color is None:
+            if Block._default_color is None:
+                Block._default_color = color.color(0, 0, random.uniform(0.9, 1))
+            block_color = Block._default_color
+        return block_color
+    
+    def _block_parts(self, chunk_mesh):
+        """Ein Kind-Entity pro Block-Typ mit dessen Textur (Kollision über _collider_part)"""
+        parts = []
+        for block_id, part in chunk_mesh.split_by_block().items():
+            name = self.block_names[block_id]
+            block_data = BlockRegistry.get_block_info(name)
+            if block_data is None:
                 continue
-            block = self._create_block(subsurface_block, x, y, z)
-            if block:
-                blocks.append(block)
-        
-        # Surface
-        if height > 0:
-            block = self._create_block(surface_block, x, height - 1, z)
-            if block:
-                blocks.append(block)
-        
-        # Wasser (vereinfacht)
-        sea_level = 3
-        if height < sea_level:
-            for y in range(max(0, height), sea_level):
-                block = self._create_block('water', x, y, z)
-                if block:
-                    blocks.append(block)
-        
-        # Weniger Bäume für bessere Performance
-        if random.random() < tree_chance and height >= sea_level:
-            tree_blocks = self._generate_simple_tree(x, height, z)
-            blocks.extend(tree_blocks)
-        
-        return blocks
-    
-    def _is_simple_cave(self, x, y, z):
-        """Sehr einfache Höhlen Generation"""
-        if y >= 0 or y < -8:
-            return False
-        
-        cave_noise = self.noise.noise2d(x + y, z + y, 0.05)
-        return cave_noise > 0.7
-    
-    def _generate_simple_tree(self, x, base_y, z):
-        """Generiert einen einfachen Baum"""
-        tree_blocks = []
-        tree_height = random.randint(2, 4)  # Kleinere Bäume
-        
-        # Stamm
-        for y in range(base_y, base_y + tree_height):
-            block = self._create_block('wood', x, y, z)
-            if block:
-                tree_blocks.append(block)
-        
-        # Einfache Blätter
-        crown_y = base_y + tree_height - 1
-        for dx in [-1, 0, 1]:
-            for dz in [-1, 0, 1]:
-                if dx == 0 and dz == 0:
-                    continue
-                if random.random() < 0.6:
-                    block = self._create_block('leaves', x + dx, crown_y, z + dz)
-                    if block:
-                        tree_blocks.append(block)
-        
-        return tree_blocks
-    
-    def _create_block(self, block_type, x, y, z):
-        """Erstellt einen Block mit Error Handling"""
-        try:
-            if block_type in BlockRegistry.registry:
-                return BlockRegistry.create(block_type, position=(x, y, z))
-        except Exception as e:
-            print(f"Warning: Could not create block {block_type} at ({x}, {y}, {z}): {e}")
-        return None
+            vertex_colors = None
+            if part.is_shaded:
+                # Gebackenes Licht als Vertex-Farbe, die Block-Farbe kommt über color dazu
+                vertex_colors = np.ones((part.vertex_count, 4), dtype=np.float32)
+                vertex_colors[:, :3] = part.shades[:, None]
+            parts.append(UploadPart(name, _flat_mesh(part, part.uvs, vertex_colors), {
+                'texture': BlockRegistry.get_cached_texture(block_data['texture']),
+                'color': self._block_color(block_data)
+            }))
+        return parts
+
+
+# Ein Kind-Entity einer Section als fertige Argumente für Mesh und Entity,
+# atlas ergänzt im Main-Thread Atlas-Textur und -Shader
+UploadPart = namedtuple('UploadPart', ['name', 'mesh', 'entity', 'atlas', 'transparent'], defaults=(False, False))
+# Alle Kind-Entities einer Section plus Größe für Render-Cache und Statistik
+PreparedSection = namedtuple('PreparedSection', ['parts', 'vertex_count', 'render_bytes'])
+
+
+def neighbour_key_set(chunk_key, neighbours):
+    """Keys der Nachbarn aus {(dx, dz): ChunkData} - mit ihnen wurde ein Mesh gebaut"""
+    return frozenset((chunk_key[0] + dx, chunk_key[1] + dz) for dx, dz in (neighbours or {}))
+
+
+def _flat_mesh(chunk_mesh, uvs, vertex_colors=None):
+    """Argumente für ein Ursina-Mesh direkt aus den float32/uint32 Arrays (Upload ohne Python-Listen)"""
+    return {
+        'vertices': chunk_mesh.vertices.ravel(),
+        'triangles': chunk_mesh.triangles.astype(np.uint32).ravel(),
+        'uvs': np.ascontiguousarray(uvs, dtype=np.float32).ravel(),
+        'normals': chunk_mesh.normals.ravel(),
+        'colors': vertex_colors.ravel() if vertex_colors is not None else None
+    }
 
 
 class SimpleChunkManager:
-    """Einfacher Chunk Manager ohne komplexe Threading"""
+    """Einfacher Chunk Manager - Generierung optional im Hintergrund (ChunkLoader)"""
     
-    def __init__(self, world_generator, render_distance=2):  # Reduzierte Render Distance
+    def __init__(self, world_generator, render_distance=2, loader=None, scheduler=None,
+                 render_cache_bytes=8 * 1024 * 1024, unload_distance=None, view_bias=0.5,
+                 block_store=None, lighting=True, ambient_occlusion=True,
+                 lod_rings=LOD_RINGS, occlusion_culling=True, mesh_workers=1):  # Reduzierte Render Distance
         self.world_gen = world_generator
+        self.renderer = ChunkRenderer(ambient_occlusion=ambient_occlusion)
         self.render_distance = render_distance
+        # Hysterese: Entladen erst jenseits von unload_distance (> render_distance),
+        # damit Hin- und Herlaufen über eine Chunk-Grenze nicht ständig neu lädt
+        self.unload_distance = max(render_distance, unload_distance if unload_distance is not None
+                                   else render_distance + 1)
+        # 0 = reine Distanz, größer = Chunks in Blickrichtung werden früher geladen
+        self.view_bias = view_bias
+        self._player_chunk = None
+        self._player_position = (0.0, 0.0)
+        self._view_direction = None
+        self.loader = loader
+        self.scheduler = scheduler
         self.loaded_chunks = {}
         self.chunk_blocks = {}
+        self.chunks_needed = set()
+        
+        # Durch Block-Änderungen veraltete Meshes - ein Neubau-Job pro Chunk.
+        # chunk_key -> Set der veralteten Section-Indizes (None: ganzer Chunk)
+        self.dirty_chunks = {}
+        self._edited_chunks = set()
+        
+        # Mit Scheduler meshen mesh_workers Threads, der Main-Thread kopiert
+        # nur die Eingaben und lädt fertige Meshes hoch (integrate_meshes).
+        # Versionen pro Section verwerfen Ergebnisse, die inzwischen veraltet sind:
+        # chunk_key -> {section_index: Version der letzten Anforderung}
+        self.mesh_worker = None
+        if scheduler and mesh_workers:
+            self.mesh_worker = MeshWorker(self.renderer.transparent_ids, mesh_workers,
+                                          finish=self.renderer.prepare_upload)
+        self._mesh_versions = {}
+        self._mesh_version = 0
+        self._finished_meshes = {}  # chunk_key -> ({section_index: (Version, PreparedSection)}, neighbour_keys)
+        # Chunks, deren Licht-Job noch aussteht -> ob der Chunk danach selbst gemeshet wird
+        self._unlit_chunks = {}
+        # Section-Verbindungen im Worker: chunk_key -> seitdem editierte Section-Indizes
+        self._pending_connectivity = {}
+        
+        # Zweite Cache-Stufe: deaktivierte Render-Objekte nur nahe am Spieler
+        self.render_cache = ChunkRenderCache(
+            render_cache_bytes,
+            size_of=self._render_bytes,
+            on_evict=self._destroy_render_objects,
+            name='render'
+        )
+        self.render_cache_radius = self.unload_distance + 1
+        
+        # Laufende Summen statt Neuberechnung in get_stats()
+        self._chunk_block_counts = {}
+        self._blocks_gauge = metrics.gauge('world.blocks')
+        self._entities_gauge = metrics.gauge('world.entities')
+        self._blocks_gauge.set(0)
+        self._entities_gauge.set(0)
+        metrics.gauge('world.loaded_chunks', func=lambda: len(self.loaded_chunks))
+        metrics.gauge('world.pending_chunks', func=lambda: self.loader.get_stats()['pending'] if self.loader else 0)
+        metrics.gauge('world.pending_meshes', func=lambda: self.mesh_worker.pending if self.mesh_worker else 0)
+        metrics.gauge('cache.data.hit_rate', func=lambda: self.world_gen.chunk_cache.get_stats()['hit_rate'])
+        metrics.gauge('cache.data.bytes', func=lambda: self.world_gen.chunk_cache.current_bytes)
+        metrics.gauge('cache.render.hit_rate', func=lambda: self.render_cache.get_stats()['hit_rate'])
+        metrics.gauge('cache.render.bytes', func=lambda: self.render_cache.current_bytes)
+        if scheduler:
+            metrics.gauge('scheduler.queue_depth', func=lambda: scheduler.queue_depth)
+        
+        # WorldBlockStore: platzierte Blöcke, Index über Terrain und Platziertes
+        self.block_store = block_store
+        if block_store is not None:
+            block_store.attach_terrain(self)
+        
+        # Gebackenes Skylight/Block-Licht (None: Meshes ohne Licht)
+        self.light = None
+        if lighting:
+            self.light = LightEngine(self.loaded_chunks, world_generator.chunk_size,
+                                     self.renderer.transparent_ids, self.renderer.emission, block_store)
         
-        print(f"Chunk Manager initialized - Render distance: {render_distance}")
+        # Grobe Heightmap-Kacheln jenseits der vollen Chunks (None: keine Fernsicht)
+        self.far_terrain = FarTerrain(self, lod_rings) if lod_rings else None
+        
+        # Section-Verbindungen für Occlusion Culling (None: alle Chunks zeichnen)
+        self.visibility = VisibilityGraph(self.renderer.transparent_ids) if occlusion_culling else None
+        self._visibility_origin = None
+        self._visibility_dirty = True
+        self._visible_sections = None  # Letztes visible_sections (None: nichts ausblenden)
+        self._culled_sections = 0
+        metrics.gauge('world.culled_sections', func=lambda: self._culled_sections)
+        
+        print(f"Chunk Manager initialized - Render distance: {render_distance}, "
+              f"Async: {loader is not None}")
     
     def get_chunk_coords(self, world_x, world_z):
-        """Konvertiert World Koordinaten zu Chunk Koordinaten"""
-        return (int(world_x) // self.world_gen.chunk_size, 
-                int(world_z) // self.world_gen.chunk_size)
+        """Konvertiert World Koordinaten zu Chunk Koordinaten
+        
+        Über die Zelle (floor(v + 0.5)) wie WorldBlockStore.chunk_key - int()
+        würde negative Positionen zur Null hin abschneiden.
+        """
+        return (math.floor(world_x + 0.5) // self.world_gen.chunk_size,
+                math.floor(world_z + 0.5) // self.world_gen.chunk_size)
+    
+    def _load_priority(self, chunk_coords):
+        """Lade-Reihenfolge: Abstand zur Chunk-Mitte in Chunks, kleiner = früher
+        
+        Mit Blickrichtung zählt ein Chunk vor dem Spieler bis zu
+        (1 - view_bias) mal seinen Abstand, einer dahinter bis zu (1 + view_bias) mal.
+        """
+        player_x, player_z = self._player_position
+        view_direction = self._view_direction
+        size = self.world_gen.chunk_size
+        offset_x = ((chunk_coords[0] + 0.5) * size - player_x) / size
+        offset_z = ((chunk_coords[1] + 0.5) * size - player_z) / size
+        distance = math.hypot(offset_x, offset_z)
+        if view_direction is None or not self.view_bias or distance == 0:
+            return distance
+        view_x, view_z = view_direction
+        view_length = math.hypot(view_x, view_z)
+        if view_length == 0:
+            return distance
+        facing = (offset_x * view_x + offset_z * view_z) / (distance * view_length)
+        return distance * (1 - self.view_bias * facing)
+    
+    def _within_distance(self, chunk_coords, distance):
+        """Quadratischer Radius um den Chunk des Spielers (wie die Lade-Region)"""
+        if self._player_chunk is None:
+            return True
+        return (abs(chunk_coords[0] - self._player_chunk[0]) <= distance
+                and abs(chunk_coords[1] - self._player_chunk[1]) <= distance)
     
-    def update_around_player(self, player_x, player_z):
-        """Updated Chunks um den Spieler herum"""
+    def update_around_player(self, player_x, player_z, view_direction=None):
+        """Updated Chunks um den Spieler herum
+        
+        Fehlende Chunks werden nach _load_priority geladen bzw. angefordert,
+        die nächsten (und mit view_direction die sichtbaren) zuerst. Entladen
+        wird erst außerhalb von unload_distance.
+        Mit ChunkLoader blockiert der Aufruf nicht: fehlende Chunks werden
+        angefordert und fertige Chunks aus vorherigen Aufrufen eingebaut.
+        """
         player_chunk_x, player_chunk_z = self.get_chunk_coords(player_x, player_z)
+        self._player_chunk = (player_chunk_x, player_chunk_z)
+        self._player_position = (player_x, player_z)
+        self._view_direction = view_direction
         
-        chunks_needed = set()
         chunks_loaded = 0
         chunks_unloaded = 0
         
         # Bestimme benötigte Chunks
-        for dx in range(-self.render_distance, self.render_distance + 1):
-            for dz in range(-self.render_distance, self.render_distance + 1):
-                chunk_coords = (player_chunk_x + dx, player_chunk_z + dz)
-                chunks_needed.add(chunk_coords)
-                
-                # Lade Chunk falls nicht geladen
-                if chunk_coords not in self.loaded_chunks:
-                    self._load_chunk(*chunk_coords)
-                    chunks_loaded += 1
+        chunks_needed = {
+            (player_chunk_x + dx, player_chunk_z + dz)
+            for dx in range(-self.render_distance, self.render_distance + 1)
+            for dz in range(-self.render_distance, self.render_distance + 1)
+        }
+        self.chunks_needed = chunks_needed
+        
+        # Lade fehlende Chunks, nächste zuerst
+        missing = sorted((chunk_coords for chunk_coords in chunks_needed if chunk_coords not in self.loaded_chunks),
+                         key=self._load_priority)
+        for chunk_coords in missing:
+            if self.loader:
+                if not (self.scheduler and self.scheduler.is_scheduled(('load', chunk_coords))):
+                    self.loader.request(*chunk_coords)
+            else:
+                self._load_chunk(*chunk_coords)
+                chunks_loaded += 1
+        
+        self.render_cache.trim_to_radius((player_chunk_x, player_chunk_z), self.render_cache_radius)
+        
+        if self.loader:
+            # Spieler ist weitergezogen - wartende Aufträge verwerfen
+            self.loader.cancel_except(chunks_needed)
+            chunks_loaded += self._integrate_loaded_chunks()
         
         # Entlade weit entfernte Chunks
-        chunks_to_unload = []
         for chunk_coords in list(self.loaded_chunks.keys()):  # Copy keys to avoid modification during iteration
-            if chunk_coords not in chunks_needed:
-                chunks_to_unload.append(chunk_coords)
+            if not self._within_distance(chunk_coords, self.unload_distance):
+                if self._defer(self._unload_chunk_if_unneeded, chunk_coords,
+                               key=('unload', chunk_coords), priority=FrameScheduler.PRIORITY_LOW):
+                    chunks_unloaded += 1
         
-        for chunk_coords in chunks_to_unload:
-            self._unload_chunk(chunk_coords)
-            chunks_unloaded += 1
+        if self.far_terrain is not None:
+            self.far_terrain.update(self._player_chunk)
         
         return chunks_loaded, chunks_unloaded
     
+    def _defer(self, func, *args, key=None, priority=FrameScheduler.PRIORITY_NORMAL):
+        """Führt Main-Thread Arbeit über den Scheduler aus (ohne Scheduler sofort)"""
+        if self.scheduler:
+            return self.scheduler.schedule(func, *args, priority=priority, key=key)
+        func(*args)
+        return True
+    
+    def _integrate_loaded_chunks(self):
+        """Übernimmt fertig generierte Chunks aus dem Loader"""
+        integrated = 0
+        # Gleichzeitig fertige Chunks in Lade-Reihenfolge einbauen (Scheduler ist FIFO je Priorität)
+        finished = sorted(self.loader.drain(), key=lambda result: self._load_priority(result[0]))
+        for chunk_key, chunk, error in finished:
+            if chunk_key in self.loaded_chunks or chunk_key not in self.chunks_needed:
+                continue  # Inzwischen geladen oder nicht mehr benötigt
+            if error is not None:
+                print(f"Error loading chunk {chunk_key}: {error}")
+                metrics.counter('chunk.load_errors').inc()
+                self.loaded_chunks[chunk_key] = None
+                self.chunk_blocks[chunk_key] = []
+                continue
+            self._defer(self._add_chunk_if_needed, chunk_key, chunk,
+                        key=('load', chunk_key), priority=FrameScheduler.PRIORITY_HIGH)
+            integrated += 1
+        return integrated
+    
+    def _add_chunk_if_needed(self, chunk_key, chunk):
+        if chunk_key in self.chunks_needed and chunk_key not in self.loaded_chunks:
+            self._add_chunk(chunk_key, chunk)
+    
+    def _unload_chunk_if_unneeded(self, chunk_key):
+        """Entlädt einen Chunk und gibt den Nachbarn ihre Randflächen zurück"""
+        if self._within_distance(chunk_key, self.unload_distance):
+            return  # Spieler ist zurückgekommen
+        self._unload_chunk(chunk_key)
+        
+        for neighbour_key in self._neighbour_keys(chunk_key):
+            self.mark_dirty(neighbour_key, priority=FrameScheduler.PRIORITY_NORMAL)
+    
     def _load_chunk(self, chunk_x, chunk_z):
-        """Lädt einen einzelnen Chunk"""
+        """Lädt einen einzelnen Chunk (blockierend)"""
         chunk_key = (chunk_x, chunk_z)
         
         try:
-            blocks = self.world_gen.generate_chunk(chunk_x, chunk_z)
-            # Filtere None-Blöcke
-            valid_blocks = [block for block in blocks if block is not None]
-            
-            self.loaded_chunks[chunk_key] = True
-            self.chunk_blocks[chunk_key] = valid_blocks
+            chunk = self.world_gen.get_chunk(chunk_x, chunk_z)
+            self._add_chunk(chunk_key, chunk)
             
         except Exception as e:
             print(f"Error loading chunk ({chunk_x}, {chunk_z}): {e}")
-            self.loaded_chunks[chunk_key] = True
+            metrics.counter('chunk.load_errors').inc()
+            self.loaded_chunks[chunk_key] = None
             self.chunk_blocks[chunk_key] = []
     
+    def _add_chunk(self, chunk_key, chunk):
+        """Übernimmt einen generierten Chunk - Licht und Meshes folgen als eigene Jobs
+        
+        Hier wird nur registriert und ein (noch leeres) Chunk-Entity angelegt
+        bzw. aus dem Render-Cache reaktiviert. Sichtbarkeits-Graph und Licht
+        folgen als eigene Jobs, danach werden der Chunk und seine Nachbarn
+        über mark_dirty gemeshet.
+        """
+        start_time = time.perf_counter()
+        self.loaded_chunks[chunk_key] = chunk
+        neighbours = self._get_neighbours(chunk_key)
+        
+        if self.visibility is not None:
+            self._defer(self._update_chunk_visibility, chunk_key, key=('visibility', chunk_key),
+                        priority=FrameScheduler.PRIORITY_HIGH)
+        
+        cached = self.render_cache.get(chunk_key)
+        if cached is not None:
+            self.render_cache.pop(chunk_key)
+        if cached and all(getattr(entity, 'chunk_data', None) is chunk for entity in cached):
+            # Render-Objekte aus dem Cache wieder aktivieren
+            for entity in cached:
+                entity.enabled = True
+            self.chunk_blocks[chunk_key] = cached
+            
+            neighbour_keys = neighbour_key_set(chunk_key, neighbours)
+            remesh = any(entity.neighbour_keys != neighbour_keys for entity in cached)
+        else:
+            if cached:
+                self._destroy_render_objects(chunk_key, cached)
+            self.chunk_blocks[chunk_key] = [TerrainChunk(chunk, self)]
+            remesh = True
+        
+        if self.block_store is not None:
+            self.block_store.set_chunk_enabled(chunk_key, True)
+        if self.far_terrain is not None:
+            self.far_terrain.chunk_changed(chunk_key)
+        
+        block_count = chunk.block_count
+        self._chunk_block_counts[chunk_key] = block_count
+        self._blocks_gauge.inc(block_count)
+        self._entities_gauge.inc(len(self.chunk_blocks[chunk_key]))
+        metrics.counter('chunk.loaded').inc()
+        metrics.histogram('chunk.load_ms').observe((time.perf_counter() - start_time) * 1000)
+        
+        if self.light is not None:
+            self._unlit_chunks[chunk_key] = remesh
+            self._defer(self._light_chunk, chunk_key, key=('light', chunk_key),
+                        priority=FrameScheduler.PRIORITY_HIGH)
+        else:
+            self._mesh_loaded_chunk(chunk_key, remesh)
+    
+    def _update_chunk_visibility(self, chunk_key):
+        """Section-Verbindungen eines neu geladenen Chunks für das Occlusion Culling"""
+        chunk = self.loaded_chunks.get(chunk_key)
+        if chunk is None:
+            return  # Inzwischen entladen
+        if self.mesh_worker is None:
+            with metrics.histogram('world.connectivity_ms').time():
+                self.visibility.update_chunk(chunk)
+            self._visibility_dirty = True
+            return
+        # Im Worker auf einer Kopie, das Ergebnis übernimmt integrate_meshes
+        self._pending_connectivity[chunk_key] = set()
+        self.mesh_worker.run(chunk_key, self.visibility.connectivity, self.visibility.snapshot(chunk),
+                             tag=('visibility', chunk))
+    
+    def _set_connectivity(self, chunk_key, chunk, masks):
+        """Übernimmt die im Worker berechneten Masken, seitdem editierte Sections neu"""
+        edited = self._pending_connectivity.pop(chunk_key, None)
+        if edited is None or self.loaded_chunks.get(chunk_key) is not chunk:
+            return  # Inzwischen entladen
+        self.visibility.set_chunk(chunk_key, masks)
+        for index in edited:
+            self.visibility.update_section(chunk, index)
+        self._visibility_dirty = True
+    
+    def _light_chunk(self, chunk_key):
+        """Flutet das Licht eines neu geladenen Chunks und stößt danach das Meshen an"""
+        if chunk_key not in self._unlit_chunks:
+            return  # Schon von flush_dirty erledigt oder entladen
+        remesh = self._unlit_chunks.pop(chunk_key)
+        with metrics.histogram('light.flood_ms').time():
+            spilled = self.light.light_chunk(chunk_key)
+        # Der Chunk und seine direkten Nachbarn werden ohnehin neu gebaut,
+        # weiter entfernte nur, wenn Licht bis zu ihnen durchgesickert ist
+        near = set(self._neighbour_keys(chunk_key)) | {chunk_key}
+        for lit_key, sections in spilled.items():
+            if lit_key not in near:
+                self.mark_dirty(lit_key, sections, priority=FrameScheduler.PRIORITY_NORMAL)
+        self._mesh_loaded_chunk(chunk_key, remesh)
+    
+    def _mesh_loaded_chunk(self, chunk_key, remesh=True):
+        """Meshet einen neuen Chunk (remesh) und die Randflächen seiner Nachbarn"""
+        if remesh:
+            self.mark_dirty(chunk_key, priority=FrameScheduler.PRIORITY_HIGH)
+        # Randflächen der Nachbarn sind jetzt verdeckt
+        for neighbour_key in self._neighbour_keys(chunk_key):
+            self.mark_dirty(neighbour_key, priority=FrameScheduler.PRIORITY_NORMAL)
+    
+    def _neighbour_keys(self, chunk_key):
+        chunk_x, chunk_z = chunk_key
+        return [(chunk_x + dx, chunk_z + dz) for dx, dz in ((-1, 0), (1, 0), (0, -1), (0, 1))]
+    
+    def _get_neighbours(self, chunk_key):
+        """Geladene Nachbar-ChunkData als {(dx, dz): ChunkData}"""
+        neighbours = {}
+        for neighbour_key in self._neighbour_keys(chunk_key):
+            neighbour = self.loaded_chunks.get(neighbour_key)
+            if neighbour is not None:
+                neighbours[(neighbour_key[0] - chunk_key[0], neighbour_key[1] - chunk_key[1])] = neighbour
+        return neighbours
+    
+    def _rebuild_chunk(self, chunk_key, priority=FrameScheduler.PRIORITY_HIGH, wait=False):
+        """Baut die als dirty markierten Sections eines geladenen Chunks neu
+        
+        Nur deren Geometrie-Nodes werden ersetzt, die übrigen Sections
+        bleiben hochgeladen. None in dirty_chunks (z.B. Nachbar geladen)
+        baut alle Sections neu. Mit MeshWorker werden hier nur die
+        Eingaben kopiert, hochgeladen wird in _upload_meshes mit priority;
+        wait=True baut sofort im Main-Thread.
+        """
+        if chunk_key not in self.dirty_chunks:
+            return  # Schon von flush_dirty erledigt
+        sections = self.dirty_chunks.pop(chunk_key)
+        chunk = self.loaded_chunks.get(chunk_key)
+        entities = self.chunk_blocks.get(chunk_key)
+        if chunk is None or not entities:
+            return
+        neighbours = self._get_neighbours(chunk_key)
+        
+        if self.mesh_worker is None or wait:
+            meshes = self.renderer.update(entities[0], chunk, neighbours, self, sections)
+            # Laufende bzw. noch nicht hochgeladene Worker-Ergebnisse dieser Sections sind jetzt veraltet
+            versions = self._mesh_versions.get(chunk_key, {})
+            finished, _ = self._finished_meshes.get(chunk_key, ({}, None))
+            for index in meshes:
+                versions.pop(index, None)
+                finished.pop(index, None)
+            if self.visibility is not None:
+                self._apply_section_visibility(chunk_key)
+            metrics.counter('chunk.rebuilt').inc()
+            return
+        
+        with metrics.histogram('chunk.mesh_prepare_ms').time():
+            inputs = self.renderer.prepare_sections(chunk, neighbours, sections, self.light)
+        self._mesh_version += 1
+        versions = self._mesh_versions.setdefault(chunk_key, {})
+        for index in inputs:
+            versions[index] = self._mesh_version
+        self.mesh_worker.submit(chunk_key, inputs,
+                                ('mesh', self._mesh_version, neighbour_key_set(chunk_key, neighbours), priority))
+    
+    def integrate_meshes(self):
+        """Übernimmt fertige Ergebnisse aus dem MeshWorker (einmal pro Frame aufrufen)
+        
+        Meshes werden über einen Job ('upload', chunk_key) pro Chunk mit der
+        Priorität des Neubaus hochgeladen, Section-Verbindungen direkt
+        übernommen. Gibt die Anzahl der Ergebnisse zurück.
+        """
+        if self.mesh_worker is None:
+            return 0
+        finished = self.mesh_worker.drain()
+        for chunk_key, tag, result, error in finished:
+            if error is not None:
+                print(f"Error meshing chunk {chunk_key}: {error}")
+                metrics.counter('chunk.mesh_errors').inc()
+                if tag[0] == 'visibility':
+                    self._pending_connectivity.pop(chunk_key, None)
+            elif tag[0] == 'visibility':
+                self._set_connectivity(chunk_key, tag[1], result)
+            else:
+                self._accept_meshes(chunk_key, result, *tag[1:])
+        return len(finished)
+    
+    def _accept_meshes(self, chunk_key, meshes, version, neighbour_keys, priority):
+        """Merkt aktuelle Section-Meshes zum Hochladen vor (veraltete Versionen entfallen)"""
+        versions = self._mesh_versions.get(chunk_key, {})
+        current = {index: (version, mesh) for index, mesh in meshes.items() if versions.get(index) == version}
+        if not current:
+            return  # Inzwischen neu angefordert oder entladen
+        pending, _ = self._finished_meshes.get(chunk_key, ({}, None))
+        pending.update(current)
+        self._finished_meshes[chunk_key] = (pending, neighbour_keys)
+        self._defer(self._upload_meshes, chunk_key, key=('upload', chunk_key), priority=priority)
+    
+    def _upload_meshes(self, chunk_key):
+        """Lädt die fertigen Section-Meshes eines Chunks hoch (nur Mesh und Entity erstellen)"""
+        if chunk_key not in self._finished_meshes:
+            return
+        finished, neighbour_keys = self._finished_meshes.pop(chunk_key)
+        entities = self.chunk_blocks.get(chunk_key)
+        if not finished or not entities:
+            return
+        with metrics.histogram('chunk.upload_ms').time():
+            self.renderer.replace_sections(entities[0], {index: mesh for index, (_, mesh) in finished.items()},
+                                           neighbour_keys)
+        # Erledigt, außer die Section wurde inzwischen erneut angefordert
+        versions = self._mesh_versions.get(chunk_key, {})
+        for index, (version, _) in finished.items():
+            if versions.get(index) == version:
+                del versions[index]
+        if self.visibility is not None:
+            self._apply_section_visibility(chunk_key)
+        metrics.counter('chunk.rebuilt').inc()
+    
+    def _save_chunk(self, chunk_key):
+        """Speichert einen editierten Chunk (kompaktiert) im Region-Store"""
+        if chunk_key not in self._edited_chunks:
+            return
+        self._edited_chunks.discard(chunk_key)
+        chunk = self.loaded_chunks.get(chunk_key)
+        if chunk is None:
+            return
+        chunk.compact()
+        if self.world_gen.store:
+            self.world_gen.store.save_async(chunk)
+    
+    def get_block(self, x, y, z):
+        """Block-ID an einer Welt-Position (AIR wenn nicht geladen)"""
+        chunk = self.loaded_chunks.get(self.get_chunk_coords(x, z))
+        if chunk is None:
+            return AIR
+        return chunk.get_block(x, y, z)
+    
+    def set_block(self, x, y, z, block_id):
+        """Ändert einen Block im Terrain und baut betroffene Meshes neu"""
+        chunk_key = self.get_chunk_coords(x, z)
+        chunk = self.loaded_chunks.get(chunk_key)
+        if chunk is None or not chunk.contains(x, y, z):
+            return False
+        
+        old_id = chunk.get_block(x, y, z)
+        chunk.set_block(x, y, z, block_id)
+        self.relight(x, y, z)
+        if self.visibility is not None:
+            self.visibility.update_section(chunk, section_index(y))
+            if chunk_key in self._pending_connectivity:
+                self._pending_connectivity[chunk_key].add(section_index(y))
+            self._visibility_dirty = True
+        delta = (block_id != AIR) - (old_id != AIR)
+        if delta:
+            self._chunk_block_counts[chunk_key] = self._chunk_block_counts.get(chunk_key, 0) + delta
+            self._blocks_gauge.inc(delta)
+        metrics.counter('world.block_edits').inc()
+        self._edited_chunks.add(chunk_key)
+        self._defer(self._save_chunk, chunk_key, key=('save', chunk_key), priority=FrameScheduler.PRIORITY_LOW)
+        
+        # Section des Blocks, an Section-Grenzen auch die darüber/darunter
+        section = section_index(y)
+        sections = {section}
+        if y % SECTION_HEIGHT == 0:
+            sections.add(section - 1)
+        elif y % SECTION_HEIGHT == SECTION_HEIGHT - 1:
+            sections.add(section + 1)
+        self.mark_dirty(chunk_key, sections)
+        
+        # Block am Rand: Nachbar-Chunk sieht jetzt ggf. eine neue Fläche
+        local_x = x - chunk.world_x_start
+        local_z = z - chunk.world_z_start
+        size = chunk.size
+        if local_x == 0:
+            self.mark_dirty((chunk_key[0] - 1, chunk_key[1]), {section})
+        elif local_x == size - 1:
+            self.mark_dirty((chunk_key[0] + 1, chunk_key[1]), {section})
+        if local_z == 0:
+            self.mark_dirty((chunk_key[0], chunk_key[1] - 1), {section})
+        elif local_z == size - 1:
+            self.mark_dirty((chunk_key[0], chunk_key[1] + 1), {section})
+        return True
+    
+    def relight(self, x, y, z):
+        """Berechnet das Licht um eine geänderte Zelle neu und merkt die betroffenen Sections vor"""
+        if self.light is None:
+            return
+        with metrics.histogram('light.relight_ms').time():
+            dirty = self.light.update_block(x, y, z)
+        for chunk_key, sections in dirty.items():
+            self.mark_dirty(chunk_key, sections)
+    
+    def mark_dirty(self, chunk_key, sections=None, priority=FrameScheduler.PRIORITY_HIGH):
+        """Merkt Sections eines Chunks zum Neubau vor (sections=None: ganzer Chunk)
+        
+        Mit Scheduler gibt es einen Job ('rebuild', chunk_key) pro Chunk -
+        schnelles Bauen kostet pro Chunk und Frame höchstens einen Neubau, und
+        das Frame-Budget greift zwischen den Chunks. Ohne Scheduler wird
+        sofort neu gebaut.
+        """
+        if self.loaded_chunks.get(chunk_key) is None:
+            return
+        if sections is None:
+            self.dirty_chunks[chunk_key] = None
+        elif chunk_key not in self.dirty_chunks:
+            self.dirty_chunks[chunk_key] = set(sections)
+        elif self.dirty_chunks[chunk_key] is not None:
+            self.dirty_chunks[chunk_key].update(sections)
+        self._defer(self._rebuild_chunk, chunk_key, priority, key=('rebuild', chunk_key), priority=priority)
+    
+    def flush_dirty(self):
+        """Baut alle als dirty markierten Chunks sofort neu und speichert geänderte Chunks
+        
+        Ausstehende Licht-Jobs laufen vorher, gebaut wird im Main-Thread.
+        """
+        for chunk_key in list(self._unlit_chunks):
+            if self.scheduler:
+                self.scheduler.cancel(('light', chunk_key))
+            self._light_chunk(chunk_key)
+        
+        dirty = list(self.dirty_chunks)
+        for chunk_key in dirty:
+            if self.scheduler:
+                self.scheduler.cancel(('rebuild', chunk_key))
+            self._rebuild_chunk(chunk_key, wait=True)
+        
+        for chunk_key in list(self._edited_chunks):
+            if self.scheduler:
+                self.scheduler.cancel(('save', chunk_key))
+            self._save_chunk(chunk_key)
+        if dirty:
+            metrics.histogram('chunk.remesh_batch', buckets=(1, 2, 3, 4, 5, 8, 16)).observe(len(dirty))
+        return len(dirty)
+    
     def _unload_chunk(self, chunk_coords):
-        """Entlädt einen Chunk"""
+        """Entlädt einen Chunk
+        
+        Die Render-Objekte werden deaktiviert und im Render-Cache behalten,
+        damit ein schneller Rückweg sie wiederverwenden kann.
+        """
         try:
+            # Mesh mit noch nicht übernommenen Änderungen nicht cachen
+            stale = (chunk_coords in self.dirty_chunks or chunk_coords in self._unlit_chunks
+                     or bool(self._mesh_versions.get(chunk_coords)))
+            self.dirty_chunks.pop(chunk_coords, None)
+            self._unlit_chunks.pop(chunk_coords, None)
+            self._mesh_versions.pop(chunk_coords, None)
+            self._finished_meshes.pop(chunk_coords, None)
+            self._pending_connectivity.pop(chunk_coords, None)
+            self._save_chunk(chunk_coords)
+            
             if chunk_coords in self.chunk_blocks:
-                # Zerstöre alle Blöcke
-                for block in self.chunk_blocks[chunk_coords]:
-                    if block and hasattr(block, 'enabled'):
-                        try:
-                            destroy(block)
-                        except:
-                            pass  # Ignore destruction errors
-                del self.chunk_blocks[chunk_coords]
+                entities = self.chunk_blocks.pop(chunk_coords)
+                self._entities_gauge.dec(len(entities))
+                if entities and not stale and self.loaded_chunks.get(chunk_coords) is not None:
+                    for entity in entities:
+                        entity.enabled = False
+                    self.render_cache.put(chunk_coords, entities)
+                else:
+                    self._destroy_render_objects(chunk_coords, entities)
+            
+            if self.block_store is not None:
+                self.block_store.set_chunk_enabled(chunk_coords, False)
+            if self.light is not None:
+                self.light.remove_chunk(chunk_coords)
+            if self.visibility is not None:
+                self.visibility.remove_chunk(chunk_coords)
+                self._visibility_dirty = True
             
             if chunk_coords in self.loaded_chunks:
                 del self.loaded_chunks[chunk_coords]
+                if self.far_terrain is not None:
+                    self.far_terrain.chunk_changed(chunk_coords)
+                self._blocks_gauge.dec(self._chunk_block_counts.pop(chunk_coords, 0))
+                metrics.counter('chunk.unloaded').inc()
                 
         except Exception as e:
             print(f"Error unloading chunk {chunk_coords}: {e}")
     
+    def update_visibility(self, camera_position):
+        """Blendet Sections aus, die von der Kamera-Section aus verdeckt sind (günstig pro Frame)
+        
+        Jede Section hat ihren eigenen Geometrie-Node, ausgeblendet wird also
+        pro (chunk_key, section_index) aus visible_sections - auch Höhlen und
+        der Untergrund eines sichtbaren Chunks. Neu gerechnet wird nur, wenn
+        die Kamera die Section wechselt oder sich Chunks bzw. Sections
+        geändert haben. Gibt die Anzahl der ausgeblendeten Sections zurück.
+        """
+        if self.visibility is None:
+            return 0
+        x, y, z = camera_position
+        # Zelle y reicht von y - 1 bis y
+        cell_y = math.floor(y) + 1
+        chunk_key = self.get_chunk_coords(x, z)
+        origin = (chunk_key, section_index(cell_y))
+        if origin == self._visibility_origin and not self._visibility_dirty:
+            return self._culled_sections
+        self._visibility_origin = origin
+        self._visibility_dirty = False
+        
+        with metrics.histogram('world.visibility_ms').time():
+            self._visible_sections = self.visibility.visible_sections(*origin)
+        self._culled_sections = sum(self._apply_section_visibility(entity_chunk_key)
+                                    for entity_chunk_key in self.chunk_blocks)
+        return self._culled_sections
+    
+    def _apply_section_visibility(self, chunk_key):
+        """Blendet die Section-Nodes eines Chunks nach dem letzten visible_sections ein oder aus
+        
+        Auch für frisch hochgeladene Nodes, ohne die BFS neu zu rechnen.
+        Chunks ohne Verbindungs-Masken (noch nicht berechnet) bleiben ganz
+        sichtbar, ebenso der OVERFLOW-Node. Gibt die Anzahl ausgeblendeter Nodes zurück.
+        """
+        visible = self._visible_sections
+        known = visible is not None and chunk_key in self.visibility.sections
+        hidden = 0
+        for entity in self.chunk_blocks.get(chunk_key, ()):
+            for index, node in getattr(entity, 'sections', {}).items():
+                shown = not known or index == OVERFLOW or (chunk_key, index) in visible
+                if node.visible != shown:
+                    node.visible = shown
+                hidden += not shown
+        return hidden
+    
+    def _destroy_render_objects(self, chunk_coords, entities):
+        """Zerstört die Entities eines Chunks (auch on_evict des Render-Caches)"""
+        for entity in entities:
+            if entity and hasattr(entity, 'enabled'):
+                try:
+                    destroy(entity)
+                except:
+                    pass  # Ignore destruction errors
+    
+    def _render_bytes(self, entities):
+        return sum(getattr(entity, 'render_bytes', ChunkRenderer.ENTITY_BYTES) for entity in entities)
+    
     def generate_spawn_area(self, spawn_x=0, spawn_z=0, radius=1):
         """Generiert Spawn Bereich"""
         spawn_chunk_x, spawn_chunk_z = self.get_chunk_coords(spawn_x, spawn_z)
         
         print(f"Generating spawn area around chunk ({spawn_chunk_x}, {spawn_chunk_z})")
         
+        chunk_keys = [(spawn_chunk_x + dx, spawn_chunk_z + dz)
+                      for dx in range(-radius, radius + 1)
+                      for dz in range(-radius, radius + 1)]
+        
+        # Mit Loader parallel vorgenerieren, gerendert wird danach im Main-Thread
+        pregenerated = self.loader.generate_batch(chunk_keys) if self.loader else {}
+        
         chunks_generated = 0
-        for dx in range(-radius, radius + 1):
-            for dz in range(-radius, radius + 1):
-                chunk_x = spawn_chunk_x + dx
-                chunk_z = spawn_chunk_z + dz
+        for chunk_x, chunk_z in chunk_keys:
+            chunk = pregenerated.get((chunk_x, chunk_z))
+            if chunk is not None:
+                self._add_chunk((chunk_x, chunk_z), chunk)
+            else:
                 self._load_chunk(chunk_x, chunk_z)
-                chunks_generated += 1
-                
-                # Progress Update
-                if chunks_generated % 2 == 0:
-                    print(f"Generating spawn chunks: {chunks_generated}/{(radius * 2 + 1) ** 2}")
+            chunks_generated += 1
+            
+            # Progress Update
+            if chunks_generated % 2 == 0:
+                print(f"Generating spawn chunks: {chunks_generated}/{len(chunk_keys)}")
         
+        # Licht und Meshes des Spawns nicht erst über den Scheduler
+        self.flush_dirty()
         print(f"Spawn area generated: {chunks_generated} chunks loaded")
     
+    def is_loaded_at(self, x, z):
+        """Prüft ob der Chunk unter einer Welt-Position geladen ist"""
+        block_x = math.floor(x + 0.5)
+        block_z = math.floor(z + 0.5)
+        return self.loaded_chunks.get(self.get_chunk_coords(block_x, block_z)) is not None
+    
     def get_height_at(self, x, z):
-        """Gibt Höhe an Position zurück"""
-        return self.world_gen.get_height(x, z)
+        """Gibt die Terrain-Höhe an Position zurück
+        
+        Für geladene Chunks ein Lookup in der Heightmap, sonst per Noise.
+        """
+        # Block-Zelle: ein Block bei (bx, bz) reicht von bx - 0.5 bis bx + 0.5
+        block_x = math.floor(x + 0.5)
+        block_z = math.floor(z + 0.5)
+        chunk = self.loaded_chunks.get(self.get_chunk_coords(block_x, block_z))
+        if chunk is not None:
+            height = chunk.get_height(block_x, block_z)
+            if height is not None:
+                return height
+        return self.world_gen.get_height(block_x, block_z)
+    
+    def get_heights_at(self, xs, zs):
+        """Gibt Höhen für ein ganzes Gitter zurück (Form: len(xs) x len(zs))"""
+        return self.world_gen.get_height_grid(xs, zs)
+    
+    def find_spawn(self, x=0, z=0, radius=16):
+        """Sucht die nächste trockene Säule um (x, z) und gibt (x, z, Höhe) zurück
+    
+        Alle Höhen im Suchquadrat kommen aus einem get_heights_at Aufruf.
+        Liegt alles unter dem Meeresspiegel, bleibt es bei (x, z).
+        """
+        xs = np.arange(x - radius, x + radius + 1)
+        zs = np.arange(z - radius, z + radius + 1)
+        heights = self.get_heights_at(xs, zs)
+        distances = (xs[:, None] - x) ** 2 + (zs[None, :] - z) ** 2
+        distances = np.where(heights >= self.world_gen.SEA_LEVEL, distances, np.iinfo(np.int64).max)
+        i, j = np.unravel_index(np.argmin(distances), distances.shape)
+        if heights[i, j] < self.world_gen.SEA_LEVEL:
+            return x, z, self.get_height_at(x, z)
+        return int(xs[i]), int(zs[j]), int(heights[i, j])
+    
+    def shutdown(self):
+        """Beendet die Hintergrund-Generierung und entfernt alle Chunks aus der Szene
+        
+        Editierte Chunks werden beim Entladen noch gespeichert, danach wird
+        der Region-Store geschlossen.
+        """
+        if self.loader:
+            self.loader.shutdown()
+        if self.mesh_worker is not None:
+            self.mesh_worker.shutdown()
+        # Ohne Fern-Terrain - sonst baut jedes Entladen seine LOD-Kachel neu
+        far_terrain, self.far_terrain = self.far_terrain, None
+        for chunk_key in list(self.loaded_chunks):
+            self._unload_chunk(chunk_key)
+        self.render_cache.clear()
+        if far_terrain is not None:
+            far_terrain.clear()
+        if self.world_gen.store:
+            self.world_gen.store.close()
     
     def get_stats(self):
-        """Gibt Statistiken zurück"""
-        total_blocks = sum(len(blocks) for blocks in self.chunk_blocks.values())
+        """Gibt Statistiken zurück (Summen werden laufend mitgezählt)"""
         return {
             'loaded_chunks': len(self.loaded_chunks),
-            'total_blocks': total_blocks,
+            'total_blocks': self._blocks_gauge.value,
+            'total_entities': self._entities_gauge.value,
             'render_distance': self.render_distance,
+            'unload_distance': self.unload_distance,
+            'pending_chunks': self.loader.get_stats()['pending'] if self.loader else 0,
+            'pending_meshes': self.mesh_worker.pending if self.mesh_worker is not None else 0,
+            'scheduled_jobs': self.scheduler.queue_depth if self.scheduler else 0,
+            'dirty_chunks': len(self.dirty_chunks),
+            'light': self.light.get_stats() if self.light is not None else None,
+            'lod': self.far_terrain.get_stats() if self.far_terrain is not None else None,
+            'culled_sections': self._culled_sections,
+            'cache': {
+                'data': self.world_gen.chunk_cache.get_stats(),
+                'render': self.render_cache.get_stats()
+            },
+            'store': self.world_gen.store.get_stats() if self.world_gen.store else None,
             'seed': self.world_gen.seed
         }
 
 
 # Factory Functions für einfache Verwendung
-def create_world_generator(seed=None, chunk_size=8, render_distance=2):
-    """Erstellt einen optimierten World Generator"""
-    world_gen = FastWorldGenerator(seed, chunk_size)
-    chunk_manager = SimpleChunkManager(world_gen, render_distance)
+def create_world_generator(seed=None, chunk_size=8, render_distance=2, async_loading=True, workers=None,
+                           scheduler=None, use_processes=False, world_dir=None, deterministic=True,
+                           unload_distance=None, block_store=world_store, density_caves=True,
+                           lighting=True, ambient_occlusion=True, lod_rings=LOD_RINGS, occlusion_culling=True,
+                           mesh_workers=1):
+    """Erstellt einen optimierten World Generator
+    
+    Mit async_loading generieren workers Hintergrund-Threads die Chunks,
+    mit use_processes stattdessen Worker-Prozesse (Standard: alle Kerne - 1).
+    Mit scheduler (FrameScheduler) wird Rendern und Entladen auf Frames verteilt.
+    Mit world_dir werden Chunks unter world_dir/<seed> in Region-Dateien gespeichert.
+    deterministic=False schaltet auf die alte, reihenfolgeabhängige Baum-Generierung.
+    density_caves=False schaltet auf die alten 2D-Noise Höhlen.
+    unload_distance (Standard: render_distance + 1) verhindert Neuladen an Chunk-Grenzen.
+    block_store (Standard: der globale WorldBlockStore) bekommt das Terrain angehängt.
+    lighting backt Skylight/Block-Licht (LightEngine) in die Chunk-Meshes,
+    ambient_occlusion zusätzlich Vertex-AO.
+    lod_rings ((Abstand in Chunks, Abtast-Schritt), ...) zeigt jenseits der
+    vollen Chunks grobes Heightmap-Terrain (FarTerrain), None schaltet es ab.
+    occlusion_culling blendet über den Section-Sichtbarkeits-Graphen verdeckte
+    Sections aus (SimpleChunkManager.update_visibility pro Frame aufrufen).
+    Mit scheduler meshen mesh_workers Threads die Sections, fertige Meshes
+    holt SimpleChunkManager.integrate_meshes pro Frame ab (0: im Main-Thread).
+    """
+    world_gen = FastWorldGenerator(seed, chunk_size, deterministic=deterministic, density_caves=density_caves)
+    if world_dir:
+        world_gen.store = RegionStore(os.path.join(world_dir, str(world_gen.seed)), world_gen.seed, chunk_size,
+                                      generator=world_gen.generator_options())
+    
+    loader = None
+    if use_processes:
+        loader = ProcessChunkLoader(world_gen, workers)
+    elif async_loading:
+        loader = ChunkLoader(world_gen, workers or 2)
+    chunk_manager = SimpleChunkManager(world_gen, render_distance, loader, scheduler,
+                                       unload_distance=unload_distance, block_store=block_store,
+                                       lighting=lighting, ambient_occlusion=ambient_occlusion,
+                                       lod_rings=lod_rings, occlusion_culling=occlusion_culling,
+                                       mesh_workers=mesh_workers)
     return chunk_manager
 
 def update_world_around_player(chunk_manager, player):
     """Updated die Welt um den Spieler"""
     try:
         if hasattr(player, 'position'):
-            return chunk_manager.update_around_player(player.x, player.z)
+            forward = getattr(player, 'forward', None)
+            view_direction = (forward.x, forward.z) if forward is not None else None
+            return chunk_manager.update_around_player(player.x, player.z, view_direction)
     except Exception as e:
         print(f"Error updating world around player: {e}")
     return 0, 0